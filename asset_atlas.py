@@ -0,0 +1,121 @@
+"""
+Packed bundle of the map renderer's assets.
+
+Terrain variants, fog, shoreline overlays, forest bases and sprites are
+shelf-packed into one RGBA sheet and written with a JSON index as raw,
+uncompressed pixels, so startup is a single read with nothing to decode.
+Sub-images are cropped from the sheet the first time they are used.
+
+A bundle records a fingerprint of the files it was built from (path, size
+and modification time), so a stale bundle is noticed with stats alone.
+"""
+
+import json
+import os
+import struct
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from PIL import Image
+
+ATLAS_MAGIC = b"HXA1"
+ATLAS_HEADER = struct.Struct("<4sI")  # Magic, index length
+ATLAS_MAX_WIDTH = 2048  # Sheet width images are packed into
+ATLAS_SPACING = 1  # Empty pixels between packed images
+
+
+def source_fingerprint(paths: Iterable[str], version: str = "") -> str:
+    """Cheap identity of the files an atlas is built from (missing files count too)"""
+    parts = [version]
+    for path in paths:
+        try:
+            st = os.stat(path)
+            parts.append(f"{path}:{st.st_size}:{st.st_mtime_ns}")
+        except FileNotFoundError:
+            parts.append(f"{path}:<missing>")
+    return "|".join(parts)
+
+
+def pack_images(sizes: Dict[str, Tuple[int, int]],
+                max_width: int = ATLAS_MAX_WIDTH) -> Tuple[Dict[str, Tuple[int, int, int, int]], int, int]:
+    """
+    Shelf-pack images, tallest first.
+    Returns ({name: (x, y, width, height)}, sheet width, sheet height).
+    """
+    boxes = {}
+    x = y = shelf_height = sheet_width = 0
+    for name, (w, h) in sorted(sizes.items(), key=lambda item: (-item[1][1], item[0])):
+        if x and x + w > max_width:
+            x, y, shelf_height = 0, y + shelf_height + ATLAS_SPACING, 0
+        boxes[name] = (x, y, w, h)
+        x += w + ATLAS_SPACING
+        shelf_height = max(shelf_height, h)
+        sheet_width = max(sheet_width, x - ATLAS_SPACING)
+    return boxes, max(1, sheet_width), max(1, y + shelf_height)
+
+
+class AssetAtlas(Mapping):
+    """Read-only name -> image mapping over one packed sheet, cropping on first use"""
+
+    def __init__(self, sheet: Image.Image, boxes: Dict[str, Tuple[int, int, int, int]], fingerprint: str = ""):
+        self.sheet = sheet
+        self.boxes = boxes
+        self.fingerprint = fingerprint
+        self._crops: Dict[str, Image.Image] = {}
+
+    @classmethod
+    def from_images(cls, images: Dict[str, Image.Image], fingerprint: str = "") -> "AssetAtlas":
+        boxes, width, height = pack_images({name: img.size for name, img in images.items()})
+        sheet = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        for name, (x, y, _, _) in boxes.items():
+            sheet.paste(images[name].convert("RGBA"), (x, y))
+        return cls(sheet, boxes, fingerprint)
+
+    @classmethod
+    def load(cls, path: str, fingerprint: Optional[str] = None) -> Optional["AssetAtlas"]:
+        """The atlas at path, or None if it is missing, unreadable or built from other sources"""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            magic, index_len = ATLAS_HEADER.unpack_from(data)
+            if magic != ATLAS_MAGIC:
+                return None
+            index = json.loads(data[ATLAS_HEADER.size:ATLAS_HEADER.size + index_len])
+            if fingerprint is not None and index["fingerprint"] != fingerprint:
+                return None
+            width, height = index["width"], index["height"]
+            pixels = memoryview(data)[ATLAS_HEADER.size + index_len:]
+            if len(pixels) != width * height * 4:
+                return None
+            sheet = Image.frombuffer("RGBA", (width, height), pixels, "raw", "RGBA", 0, 1)
+        except (OSError, ValueError, KeyError, struct.error):
+            return None
+        return cls(sheet, {name: tuple(box) for name, box in index["images"].items()}, index["fingerprint"])
+
+    def save(self, path: str):
+        """Write atomically as header, JSON index, then raw RGBA rows"""
+        index = json.dumps({"fingerprint": self.fingerprint, "width": self.sheet.width,
+                            "height": self.sheet.height, "images": self.boxes}).encode()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(ATLAS_HEADER.pack(ATLAS_MAGIC, len(index)))
+            f.write(index)
+            f.write(self.sheet.tobytes())
+        os.replace(tmp, path)
+
+    def __getitem__(self, name: str) -> Image.Image:
+        img = self._crops.get(name)
+        if img is None:
+            x, y, w, h = self.boxes[name]
+            img = self._crops[name] = self.sheet.crop((x, y, x + w, y + h))
+        return img
+
+    def __contains__(self, name) -> bool:
+        return name in self.boxes
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.boxes)
+
+    def __len__(self) -> int:
+        return len(self.boxes)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+World generation benchmark.
+
+Builds bounded maps over a range of radii and fixed seeds, timing each
+generation phase (and a fog reveal walk) and measuring its peak traced
+memory. Runs headless: no Tk window is ever created.
+
+    python bench_worldgen.py                       # default radii, writes bench_worldgen.json
+    python bench_worldgen.py --radii 10 50 --seeds 1 --output before.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Dict, List
+
+import numpy as np
+
+from world_map import SIGHT_RADIUS, HexMap
+
+DEFAULT_RADII = [10, 25, 50, 100, 200, 300, 500]
+DEFAULT_SEEDS = [1, 2, 3]
+REVEAL_STEPS = 50  # Steps of the simulated walk timed as the "reveal" phase
+
+
+def _phases(world: HexMap):
+    """Generation phases followed by a fog reveal walk from the center"""
+    yield from world.generation_phases()
+
+    def reveal():
+        for i in range(min(REVEAL_STEPS, world.radius + 1)):
+            world.update_view(i, 0, SIGHT_RADIUS)
+    yield "reveal", reveal
+
+
+def run_once(radius: int, seed: int, trace_memory: bool) -> Dict[str, Dict[str, float]]:
+    """Generate one map; returns {phase: {"seconds": ..., "peak_bytes": ...}}"""
+    world = HexMap(radius=radius, seed=seed)
+    results = {}
+    for name, step in _phases(world):
+        if trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            step()
+        elapsed = time.perf_counter() - start
+        results[name] = {"seconds": elapsed}
+        if trace_memory:
+            results[name]["peak_bytes"] = tracemalloc.get_traced_memory()[1] - base
+    return results
+
+
+def benchmark(radii: List[int], seeds: List[int], memory: bool = True) -> dict:
+    """
+    Time every phase for each (radius, seed); a second, traced run measures
+    memory so tracing overhead never skews the timings.
+    """
+    runs = []
+    for radius in radii:
+        for seed in seeds:
+            timings = run_once(radius, seed, trace_memory=False)
+            if memory:
+                tracemalloc.start()
+                try:
+                    traced = run_once(radius, seed, trace_memory=True)
+                finally:
+                    tracemalloc.stop()
+                for name, values in traced.items():
+                    timings[name]["peak_bytes"] = values["peak_bytes"]
+            runs.append({"radius": radius, "seed": seed, "hexes": 3 * radius * (radius + 1) + 1,
+                         "phases": timings})
+
+    summary = {}
+    for radius in radii:
+        mine = [run["phases"] for run in runs if run["radius"] == radius]
+        summary[str(radius)] = {
+            name: {key: statistics.median(p[name][key] for p in mine) for key in mine[0][name]}
+            for name in mine[0]
+        }
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "seeds": seeds,
+        "runs": runs,
+        "median": summary,
+    }
+
+
+def print_table(report: dict):
+    phases = list(next(iter(report["median"].values())))
+    print(f"{'radius':>7} " + " ".join(f"{name:>18}" for name in phases))
+    for radius, values in report["median"].items():
+        cells = []
+        for name in phases:
+            cell = f"{values[name]['seconds'] * 1000:.1f}ms"
+            if "peak_bytes" in values[name]:
+                cell += f"/{values[name]['peak_bytes'] / 2**20:.1f}MB"
+            cells.append(f"{cell:>18}")
+        print(f"{radius:>7} " + " ".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HexMap world generation")
+    parser.add_argument("--radii", type=int, nargs="+", default=DEFAULT_RADII)
+    parser.add_argument("--seeds", type=int, nargs="+", default=DEFAULT_SEEDS)
+    parser.add_argument("--output", default="bench_worldgen.json", help="JSON report path")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced memory runs")
+    args = parser.parse_args()
+
+    report = benchmark(args.radii, args.seeds, memory=not args.no_memory)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print_table(report)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""Paint and pack the map renderer's assets ahead of time (the renderer also does this when its atlas is stale)"""
+import sys
+
+from world_map import ASSET_ATLAS_PATH, HEX_SIZE, load_asset_atlas
+
+hex_size = int(sys.argv[1]) if len(sys.argv) > 1 else HEX_SIZE
+atlas = load_asset_atlas(hex_size)
+print(f"{ASSET_ATLAS_PATH.format(hex_size=hex_size)}: {len(atlas)} images, "
+      f"{atlas.sheet.width}x{atlas.sheet.height}")
@@ -0,0 +1,90 @@
+"""
+Planar geometry helpers for map features (cluster labels, extents).
+Convex hull + rotating calipers keep diameter queries at O(n log n).
+"""
+
+from typing import Iterable, List, Sequence, Tuple
+
+Point = Tuple[float, float]
+
+
+def _cross(o: Point, a: Point, b: Point) -> float:
+    """Z component of (a - o) x (b - o); > 0 for a counter-clockwise turn"""
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def convex_hull(points: Iterable[Point]) -> List[Point]:
+    """
+    Convex hull via Andrew's monotone chain.
+
+    Returns:
+        Hull vertices in counter-clockwise order without collinear points.
+        Degenerate inputs return the distinct points (1 or 2 of them).
+    """
+    pts = sorted(set(points))
+    if len(pts) <= 2:
+        return pts
+
+    lower: List[Point] = []
+    for p in pts:
+        while len(lower) >= 2 and _cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+
+    upper: List[Point] = []
+    for p in reversed(pts):
+        while len(upper) >= 2 and _cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+
+    # Last point of each chain is the first point of the other
+    return lower[:-1] + upper[:-1]
+
+
+def _dist_sq(a: Point, b: Point) -> float:
+    dx = b[0] - a[0]
+    dy = b[1] - a[1]
+    return dx * dx + dy * dy
+
+
+def hull_diameter(points: Sequence[Point]) -> Tuple[float, Point, Point]:
+    """
+    Farthest pair of points using rotating calipers over the convex hull.
+
+    Returns:
+        (squared distance, endpoint 1, endpoint 2). A single point is its own diameter.
+    """
+    hull = convex_hull(points)
+    if not hull:
+        raise ValueError("hull_diameter() needs at least one point")
+    if len(hull) == 1:
+        return 0.0, hull[0], hull[0]
+    if len(hull) == 2:
+        return _dist_sq(hull[0], hull[1]), hull[0], hull[1]
+
+    n = len(hull)
+    best = (0.0, hull[0], hull[0])
+    j = 1
+    for i in range(n):
+        a, b = hull[i], hull[(i + 1) % n]
+        # Advance the antipodal caliper while it moves away from edge (a, b)
+        while abs(_cross(a, b, hull[(j + 1) % n])) > abs(_cross(a, b, hull[j])):
+            j = (j + 1) % n
+        for p in (a, b):
+            d = _dist_sq(p, hull[j])
+            if d > best[0]:
+                best = (d, p, hull[j])
+    return best
+
+
+def axial_width(qs: Sequence[int], rs: Sequence[int]) -> int:
+    """
+    Largest hex distance between any two axial coordinates.
+
+    Hex distance is the Chebyshev distance in cube coordinates, so the
+    maximum over all pairs is the largest extent along the q, r or s axis.
+    """
+    if len(qs) < 2:
+        return 0
+    ss = [-q - r for q, r in zip(qs, rs)]
+    return max(max(qs) - min(qs), max(rs) - min(rs), max(ss) - min(ss))
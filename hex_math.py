@@ -0,0 +1,162 @@
+"""
+Shared hex grid math for the pointy-top axial layout used by the world map.
+Covers neighbors, rings, spirals, ranges, distance, pixel<->axial conversion
+and rounding, with precomputed offset tables and NumPy-batched variants.
+"""
+
+import math
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+SQRT3 = math.sqrt(3)
+
+# Axial neighbor vectors, in the order the map has always listed them
+AXIAL_DIRECTIONS: Tuple[Tuple[int, int], ...] = (
+    (1, 0), (1, -1), (0, -1),
+    (-1, 0), (-1, 1), (0, 1),
+)
+
+# Neighbor across each hex edge, in HexPainter's edge order (edge i spans vertices i and i+1):
+# Right, Bottom Right, Bottom Left, Left, Top Left, Top Right
+EDGE_DIRECTIONS: Tuple[Tuple[int, int], ...] = (
+    (1, 0), (0, 1), (-1, 1),
+    (-1, 0), (0, -1), (1, -1),
+)
+
+
+def neighbors(q: int, r: int) -> List[Tuple[int, int]]:
+    """The 6 neighboring hex coordinates"""
+    return [(q + dq, r + dr) for dq, dr in AXIAL_DIRECTIONS]
+
+
+def hex_distance(q1: int, r1: int, q2: int, r2: int) -> int:
+    """Number of steps between two hexes"""
+    dq = q1 - q2
+    dr = r1 - r2
+    return (abs(dq) + abs(dr) + abs(dq + dr)) // 2
+
+
+@lru_cache(maxsize=None)
+def ring_offsets(radius: int) -> Tuple[Tuple[int, int], ...]:
+    """Offsets of the hexes exactly `radius` steps from the origin, walking clockwise from the top"""
+    if radius == 0:
+        return ((0, 0),)
+    results = []
+    q, r = 0, -radius
+    for dq, dr in ((1, 0), (0, 1), (-1, 1), (-1, 0), (0, -1), (1, -1)):
+        for _ in range(radius):
+            q += dq
+            r += dr
+            results.append((q, r))
+    return tuple(results)
+
+
+@lru_cache(maxsize=None)
+def spiral_offsets(radius: int) -> Tuple[Tuple[int, int], ...]:
+    """Offsets from the origin outward, ring by ring (center first)"""
+    results = []
+    for k in range(radius + 1):
+        results.extend(ring_offsets(k))
+    return tuple(results)
+
+
+@lru_cache(maxsize=None)
+def range_offsets_array(radius: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(dq, dr) int64 arrays of every offset within `radius`, in spiral order"""
+    offsets = spiral_offsets(radius)
+    dq = np.array([o[0] for o in offsets], dtype=np.int64)
+    dr = np.array([o[1] for o in offsets], dtype=np.int64)
+    dq.flags.writeable = False
+    dr.flags.writeable = False
+    return dq, dr
+
+
+def ring(q: int, r: int, radius: int) -> List[Tuple[int, int]]:
+    """Hexes exactly `radius` steps from (q, r)"""
+    return [(q + dq, r + dr) for dq, dr in ring_offsets(radius)]
+
+
+def spiral(q: int, r: int, radius: int) -> List[Tuple[int, int]]:
+    """Hexes within `radius` of (q, r), center first then ring by ring"""
+    return [(q + dq, r + dr) for dq, dr in spiral_offsets(radius)]
+
+
+def hex_range(q: int, r: int, radius: int) -> List[Tuple[int, int]]:
+    """All hexes within `radius` steps of (q, r) (same set as spiral)"""
+    return spiral(q, r, radius)
+
+
+def axial_to_pixel(q: float, r: float, size: float) -> Tuple[float, float]:
+    """Center of hex (q, r) in pixels relative to the origin hex"""
+    return size * (SQRT3 * q + SQRT3 / 2 * r), size * (1.5 * r)
+
+
+def pixel_to_axial(x: float, y: float, size: float) -> Tuple[float, float]:
+    """Fractional axial coordinates of a pixel position"""
+    return (SQRT3 / 3 * x - 1.0 / 3 * y) / size, (2.0 / 3 * y) / size
+
+
+def axial_round(q: float, r: float) -> Tuple[int, int]:
+    """Round fractional axial coordinates to the nearest hex"""
+    s = -q - r
+    rq, rr, rs = round(q), round(r), round(s)
+    q_diff, r_diff, s_diff = abs(rq - q), abs(rr - r), abs(rs - s)
+
+    if q_diff > r_diff and q_diff > s_diff:
+        rq = -rr - rs
+    elif s_diff > r_diff:
+        rs = -rq - rr
+    else:
+        rr = -rq - rs
+    return int(rq), int(rr)
+
+
+def pixel_to_hex(x: float, y: float, size: float) -> Tuple[int, int]:
+    """Hex containing a pixel position"""
+    return axial_round(*pixel_to_axial(x, y, size))
+
+
+def hex_corners(cx: float, cy: float, size: float) -> List[Tuple[float, float]]:
+    """The 6 corner points of a pointy-top hex (vertex 0 at -30 degrees, clockwise)"""
+    return [(cx + size * math.cos(math.radians(60 * i - 30)),
+             cy + size * math.sin(math.radians(60 * i - 30))) for i in range(6)]
+
+
+# --- Batched (NumPy) variants ---------------------------------------------
+
+def axial_to_pixel_batch(qs: np.ndarray, rs: np.ndarray, size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized axial_to_pixel"""
+    qs = np.asarray(qs, dtype=np.float64)
+    rs = np.asarray(rs, dtype=np.float64)
+    return size * (SQRT3 * qs + SQRT3 / 2 * rs), size * (1.5 * rs)
+
+
+def axial_round_batch(qs: np.ndarray, rs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized axial_round; returns int64 arrays"""
+    qs = np.asarray(qs, dtype=np.float64)
+    rs = np.asarray(rs, dtype=np.float64)
+    ss = -qs - rs
+    rq, rr, rs_ = np.round(qs), np.round(rs), np.round(ss)
+    q_diff, r_diff, s_diff = np.abs(rq - qs), np.abs(rr - rs), np.abs(rs_ - ss)
+
+    fix_q = (q_diff > r_diff) & (q_diff > s_diff)
+    fix_r = ~fix_q & ~(s_diff > r_diff)
+    rq = np.where(fix_q, -rr - rs_, rq)
+    rr = np.where(fix_r, -rq - rs_, rr)
+    return rq.astype(np.int64), rr.astype(np.int64)
+
+
+def pixel_to_hex_batch(xs: np.ndarray, ys: np.ndarray, size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized pixel_to_hex"""
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    return axial_round_batch((SQRT3 / 3 * xs - 1.0 / 3 * ys) / size, (2.0 / 3 * ys) / size)
+
+
+def hex_distance_batch(qs: np.ndarray, rs: np.ndarray, q: int, r: int) -> np.ndarray:
+    """Vectorized hex_distance from many hexes to one"""
+    dq = np.asarray(qs) - q
+    dr = np.asarray(rs) - r
+    return (np.abs(dq) + np.abs(dr) + np.abs(dq + dr)) // 2
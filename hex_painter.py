@@ -1,7 +1,14 @@
 import math
 import random
 import os
+from collections import OrderedDict
 from PIL import Image, ImageDraw
+import hex_math
+
+ANGLE_STEP = 2.0  # Sprite rotations are rounded to this many degrees
+SCALE_LOG_STEP = math.log(1.02)  # Sprite scales fall in 2% log buckets (rounded by at most 1%)
+TRANSFORM_CACHE_MAX_BYTES = 48 * 2 ** 20  # Bound on memoized transformed sprites
+ROTATION_CACHE_MAX_BYTES = 32 * 2 ** 20  # Bound on memoized rotated (unscaled) sprites
 
 class HexPainter:
     """
@@ -12,11 +19,33 @@ class HexPainter:
     
     # Static sprite cache
     _sprites = {}
+    _sprite_sets = {}  # Key: (prefix, count) -> loaded sprite names
+    _forest_bases = {}  # Key: (base index 1-6, size[, rotation])
+    # Key: (name, flip, angle bucket); least recently used first
+    _rotations = OrderedDict()
+    _rotation_bytes = 0
+    # Key: (name, flip, angle bucket, scale bucket); least recently used first
+    _transforms = OrderedDict()
+    _transform_bytes = 0
+    _atlas = None  # Packed assets checked before the PNG files (see use_atlas)
+    
+    TILE_PADDING = 80  # Room around the hex for sprites that overhang it
+    FOREST_TILE_VERSION = "2"  # Bump when paint_forest_tile changes, to retire cached tiles
     
+    SPRITE_NAMES = ([f"tree_{i}" for i in range(1, 19)] + ["mountain_1", "mountain_2", "grass_1", "shoreline"])
+
+    @classmethod
+    def use_atlas(cls, atlas):
+        """Take sprites ("sprite/<name>") and forest bases ("forest_base_<i>") from a packed atlas"""
+        cls._atlas = atlas
+
     @classmethod
     def load_sprite(cls, name):
         if name in cls._sprites:
             return cls._sprites[name]
+        if cls._atlas is not None and f"sprite/{name}" in cls._atlas:
+            cls._sprites[name] = cls._atlas[f"sprite/{name}"]
+            return cls._sprites[name]
         
         # Try finding in assets/sprites/
         try:
@@ -31,26 +60,153 @@ class HexPainter:
         cls._sprites[name] = None
         return None
 
+    @classmethod
+    def sprite_set(cls, prefix, count):
+        """Names of the sprites prefix_1..prefix_count that exist, looked up once"""
+        key = (prefix, count)
+        if key not in cls._sprite_sets:
+            cls._sprite_sets[key] = [f"{prefix}_{i}" for i in range(1, count + 1)
+                                     if cls.load_sprite(f"{prefix}_{i}")]
+        return cls._sprite_sets[key]
+
+    @classmethod
+    def rotated_sprite(cls, name, angle_bucket, flip=False):
+        """Sprite flipped, then rotated (bicubic, expanded) by angle_bucket * ANGLE_STEP degrees"""
+        key = (name, flip, angle_bucket)
+        img = cls._rotations.get(key)
+        if img is not None:
+            cls._rotations.move_to_end(key)
+            return img
+
+        img = cls.load_sprite(name)
+        if flip:
+            img = img.transpose(Image.FLIP_LEFT_RIGHT)
+        if angle_bucket:
+            img = img.rotate(angle_bucket * ANGLE_STEP, expand=True, resample=Image.BICUBIC)
+
+        cls._rotations[key] = img
+        cls._rotation_bytes += img.width * img.height * 4
+        while cls._rotation_bytes > ROTATION_CACHE_MAX_BYTES and len(cls._rotations) > 1:
+            _, old = cls._rotations.popitem(last=False)
+            cls._rotation_bytes -= old.width * old.height * 4
+        return img
+
+    @classmethod
+    def transformed_sprite(cls, name, scale, angle=0.0, flip=False):
+        """
+        Sprite flipped, rotated then resized (LANCZOS), memoized.
+        Angle and scale are rounded to buckets so results can be shared; the
+        rounding (under ANGLE_STEP / 2 degrees, 1% of size) is not visible.
+        """
+        angle_bucket = round(angle / ANGLE_STEP)
+        scale_bucket = round(math.log(scale) / SCALE_LOG_STEP)
+        key = (name, flip, angle_bucket, scale_bucket)
+        img = cls._transforms.get(key)
+        if img is not None:
+            cls._transforms.move_to_end(key)
+            return img
+
+        img = cls.rotated_sprite(name, angle_bucket, flip)
+        s_scale = math.exp(scale_bucket * SCALE_LOG_STEP)
+        w, h = img.size
+        img = img.resize((max(1, int(w * s_scale)), max(1, int(h * s_scale))), Image.Resampling.LANCZOS)
+
+        cls._transforms[key] = img
+        cls._transform_bytes += img.width * img.height * 4
+        while cls._transform_bytes > TRANSFORM_CACHE_MAX_BYTES and len(cls._transforms) > 1:
+            _, old = cls._transforms.popitem(last=False)
+            cls._transform_bytes -= old.width * old.height * 4
+        return img
+
+    @classmethod
+    def precompute_forest_sprites(cls):
+        """
+        Rotate tree sprites to the flips and angle buckets forest tiles can use,
+        stopping once the rotation cache is full (the rest are made on demand)
+        """
+        limit = round(30 / ANGLE_STEP)
+        for name in cls.sprite_set("tree", 18):
+            for flip in (False, True):
+                for bucket in range(-limit, limit + 1):
+                    if cls._rotation_bytes >= ROTATION_CACHE_MAX_BYTES:
+                        return
+                    cls.rotated_sprite(name, bucket, flip)
+
+    @classmethod
+    def load_forest_base(cls, index, size):
+        """Forest base image 1-6 from assets/hex_tiles, or a plain green hex if missing"""
+        key = (index, size)
+        if key in cls._forest_bases:
+            return cls._forest_bases[key]
+
+        path = os.path.join("assets/hex_tiles", f"forest_base_{index}.png")
+        if cls._atlas is not None and f"forest_base_{index}" in cls._atlas:
+            img = cls._atlas[f"forest_base_{index}"]
+        elif os.path.exists(path):
+            img = Image.open(path).convert("RGBA")
+        else:
+            img_w, img_h = HexPainter.tile_size(size)
+            img = Image.new("RGBA", (img_w, img_h), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(img)
+            HexPainter.draw_hex_base(draw, img_w / 2, img_h / 2, size, (34, 100, 34, 255))
+
+        cls._forest_bases[key] = img
+        return img
+
+    @classmethod
+    def rotated_forest_base(cls, index, size, rotation):
+        """Forest base rotated by a multiple of 60 degrees (six variants per base, memoized)"""
+        if not rotation:
+            return cls.load_forest_base(index, size)
+        key = (index, size, rotation)
+        if key not in cls._forest_bases:
+            cls._forest_bases[key] = cls.load_forest_base(index, size).rotate(
+                rotation, expand=True, resample=Image.BICUBIC)
+        return cls._forest_bases[key]
+
     @staticmethod
-    def _get_hex_vertex(cx, cy, size, index):
+    def forest_sprite_paths():
+        """Every file paint_forest_tile reads"""
+        return ([os.path.join("assets/hex_tiles", f"forest_base_{i}.png") for i in range(1, 7)]
+                + [f"assets/sprites/tree_{i}.png" for i in range(1, 19)])
+
+    @staticmethod
+    def tile_size(size):
+        """(width, height) of a padded tile image for hexes of this size"""
+        return (int(hex_math.SQRT3 * size) + HexPainter.TILE_PADDING,
+                int(2 * size) + HexPainter.TILE_PADDING)
+
+    @staticmethod
+    def paint_forest_tile(q, r, size):
         """
-        Calculates the vertex coordinates for a given index (0-5).
-        Vertex 0 is Top-Right (-30 deg), Vertex 1 is Bottom-Right (30 deg), etc.
+        The unique forest tile of hex (q, r): a rotated forest base plus trees,
+        all seeded by the coordinates. Pure, so it can run in worker processes.
         """
-        angle_deg = 60 * index - 30
-        angle_rad = math.radians(angle_deg)
-        x = cx + size * math.cos(angle_rad)
-        y = cy + size * math.sin(angle_rad)
-        return x, y
+        img_w, img_h = HexPainter.tile_size(size)
+        img = Image.new("RGBA", (img_w, img_h), (0, 0, 0, 0))
+        cx, cy = img_w / 2, img_h / 2
+
+        # Deterministic seed unique to this hex
+        seed = (q * 73856093) ^ (r * 19349663)
+        rng = random.Random(seed)
+
+        # 1. Choose a random forest base (1-6) and rotate it
+        base_img = HexPainter.rotated_forest_base(rng.randint(1, 6), size,
+                                                  rng.choice([0, 60, 120, 180, 240, 300]))
+
+        bw, bh = base_img.size
+        img.paste(base_img, (int(cx - bw / 2), int(cy - bh / 2)), base_img)
+
+        # 2. Draw Unique Trees seeded by coordinates
+        HexPainter.draw_forest_variant(img, cx, cy, size, seed ^ 0xA5A5A5A5)
+        return img
 
     @staticmethod
     def draw_hex_base(draw, center_x, center_y, size, color):
         """
         Draws the filled hexagon with a default outline.
         """
-        points = []
-        for i in range(6):
-            points.append(HexPainter._get_hex_vertex(center_x, center_y, size, i))
+        points = hex_math.hex_corners(center_x, center_y, size)
         
         # Uses a dark gray outline consistent with typical map styles
         draw.polygon(points, fill=color, outline=(50, 50, 50))
@@ -72,11 +228,7 @@ class HexPainter:
         peaks.sort(key=lambda p: p[1])
         
         # Load sprites
-        sprites = []
-        for i in range(1, 3):
-            s = HexPainter.load_sprite(f"mountain_{i}")
-            if s: sprites.append(s)
-            
+        sprites = HexPainter.sprite_set("mountain", 2)
         if not sprites:
              return
         
@@ -85,10 +237,8 @@ class HexPainter:
             sprite = rng.choice(sprites)
             # Scale
             s_scale = rng.uniform(0.8, 1.2) * (size / 60.0) 
-            w, h = sprite.size
-            nw, nh = int(w * s_scale), int(h * s_scale)
-            
-            s_resized = sprite.resize((nw, nh), Image.Resampling.LANCZOS)
+            s_resized = HexPainter.transformed_sprite(sprite, s_scale)
+            nw, nh = s_resized.size
             
             # Position: Center bottom-ish
             left = int(px - nw / 2)
@@ -120,31 +270,20 @@ class HexPainter:
             
         trees.sort(key=lambda p: p[1])
         
-        sprites = []
-        for i in range(1, 19): # Trees 1-18
-            s = HexPainter.load_sprite(f"tree_{i}")
-            if s: sprites.append(s)
-            
+        sprites = HexPainter.sprite_set("tree", 18) # Trees 1-18
         if not sprites: return
         
         for tx, ty in trees:
             sprite = rng.choice(sprites)
             
             # 1. Flip Horizontal
-            if rng.choice([True, False]):
-                sprite = sprite.transpose(Image.FLIP_LEFT_RIGHT)
-                
-            # 2. Rotate +/- 30 degrees
+            flip = rng.choice([True, False])
+            # 2. Rotate +/- 30 degrees (expanded; the anchor stays at bottom center)
             angle = rng.uniform(-30, 30)
-            # Expand=True changes size, but we need to keep anchor at bottom center
-            sprite = sprite.rotate(angle, expand=True, resample=Image.BICUBIC)
-            
-            # Scale
+            # 3. Scale
             s_scale = rng.uniform(0.6, 0.9) * (size / 40.0)
-            w, h = sprite.size
-            nw, nh = int(w * s_scale), int(h * s_scale)
-            
-            s_resized = sprite.resize((nw, nh), Image.Resampling.LANCZOS)
+            s_resized = HexPainter.transformed_sprite(sprite, s_scale, angle, flip)
+            nw, nh = s_resized.size
             
             # Position: anchor at bottom center
             left = int(tx - nw / 2)
@@ -161,18 +300,15 @@ class HexPainter:
         rng = random.Random(seed)
         num_tufts = rng.randint(4, 7)
         
-        sprite = HexPainter.load_sprite("grass_1")
-        if not sprite: return
+        if not HexPainter.load_sprite("grass_1"): return
         
         for _ in range(num_tufts):
             gx = cx + rng.uniform(-size * 0.6, size * 0.6)
             gy = cy + rng.uniform(-size * 0.6, size * 0.6)
             
             s_scale = rng.uniform(0.6, 1.0) * (size / 40.0)
-            w, h = sprite.size
-            nw, nh = int(w * s_scale), int(h * s_scale)
-            
-            s_resized = sprite.resize((nw, nh), Image.Resampling.LANCZOS)
+            s_resized = HexPainter.transformed_sprite("grass_1", s_scale)
+            nw, nh = s_resized.size
             left = int(gx - nw / 2)
             top = int(gy - nh / 2)
             
@@ -198,7 +334,7 @@ class HexPainter:
         mid_angle_rad = math.radians(edge_angle_deg)
         
         # Distance to midpoint of edge is size * sqrt(3)/2
-        edge_dist = size * math.sqrt(3) / 2
+        edge_dist = size * hex_math.SQRT3 / 2
         
         mx = cx + edge_dist * math.cos(mid_angle_rad)
         my = cy + edge_dist * math.sin(mid_angle_rad)
@@ -0,0 +1,146 @@
+"""
+Global map label placement.
+Candidates are placed greedily by priority; a uniform-grid spatial hash over
+the rotated label boxes keeps collision checks near-linear in label count.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+LABEL_FONT_SIZE = 24
+LABEL_STROKE = 3
+LABEL_PADDING = 6  # Empty margin kept around every placed label (pixels)
+
+
+def estimate_text_size(text: str, font_size: int = LABEL_FONT_SIZE,
+                       stroke: int = LABEL_STROKE) -> Tuple[float, float]:
+    """Approximate rendered (width, height) of a label without loading a font"""
+    return len(text) * font_size * 0.6 + 2 * stroke, font_size * 1.2 + 2 * stroke
+
+
+@dataclass
+class LabelCandidate:
+    """A label that wants to be placed at a world position"""
+    x: float
+    y: float
+    angle: float
+    priority: float  # Higher places first
+    # Text, or a callable producing it; callables only run for candidates that get tested
+    text: Union[str, Callable[[], str]]
+    group: Optional[int] = None  # Candidates sharing a group keep min_distance apart
+    min_distance: float = 0.0
+    size: Optional[Tuple[float, float]] = None  # (width, height), estimated if None
+
+
+class OrientedBox:
+    """Rotated rectangle given by center, half extents and angle in degrees"""
+    __slots__ = ("cx", "cy", "hw", "hh", "ux", "uy", "min_x", "min_y", "max_x", "max_y")
+
+    def __init__(self, cx: float, cy: float, width: float, height: float, angle: float):
+        self.cx, self.cy = cx, cy
+        self.hw, self.hh = width / 2, height / 2
+        rad = math.radians(angle)
+        self.ux, self.uy = math.cos(rad), math.sin(rad)
+
+        # Axis-aligned bounds of the rotated box
+        ex = abs(self.ux) * self.hw + abs(self.uy) * self.hh
+        ey = abs(self.uy) * self.hw + abs(self.ux) * self.hh
+        self.min_x, self.max_x = cx - ex, cx + ex
+        self.min_y, self.max_y = cy - ey, cy + ey
+
+    def _radius_on(self, ax: float, ay: float) -> float:
+        """Half length of this box's projection onto a unit axis"""
+        return (self.hw * abs(self.ux * ax + self.uy * ay)
+                + self.hh * abs(-self.uy * ax + self.ux * ay))
+
+    def intersects(self, other: "OrientedBox") -> bool:
+        """Separating axis test between two oriented boxes"""
+        if (self.max_x < other.min_x or other.max_x < self.min_x
+                or self.max_y < other.min_y or other.max_y < self.min_y):
+            return False
+        dx, dy = other.cx - self.cx, other.cy - self.cy
+        for ax, ay in ((self.ux, self.uy), (-self.uy, self.ux),
+                       (other.ux, other.uy), (-other.uy, other.ux)):
+            if abs(dx * ax + dy * ay) > self._radius_on(ax, ay) + other._radius_on(ax, ay):
+                return False
+        return True
+
+
+@dataclass
+class PlacedLabel:
+    """A candidate that won its spot"""
+    text: str
+    x: float
+    y: float
+    angle: float
+    priority: float
+    box: OrientedBox = field(repr=False)
+    group: Optional[int] = None
+
+
+class LabelPlacer:
+    """Greedy, priority-ordered label placement with collision rejection"""
+
+    def __init__(self, cell_size: float = 256.0, padding: float = LABEL_PADDING):
+        self.cell_size = cell_size
+        self.padding = padding
+        self.placed: List[PlacedLabel] = []
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+
+    def _cell_range(self, min_x, min_y, max_x, max_y):
+        cs = self.cell_size
+        for ix in range(math.floor(min_x / cs), math.floor(max_x / cs) + 1):
+            for iy in range(math.floor(min_y / cs), math.floor(max_y / cs) + 1):
+                yield ix, iy
+
+    def _nearby(self, min_x, min_y, max_x, max_y) -> Iterable[PlacedLabel]:
+        """Placed labels whose cells overlap a world rectangle (each once)"""
+        seen = set()
+        for cell in self._cell_range(min_x, min_y, max_x, max_y):
+            for idx in self._cells.get(cell, ()):
+                if idx not in seen:
+                    seen.add(idx)
+                    yield self.placed[idx]
+
+    def _too_close_to_group(self, cand: LabelCandidate) -> bool:
+        if cand.group is None or cand.min_distance <= 0:
+            return False
+        d = cand.min_distance
+        limit = d * d
+        for other in self._nearby(cand.x - d, cand.y - d, cand.x + d, cand.y + d):
+            if other.group == cand.group:
+                dx, dy = other.x - cand.x, other.y - cand.y
+                if dx * dx + dy * dy < limit:
+                    return True
+        return False
+
+    def try_place(self, cand: LabelCandidate) -> Optional[PlacedLabel]:
+        """Place one candidate if it does not collide with anything already placed"""
+        if self._too_close_to_group(cand):
+            return None
+
+        text = cand.text() if callable(cand.text) else cand.text
+        width, height = cand.size or estimate_text_size(text)
+        box = OrientedBox(cand.x, cand.y, width + 2 * self.padding,
+                          height + 2 * self.padding, cand.angle)
+
+        for other in self._nearby(box.min_x, box.min_y, box.max_x, box.max_y):
+            if box.intersects(other.box):
+                return None
+
+        placed = PlacedLabel(text, cand.x, cand.y, cand.angle, cand.priority, box, cand.group)
+        idx = len(self.placed)
+        self.placed.append(placed)
+        for cell in self._cell_range(box.min_x, box.min_y, box.max_x, box.max_y):
+            self._cells.setdefault(cell, []).append(idx)
+        return placed
+
+    def place_all(self, candidates: Iterable[LabelCandidate]) -> List[PlacedLabel]:
+        """Place candidates highest priority first; returns the accepted ones in order"""
+        accepted = []
+        for cand in sorted(candidates, key=lambda c: -c.priority):
+            placed = self.try_place(cand)
+            if placed:
+                accepted.append(placed)
+        return accepted
@@ -0,0 +1,53 @@
+"""
+Pre-rendered map label images.
+
+Fonts are loaded once per size. Each label is drawn into an image just large
+enough for its stroked text, rotated, then cropped to the visible pixels, so
+the sprite is as small as the label and the renderer only has to place it.
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from label_placement import LABEL_FONT_SIZE, LABEL_STROKE
+
+LABEL_FONT_PATHS = ("arial.ttf", "C:\\Windows\\Fonts\\Arial.ttf", "DejaVuSans.ttf")  # First found is used
+LABEL_FILL = (255, 255, 240, 255)
+LABEL_STROKE_FILL = (0, 0, 0, 255)
+
+
+@lru_cache(maxsize=None)
+def label_font(size: int = LABEL_FONT_SIZE) -> ImageFont.ImageFont:
+    """The first available font of LABEL_FONT_PATHS, or Pillow's default"""
+    for path in LABEL_FONT_PATHS:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def render_label(text: str, angle: float, size: int = LABEL_FONT_SIZE) -> Tuple[Image.Image, Tuple[float, float]]:
+    """
+    High contrast text rotated to follow angle (degrees, clockwise as on screen).
+
+    Returns:
+        (sprite, (dx, dy)) where (dx, dy) is the sprite's center relative to
+        the text's center, which cropping can move off the sprite's center
+    """
+    font = label_font(size)
+    left, top, right, bottom = font.getbbox(text, stroke_width=LABEL_STROKE)
+    img = Image.new("RGBA", (max(1, right - left), max(1, bottom - top)), (0, 0, 0, 0))
+    ImageDraw.Draw(img).text((-left, -top), text, font=font, fill=LABEL_FILL,
+                             stroke_width=LABEL_STROKE, stroke_fill=LABEL_STROKE_FILL)
+    # PIL rotates counter-clockwise
+    img = img.rotate(-angle, expand=True, resample=Image.BICUBIC)
+
+    box = img.getchannel("A").getbbox()
+    if box is None:
+        return img, (0.0, 0.0)
+    dx = (box[0] + box[2]) / 2 - img.width / 2
+    dy = (box[1] + box[3]) / 2 - img.height / 2
+    return img.crop(box), (dx, dy)
@@ -0,0 +1,270 @@
+"""
+Route finding over the hex map.
+
+Searches run on a CostGrid: a window of the map flattened into one list of
+per-hex step costs, padded with a border of impassable cells so the six
+neighbor offsets never need bounds checks (the same layout the component
+labelling uses).
+"""
+
+import heapq
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+INF = float("inf")
+UNREACHED = 2 ** 31 - 1  # DistanceField distance of hexes no source can reach
+
+
+@dataclass
+class TravelPath:
+    """A route from start to goal"""
+    hexes: List[Tuple[int, int]]  # Start first, goal last
+    cost: int  # Sum of step costs of every hex entered after the start
+
+    def __len__(self):
+        return len(self.hexes) - 1  # Number of steps
+
+
+class CostGrid:
+    """
+    Padded flat step-cost array for an axial rhombus of the map.
+    Entering a hex costs costs[index]; 0 means impassable (or not a hex).
+    """
+
+    def __init__(self, q0: int, r0: int, costs: np.ndarray):
+        """
+        Args:
+            q0, r0: Axial coordinates of costs[0, 0]
+            costs: (height, width) step costs laid out as [r - r0, q - q0]
+        """
+        h, w = costs.shape
+        self.height = h
+        self.width = w
+        self.pw = pw = w + 2
+        # Axial origin of the padded array
+        self.q0 = q0 - 1
+        self.r0 = r0 - 1
+        padded = np.zeros((h + 2, pw), dtype=np.int64)
+        padded[1:-1, 1:-1] = costs
+        self.costs: List[int] = padded.ravel().tolist()
+        # Axial neighbor vectors (1,0) (-1,0) (0,-1) (0,1) (1,-1) (-1,1) as flat offsets
+        self.offsets = (1, -1, -pw, pw, 1 - pw, pw - 1)
+
+    def index(self, q: int, r: int) -> Optional[int]:
+        """Flat index of (q, r), or None outside the window"""
+        col, row = q - self.q0, r - self.r0
+        if 1 <= col <= self.width and 1 <= row <= self.height:
+            return row * self.pw + col
+        return None
+
+    def coords(self, index: int) -> Tuple[int, int]:
+        row, col = divmod(index, self.pw)
+        return col + self.q0, row + self.r0
+
+    def copy(self) -> "CostGrid":
+        """Same window with its own cost list"""
+        other = CostGrid.__new__(CostGrid)
+        other.__dict__.update(self.__dict__)
+        other.costs = list(self.costs)
+        return other
+
+    def set_cost(self, q: int, r: int, cost: int):
+        index = self.index(q, r)
+        if index is not None:
+            self.costs[index] = cost
+
+
+def _trace(grid: CostGrid, parent: List[int], end: int) -> List[Tuple[int, int]]:
+    hexes = []
+    while end != -1:
+        hexes.append(grid.coords(end))
+        end = parent[end]
+    hexes.reverse()
+    return hexes
+
+
+def astar(grid: CostGrid, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[TravelPath]:
+    """
+    Cheapest route from start to goal, or None if there is none.
+    Every step costs at least 1, so hex distance is an admissible heuristic.
+    """
+    s = grid.index(*start)
+    g = grid.index(*goal)
+    if s is None or g is None or not grid.costs[g]:
+        return None
+    if s == g:
+        return TravelPath([start], 0)
+
+    costs = grid.costs
+    offsets = grid.offsets
+    pw = grid.pw
+    g_row, g_col = divmod(g, pw)
+    dist = [INF] * len(costs)
+    parent = [-1] * len(costs)
+    dist[s] = 0
+
+    # Entries are (f, -g, index): among equal f, expand the deepest node first
+    heap = [(0, 0, s)]
+    while heap:
+        _, neg_d, cur = heapq.heappop(heap)
+        if cur == g:
+            return TravelPath(_trace(grid, parent, g), -neg_d)
+        d = -neg_d
+        if d > dist[cur]:
+            continue
+        for off in offsets:
+            nxt = cur + off
+            step = costs[nxt]
+            if not step:
+                continue
+            nd = d + step
+            if nd < dist[nxt]:
+                dist[nxt] = nd
+                parent[nxt] = cur
+                row, col = divmod(nxt, pw)
+                dq, dr = col - g_col, row - g_row
+                heapq.heappush(heap, (nd + (abs(dq) + abs(dr) + abs(dq + dr)) // 2, -nd, nxt))
+    return None
+
+
+class DistanceField:
+    """
+    Multi-source Dijkstra flow field over a CostGrid.
+
+    For every hex stores the travel cost to the cheapest source, which source
+    that is, and the neighbor to step to next, in compact int32 arrays, so each
+    lookup is O(1). Call update() after a hex's cost or source status changes;
+    only the hexes whose routes could be affected are recomputed.
+    """
+
+    def __init__(self, grid: CostGrid, sources: Iterable[Tuple[int, int]]):
+        self.grid = grid
+        n = len(grid.costs)
+        self.dist = array("i", [UNREACHED]) * n
+        self.nearest = array("i", [-1]) * n  # Flat index of the closest source
+        self.next = array("i", [-1]) * n     # Flat index of the next step toward it
+        self.sources = set()
+        for q, r in sources:
+            index = grid.index(q, r)
+            if index is not None and grid.costs[index]:
+                self.sources.add(index)
+        
+        heap = []
+        for index in self.sources:
+            self.dist[index] = 0
+            self.nearest[index] = index
+            heap.append((0, index))
+        heapq.heapify(heap)
+        self._propagate(heap)
+
+    def _propagate(self, heap: list):
+        """Dijkstra outward from the entries in heap, only ever lowering distances"""
+        costs = self.grid.costs
+        offsets = self.grid.offsets
+        dist, nearest, nxt = self.dist, self.nearest, self.next
+        while heap:
+            d, cur = heapq.heappop(heap)
+            if d > dist[cur]:
+                continue
+            # Stepping from a neighbor into cur costs costs[cur]
+            nd = d + costs[cur]
+            src = nearest[cur]
+            for off in offsets:
+                v = cur + off
+                if costs[v] and nd < dist[v]:
+                    dist[v] = nd
+                    nearest[v] = src
+                    nxt[v] = cur
+                    heapq.heappush(heap, (nd, v))
+
+    def _subtree(self, root: int) -> List[int]:
+        """root plus every hex whose next-step chain passes through it"""
+        offsets = self.grid.offsets
+        nxt = self.next
+        found = [root]
+        seen = {root}
+        i = 0
+        while i < len(found):
+            cur = found[i]
+            i += 1
+            for off in offsets:
+                v = cur + off
+                if nxt[v] == cur and v not in seen:
+                    seen.add(v)
+                    found.append(v)
+        return found
+
+    def update(self, q: int, r: int, cost: int, is_source: bool):
+        """
+        Apply a new step cost (0 = impassable) and source status to one hex.
+
+        Hexes routed through it are reset and refilled from their unaffected
+        neighbors; any improvement it enables spreads outward from it.
+        """
+        index = self.grid.index(q, r)
+        if index is None:
+            return
+        costs = self.grid.costs
+        offsets = self.grid.offsets
+        dist, nearest, nxt = self.dist, self.nearest, self.next
+        
+        costs[index] = cost
+        if is_source and cost:
+            self.sources.add(index)
+        else:
+            self.sources.discard(index)
+        
+        stale = self._subtree(index)
+        for v in stale:
+            dist[v] = UNREACHED
+            nearest[v] = -1
+            nxt[v] = -1
+        
+        heap = []
+        for v in stale:
+            if not costs[v]:
+                continue
+            if v in self.sources:
+                dist[v] = 0
+                nearest[v] = v
+                heap.append((0, v))
+                continue
+            # Best way out through a neighbor that kept its route
+            for off in offsets:
+                u = v + off
+                if dist[u] != UNREACHED:
+                    d = dist[u] + costs[u]
+                    if d < dist[v]:
+                        dist[v] = d
+                        nearest[v] = nearest[u]
+                        nxt[v] = u
+            if dist[v] != UNREACHED:
+                heap.append((dist[v], v))
+        heapq.heapify(heap)
+        self._propagate(heap)
+
+    # --- O(1) lookups ---
+
+    def distance(self, q: int, r: int) -> Optional[int]:
+        """Travel cost to the nearest source, or None if none is reachable"""
+        index = self.grid.index(q, r)
+        if index is None or self.dist[index] == UNREACHED:
+            return None
+        return self.dist[index]
+
+    def nearest_source(self, q: int, r: int) -> Optional[Tuple[int, int]]:
+        """The source hex reached most cheaply from (q, r)"""
+        index = self.grid.index(q, r)
+        if index is None or self.nearest[index] < 0:
+            return None
+        return self.grid.coords(self.nearest[index])
+
+    def next_step(self, q: int, r: int) -> Optional[Tuple[int, int]]:
+        """The neighbor to move to on the way to the nearest source (None at a source)"""
+        index = self.grid.index(q, r)
+        if index is None or self.next[index] < 0:
+            return None
+        return self.grid.coords(self.next[index])
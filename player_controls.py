@@ -6,6 +6,7 @@ Maps to hexagonal movement directions.
 import math
 from enum import Enum
 from typing import Tuple, Optional, Callable
+import hex_math
 
 class HexDirection(Enum):
     """Six cardinal directions on a pointy-top hex grid (in degrees)"""
@@ -163,38 +164,10 @@ class PlayerControls:
         world_x = click_x - canvas_cx - offset_x
         world_y = click_y - canvas_cy - offset_y
         
-        # Convert to axial coordinates
-        q = (math.sqrt(3)/3 * world_x - 1/3 * world_y) / hex_size
-        r = (2./3 * world_y) / hex_size
-        
-        # Round to nearest hex
-        hex_coords = self._round_axial(q, r)
+        # Convert to axial coordinates, rounded to the nearest hex
+        hex_coords = hex_math.pixel_to_hex(world_x, world_y, hex_size)
         
         if self.click_callback:
             self.click_callback(hex_coords)
         
         return hex_coords
-    
-    @staticmethod
-    def _round_axial(q: float, r: float) -> Tuple[int, int]:
-        """Round fractional axial coordinates to nearest hex"""
-        xgrid = q
-        zgrid = r
-        ygrid = -q - r
-        
-        rx = round(xgrid)
-        ry = round(ygrid)
-        rz = round(zgrid)
-        
-        x_diff = abs(rx - xgrid)
-        y_diff = abs(ry - ygrid)
-        z_diff = abs(rz - zgrid)
-        
-        if x_diff > y_diff and x_diff > z_diff:
-            rx = -ry - rz
-        elif y_diff > z_diff:
-            ry = -rx - rz
-        else:
-            rz = -rx - ry
-        
-        return int(rx), int(rz)
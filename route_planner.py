@@ -0,0 +1,312 @@
+"""
+Hierarchical (HPA*-style) route planning for large maps.
+
+The cost grid is cut into square clusters. Where two clusters share a
+passable border, transition hexes are chosen on both sides; these are the
+nodes of an abstract graph. Crossing a border is one step; travelling
+between two nodes of the same cluster costs the cheapest route that stays
+inside it, computed the first time a search expands that node. The
+abstract search inflates its heuristic, trading a little route quality for
+searching only clusters near the straight line.
+
+A long route is planned on the abstract graph and only refined to hexes
+one segment at a time, as it is walked. Terrain changes rebuild just the
+clusters around the changed hex.
+"""
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+import hex_math
+from pathfinding import INF, CostGrid, TravelPath, astar
+
+ROUTE_CLUSTER_SIZE = 16  # Cluster side length, in hexes
+ENTRANCE_SPLIT = 6  # Border runs at least this long get a transition at each end instead of one in the middle
+
+HEURISTIC_WEIGHT = 1.5  # Inflated abstract heuristic: far fewer clusters searched, routes within 1.5x of optimal
+
+_GOAL = -1  # Abstract search node standing for the goal hex
+
+
+@dataclass
+class PlannedRoute:
+    """An abstract route; hexes are produced segment by segment when iterated"""
+    start: Tuple[int, int]
+    goal: Tuple[int, int]
+    cost: int
+    waypoints: List[Tuple[int, int]]  # Start, transition hexes, goal
+    _planner: "HierarchicalPlanner" = field(repr=False, default=None)
+    _hexes: Optional[List[Tuple[int, int]]] = field(repr=False, default=None)
+
+    def iter_steps(self) -> Iterator[Tuple[int, int]]:
+        """
+        Every hex after the start, refining each segment only when reached.
+        A segment cut off by terrain changes since planning replans the rest
+        of the route from there; the walk ends early if nothing reaches the goal.
+        """
+        if self._hexes is not None:
+            yield from self._hexes[1:]
+            return
+        for a, b in zip(self.waypoints, self.waypoints[1:]):
+            cells = self._planner.refine(a, b)
+            if cells is None:
+                rest = self._planner.plan(a, self.goal)
+                if rest is not None:
+                    yield from rest.iter_steps()
+                return
+            yield from cells
+
+    def to_path(self) -> TravelPath:
+        """Fully refined route"""
+        return TravelPath([self.start] + list(self.iter_steps()), self.cost)
+
+
+class HierarchicalPlanner:
+    """Abstract cluster graph over a CostGrid, kept in sync through update()"""
+
+    def __init__(self, grid: CostGrid, cluster_size: int = ROUTE_CLUSTER_SIZE):
+        self.grid = grid
+        self.size = cluster_size
+        self.cluster_rows = -(-grid.height // cluster_size)
+        self.cluster_cols = -(-grid.width // cluster_size)
+
+        # Cluster id of every flat cell (-1 for the padding border)
+        rows = np.arange(grid.height + 2) - 1
+        cols = np.arange(grid.width + 2) - 1
+        ids = (rows[:, None] // cluster_size) * self.cluster_cols + cols[None, :] // cluster_size
+        ids[0, :] = ids[-1, :] = -1
+        ids[:, 0] = ids[:, -1] = -1
+        self.cluster_of: List[int] = ids.ravel().tolist()
+
+        # Chosen (a, b) border crossings per cluster pair, a in the lower id
+        self.transitions: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        self.nodes: Dict[int, Set[int]] = {}  # Transition cells per cluster
+        self.inter: Dict[int, Dict[int, int]] = {}  # Border crossing edges
+        self.intra: Dict[int, Dict[int, Dict[int, int]]] = {}  # Lazy in-cluster edges
+
+        for cid in range(self.cluster_rows * self.cluster_cols):
+            for other in self._adjacent_clusters(cid):
+                if cid < other:
+                    self._build_pair(cid, other)
+
+    # --- Abstract graph construction ---
+
+    def _adjacent_clusters(self, cid: int) -> List[int]:
+        row, col = divmod(cid, self.cluster_cols)
+        result = []
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                r, c = row + dr, col + dc
+                if (dr or dc) and 0 <= r < self.cluster_rows and 0 <= c < self.cluster_cols:
+                    result.append(r * self.cluster_cols + c)
+        return result
+
+    def _cluster_cells(self, cid: int) -> List[int]:
+        row, col = divmod(cid, self.cluster_cols)
+        pw = self.grid.pw
+        r0, c0 = row * self.size + 1, col * self.size + 1
+        r1 = min(r0 + self.size, self.grid.height + 1)
+        c1 = min(c0 + self.size, self.grid.width + 1)
+        return [r * pw + c for r in range(r0, r1) for c in range(c0, c1)]
+
+    def _build_pair(self, c: int, d: int):
+        """Choose the transitions between two clusters from their passable shared border"""
+        costs = self.grid.costs
+        cluster_of = self.cluster_of
+        crossings = {}
+        for a in self._cluster_cells(c):
+            if not costs[a]:
+                continue
+            for off in self.grid.offsets:
+                b = a + off
+                if cluster_of[b] == d and costs[b]:
+                    crossings.setdefault(a, b)
+
+        # Split the crossing cells into contiguous runs along the border
+        chosen = []
+        remaining = set(crossings)
+        while remaining:
+            run = [remaining.pop()]
+            i = 0
+            while i < len(run):
+                for off in self.grid.offsets:
+                    n = run[i] + off
+                    if n in remaining:
+                        remaining.discard(n)
+                        run.append(n)
+                i += 1
+            run.sort()
+            picks = [run[0], run[len(run) // 2], run[-1]] if len(run) >= ENTRANCE_SPLIT else [run[len(run) // 2]]
+            chosen.extend((a, crossings[a]) for a in picks)
+
+        for a, b in self.transitions.pop((c, d), []):
+            self.inter.get(a, {}).pop(b, None)
+            self.inter.get(b, {}).pop(a, None)
+        if chosen:
+            self.transitions[(c, d)] = chosen
+        for a, b in chosen:
+            # Entering a hex costs that hex's step cost
+            self.inter.setdefault(a, {})[b] = costs[b]
+            self.inter.setdefault(b, {})[a] = costs[a]
+
+    def _refresh_nodes(self, cid: int):
+        nodes = set()
+        for other in self._adjacent_clusters(cid):
+            for a, b in self.transitions.get((min(cid, other), max(cid, other)), []):
+                nodes.add(a if self.cluster_of[a] == cid else b)
+        self.nodes[cid] = nodes
+        self.intra.pop(cid, None)
+
+    def _nodes(self, cid: int) -> Set[int]:
+        nodes = self.nodes.get(cid)
+        if nodes is None:
+            self._refresh_nodes(cid)
+            nodes = self.nodes[cid]
+        return nodes
+
+    def _intra_edges(self, cid: int, node: int) -> Dict[int, int]:
+        """Cheapest in-cluster cost from a transition to the cluster's other transitions"""
+        cluster = self.intra.setdefault(cid, {})
+        edges = cluster.get(node)
+        if edges is None:
+            others = self._nodes(cid) - {node}
+            dist, _ = self._search(node, cid, others)
+            edges = cluster[node] = {m: dist[m] for m in others if m in dist}
+        return edges
+
+    def update(self, q: int, r: int):
+        """Rebuild the abstraction around a hex whose step cost changed in the grid"""
+        index = self.grid.index(q, r)
+        if index is None:
+            return
+        cid = self.cluster_of[index]
+        touched = [cid] + self._adjacent_clusters(cid)
+        for other in touched[1:]:
+            self._build_pair(min(cid, other), max(cid, other))
+        for t in touched:
+            self.nodes.pop(t, None)
+            self.intra.pop(t, None)
+
+    # --- Searches ---
+
+    def _search(self, src: int, cid: int, targets: Set[int], reverse: bool = False):
+        """
+        Dijkstra confined to one cluster, stopping once every target is settled.
+
+        Returns:
+            (dist, parent) dicts, final for the targets. With reverse=True,
+            dist is the cost of travelling from each cell to src instead.
+        """
+        costs = self.grid.costs
+        offsets = self.grid.offsets
+        cluster_of = self.cluster_of
+        dist = {src: 0}
+        parent = {src: -1}
+        heap = [(0, src)]
+        remaining = set(targets)
+        while heap and remaining:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            remaining.discard(u)
+            for off in offsets:
+                v = u + off
+                if cluster_of[v] != cid or not costs[v]:
+                    continue
+                nd = d + (costs[u] if reverse else costs[v])
+                if nd < dist.get(v, INF):
+                    dist[v] = nd
+                    parent[v] = u
+                    heapq.heappush(heap, (nd, v))
+        return dist, parent
+
+    def refine(self, a: Tuple[int, int], b: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """
+        Hexes after a up to and including b, for two consecutive waypoints,
+        or None if b can no longer be reached from a inside their cluster
+        """
+        grid = self.grid
+        ia, ib = grid.index(*a), grid.index(*b)
+        ca, cb = self.cluster_of[ia], self.cluster_of[ib]
+        if ca != cb:
+            return [b]  # Border crossing between neighbors
+        _, parent = self._search(ia, ca, {ib})
+        if ib not in parent:
+            return None
+        cells = []
+        cur = ib
+        while cur != ia:
+            cells.append(grid.coords(cur))
+            cur = parent[cur]
+        cells.reverse()
+        return cells
+
+    def plan(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[PlannedRoute]:
+        """Route from start to goal, or None if there is none"""
+        grid = self.grid
+        s, g = grid.index(*start), grid.index(*goal)
+        if s is None or g is None or not grid.costs[g]:
+            return None
+        cs, cg = self.cluster_of[s], self.cluster_of[g]
+
+        # Short hops are cheaper to search directly
+        if cs == cg or hex_math.hex_distance(*start, *goal) <= 2 * self.size:
+            path = astar(grid, start, goal)
+            if path is None:
+                return None
+            return PlannedRoute(start, goal, path.cost, [start, goal], self, path.hexes)
+
+        start_dist, _ = self._search(s, cs, self._nodes(cs))
+        start_edges = {n: start_dist[n] for n in self._nodes(cs) if n in start_dist and n != s}
+        goal_dist, _ = self._search(g, cg, self._nodes(cg), reverse=True)
+        goal_edges = {n: goal_dist[n] for n in self._nodes(cg) if n in goal_dist}
+        if s in goal_edges:
+            goal_edges.pop(s)
+
+        pw = grid.pw
+        g_row, g_col = divmod(g, pw)
+        dist = {s: 0}
+        parent = {s: None}
+        heap = [(0, 0, s)]
+        while heap:
+            _, neg_d, cur = heapq.heappop(heap)
+            if cur == _GOAL:
+                break
+            d = -neg_d
+            if d > dist[cur]:
+                continue
+            if cur == s:
+                edges = list(start_edges.items())
+                edges += self.inter.get(s, {}).items()
+            else:
+                cid = self.cluster_of[cur]
+                edges = list(self._intra_edges(cid, cur).items())
+                edges += self.inter.get(cur, {}).items()
+            if cur in goal_edges:
+                edges.append((_GOAL, goal_edges[cur]))
+            for nxt, step in edges:
+                nd = d + step
+                if nd < dist.get(nxt, INF):
+                    dist[nxt] = nd
+                    parent[nxt] = cur
+                    if nxt == _GOAL:
+                        h = 0
+                    else:
+                        row, col = divmod(nxt, pw)
+                        dq, dr = col - g_col, row - g_row
+                        h = HEURISTIC_WEIGHT * ((abs(dq) + abs(dr) + abs(dq + dr)) // 2)
+                    heapq.heappush(heap, (nd + h, -nd, nxt))
+
+        if _GOAL not in dist:
+            return None
+        cells = []
+        cur = parent[_GOAL]
+        while cur is not None:
+            cells.append(cur)
+            cur = parent[cur]
+        cells.reverse()
+        waypoints = [grid.coords(c) for c in cells] + [goal]
+        return PlannedRoute(start, goal, dist[_GOAL], waypoints, self)
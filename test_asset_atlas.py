@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Test packing, saving and reloading the renderer's asset atlas"""
+
+import os
+import tempfile
+
+from PIL import Image
+
+from asset_atlas import AssetAtlas, pack_images
+
+
+def _images():
+    return {
+        f"tile_{i}": Image.new("RGBA", (30 + 7 * i, 20 + 5 * i), (10 * i, 200 - 10 * i, 50, 255 - i))
+        for i in range(12)
+    }
+
+
+def test_packed_images_do_not_overlap():
+    """Every box lies inside the sheet and no two boxes intersect"""
+    sizes = {name: img.size for name, img in _images().items()}
+    boxes, width, height = pack_images(sizes, max_width=200)
+    assert width <= 200
+    placed = list(boxes.values())
+    for i, (x, y, w, h) in enumerate(placed):
+        assert (w, h) in sizes.values()
+        assert x + w <= width and y + h <= height
+        for x2, y2, w2, h2 in placed[i + 1:]:
+            assert x + w <= x2 or x2 + w2 <= x or y + h <= y2 or y2 + h2 <= y
+    print(f"✓ {len(boxes)} images packed into {width}x{height}")
+
+
+def test_atlas_round_trip():
+    """A saved atlas reloads with identical images, cropped only when used, and rejects other sources"""
+    images = _images()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "atlas.bin")
+        AssetAtlas.from_images(images, "sources-a").save(path)
+
+        atlas = AssetAtlas.load(path, "sources-a")
+        assert set(atlas) == set(images) and not atlas._crops
+        assert atlas["tile_3"].tobytes() == images["tile_3"].tobytes()
+        assert list(atlas._crops) == ["tile_3"]
+        assert all(atlas[name].tobytes() == img.tobytes() for name, img in images.items())
+
+        assert AssetAtlas.load(path, "sources-b") is None
+        assert AssetAtlas.load(os.path.join(tmp, "missing.bin")) is None
+    print("✓ Atlas reloads identical images")
+
+
+if __name__ == "__main__":
+    test_packed_images_do_not_overlap()
+    test_atlas_round_trip()
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""Test the world generation benchmark harness (tiny radii only)"""
+
+import json
+
+from bench_worldgen import benchmark
+
+
+def test_report_covers_every_phase():
+    """Each run reports time and peak memory for every phase, and serializes"""
+    report = benchmark([3, 6], [1], memory=True)
+    assert [run["radius"] for run in report["runs"]] == [3, 6]
+    for run in report["runs"]:
+        assert list(run["phases"]) == ["coordinates", "terrain", "clusters", "labels", "reveal"]
+        for values in run["phases"].values():
+            assert values["seconds"] >= 0 and values["peak_bytes"] >= 0
+    assert set(report["median"]) == {"3", "6"}
+    json.dumps(report)
+    print("✓ Benchmark report")
+
+
+if __name__ == "__main__":
+    test_report_covers_every_phase()
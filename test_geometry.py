@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Test convex hull diameter and axial width helpers"""
+
+import itertools
+import random
+
+from geometry import convex_hull, hull_diameter, axial_width
+
+
+def test_hull_diameter_matches_brute_force():
+    """Rotating calipers should find the same diameter as the all-pairs search"""
+    rng = random.Random(42)
+    for _ in range(200):
+        points = [(rng.randint(-20, 20) * 1.5, rng.randint(-20, 20) * 0.7)
+                  for _ in range(rng.randint(1, 40))]
+        dist, p1, p2 = hull_diameter(points)
+        brute = max((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2
+                    for a, b in itertools.product(points, points))
+        assert abs(dist - brute) < 1e-9, f"Expected {brute}, got {dist}"
+        assert abs((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2 - dist) < 1e-9
+    print("✓ Hull diameter matches brute force")
+
+
+def test_convex_hull_drops_interior_and_collinear():
+    """Square with interior and edge points keeps only its corners"""
+    points = [(0, 0), (2, 0), (2, 2), (0, 2), (1, 1), (1, 0), (2, 1)]
+    hull = convex_hull(points)
+    assert sorted(hull) == [(0, 0), (0, 2), (2, 0), (2, 2)], f"Unexpected hull {hull}"
+    print("✓ Convex hull keeps only corners")
+
+
+def test_axial_width_matches_hex_distance():
+    """Axial width should equal the largest pairwise hex distance"""
+    rng = random.Random(7)
+    for _ in range(200):
+        coords = [(rng.randint(-9, 9), rng.randint(-9, 9)) for _ in range(rng.randint(2, 25))]
+        qs = [q for q, _ in coords]
+        rs = [r for _, r in coords]
+        brute = max((abs(q1 - q2) + abs(r1 - r2) + abs(q1 + r1 - q2 - r2)) // 2
+                    for (q1, r1), (q2, r2) in itertools.product(coords, coords))
+        assert axial_width(qs, rs) == brute
+    print("✓ Axial width matches hex distance")
+
+
+if __name__ == "__main__":
+    test_hull_diameter_matches_brute_force()
+    test_convex_hull_drops_interior_and_collinear()
+    test_axial_width_matches_hex_distance()
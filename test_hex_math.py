@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Test shared hex math helpers"""
+
+import random
+
+import hex_math
+
+
+def test_pixel_round_trip():
+    """Every hex center converts back to the same hex, scalar and batched"""
+    coords = hex_math.spiral(3, -2, 6)
+    for q, r in coords:
+        x, y = hex_math.axial_to_pixel(q, r, 74)
+        assert hex_math.pixel_to_hex(x, y, 74) == (q, r)
+
+    qs = [q for q, _ in coords]
+    rs = [r for _, r in coords]
+    xs, ys = hex_math.axial_to_pixel_batch(qs, rs, 74)
+    bq, br = hex_math.pixel_to_hex_batch(xs, ys, 74)
+    assert bq.tolist() == qs and br.tolist() == rs
+    print(f"✓ {len(coords)} hex centers round trip")
+
+
+def test_batched_rounding_matches_scalar():
+    """axial_round_batch agrees with axial_round, including exact ties"""
+    rng = random.Random(3)
+    points = [(rng.uniform(-40, 40), rng.uniform(-40, 40)) for _ in range(5000)]
+    points += [(0.5, 0.5), (1.5, -0.5), (0.5, 0.0), (-0.5, 0.0)]
+    bq, br = hex_math.axial_round_batch([p[0] for p in points], [p[1] for p in points])
+    for (q, r), a, b in zip(points, bq.tolist(), br.tolist()):
+        assert hex_math.axial_round(q, r) == (a, b), (q, r)
+    print("✓ Batched rounding matches scalar")
+
+
+def test_rings_and_ranges():
+    """Ring sizes, distances and spiral ordering"""
+    assert len(hex_math.ring(0, 0, 0)) == 1
+    for k in range(1, 6):
+        ring = hex_math.ring(2, 5, k)
+        assert len(ring) == 6 * k
+        assert all(hex_math.hex_distance(2, 5, q, r) == k for q, r in ring)
+
+    spiral = hex_math.spiral(0, 0, 4)
+    assert len(spiral) == 1 + 3 * 4 * 5
+    assert spiral[0] == (0, 0)
+    assert [hex_math.hex_distance(0, 0, q, r) for q, r in spiral] == \
+        sorted(hex_math.hex_distance(0, 0, q, r) for q, r in spiral)
+
+    dq, dr = hex_math.range_offsets_array(4)
+    assert list(zip(dq.tolist(), dr.tolist())) == spiral
+    print("✓ Rings, spirals and ranges")
+
+
+def test_neighbors_are_adjacent():
+    """Neighbor and edge direction tables only contain distance-1 steps"""
+    for q, r in hex_math.neighbors(0, 0):
+        assert hex_math.hex_distance(0, 0, q, r) == 1
+    assert set(hex_math.EDGE_DIRECTIONS) == set(hex_math.AXIAL_DIRECTIONS)
+    print("✓ Neighbors adjacent")
+
+
+if __name__ == "__main__":
+    test_pixel_round_trip()
+    test_batched_rounding_matches_scalar()
+    test_rings_and_ranges()
+    test_neighbors_are_adjacent()
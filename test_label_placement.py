@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Test global label placement with the spatial hash"""
+
+from label_placement import LabelCandidate, LabelPlacer, OrientedBox
+
+
+def test_higher_priority_wins_overlap():
+    """Two labels on the same spot: only the higher priority one is placed"""
+    placer = LabelPlacer()
+    placed = placer.place_all([
+        LabelCandidate(0, 0, 0, 5, "Small Lake"),
+        LabelCandidate(10, 5, 0, 50, "Great Forest"),
+    ])
+    assert [p.text for p in placed] == ["Great Forest"], placed
+    print("✓ Higher priority label wins")
+
+
+def test_rotated_boxes_use_real_orientation():
+    """Parallel diagonal labels whose AABBs overlap should both fit"""
+    a = OrientedBox(0, 0, 200, 20, 45)
+    b = OrientedBox(40, -40, 200, 20, 45)
+    assert not a.intersects(b), "Parallel offset labels should not collide"
+    c = OrientedBox(0, 0, 200, 20, -45)
+    assert a.intersects(c), "Crossing labels should collide"
+    print("✓ Oriented box collisions")
+
+
+def test_group_spacing_and_lazy_text():
+    """Same-group candidates closer than min_distance never generate text"""
+    calls = []
+
+    def name():
+        calls.append(1)
+        return "Sea"
+
+    candidates = [LabelCandidate(x, 0, 0, 1, name, group=1, min_distance=300)
+                  for x in range(0, 1000, 50)]
+    placed = LabelPlacer().place_all(candidates)
+    xs = [p.x for p in placed]
+    assert xs == [0, 300, 600, 900], xs
+    assert len(calls) == len(placed), "Text should only be generated for spaced candidates"
+    print("✓ Group spacing respected")
+
+
+if __name__ == "__main__":
+    test_higher_priority_wins_overlap()
+    test_rotated_boxes_use_real_orientation()
+    test_group_spacing_and_lazy_text()
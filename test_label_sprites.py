@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""Test pre-rendered map label sprites (no window needed)"""
+
+from label_sprites import label_font, render_label
+
+
+def test_sprites_are_cropped_to_the_text():
+    """No fully transparent rows or columns are left around a label"""
+    for angle in (0, 27.5, -60):
+        sprite, _ = render_label("Whispering Woods", angle)
+        assert sprite.getchannel("A").getbbox() == (0, 0, sprite.width, sprite.height)
+    flat, (dx, dy) = render_label("Whispering Woods", 0)
+    assert flat.width > flat.height
+    assert abs(dx) <= 1 and abs(dy) <= 1
+    print("✓ Label sprites are tight")
+
+
+def test_font_is_loaded_once():
+    assert label_font() is label_font()
+    print("✓ Font cached")
+
+
+if __name__ == "__main__":
+    test_sprites_are_cropped_to_the_text()
+    test_font_is_loaded_once()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Test A* route finding on cost grids"""
+
+import heapq
+import random
+
+import numpy as np
+
+import hex_math
+from pathfinding import CostGrid, DistanceField, astar
+
+
+def _dijkstra_cost(grid, start, goal):
+    """Reference cheapest cost by plain Dijkstra"""
+    s, g = grid.index(*start), grid.index(*goal)
+    dist = {s: 0}
+    heap = [(0, s)]
+    while heap:
+        d, cur = heapq.heappop(heap)
+        if cur == g:
+            return d
+        if d > dist[cur]:
+            continue
+        for off in grid.offsets:
+            nxt = cur + off
+            if grid.costs[nxt] and d + grid.costs[nxt] < dist.get(nxt, float("inf")):
+                dist[nxt] = d + grid.costs[nxt]
+                heapq.heappush(heap, (dist[nxt], nxt))
+    return None
+
+
+def test_open_ground_is_straight():
+    """Uniform cost routes take exactly hex-distance steps"""
+    grid = CostGrid(-10, -10, np.ones((21, 21), dtype=np.int64))
+    path = astar(grid, (-5, 3), (6, -4))
+    assert len(path) == hex_math.hex_distance(-5, 3, 6, -4) == path.cost
+    for a, b in zip(path.hexes, path.hexes[1:]):
+        assert hex_math.hex_distance(*a, *b) == 1
+    print(f"✓ Straight route of {len(path)} steps")
+
+
+def test_wall_forces_detour_or_blocks():
+    """Impassable cells are routed around; a sealed goal is unreachable"""
+    costs = np.ones((11, 11), dtype=np.int64)
+    costs[:10, 5] = 0  # Wall at q = 5 with a gap at the bottom row
+    grid = CostGrid(0, 0, costs)
+    path = astar(grid, (2, 0), (8, 0))
+    assert path is not None and (5, 10) in path.hexes
+    costs[10, 5] = 0
+    assert astar(CostGrid(0, 0, costs), (2, 0), (8, 0)) is None
+    print("✓ Detours and dead ends")
+
+
+def test_matches_dijkstra_on_random_costs():
+    """A* finds the same optimal cost as Dijkstra"""
+    rng = np.random.default_rng(11)
+    costs = rng.choice([0, 1, 2, 3], size=(30, 30), p=[0.15, 0.45, 0.25, 0.15])
+    grid = CostGrid(0, 0, costs)
+    pick = random.Random(5)
+    checked = 0
+    for _ in range(40):
+        a = (pick.randrange(30), pick.randrange(30))
+        b = (pick.randrange(30), pick.randrange(30))
+        path = astar(grid, a, b)
+        expected = _dijkstra_cost(grid, a, b) if costs[b[1], b[0]] else None
+        assert (path.cost if path else None) == expected, (a, b)
+        checked += path is not None
+    print(f"✓ {checked} optimal routes")
+
+
+def test_distance_field_updates_match_rebuild():
+    """Incremental updates agree with a field rebuilt from scratch"""
+    rng = np.random.default_rng(4)
+    costs = rng.choice([0, 1, 2, 3], size=(25, 25), p=[0.2, 0.4, 0.25, 0.15])
+    sources = {(3, 3), (20, 18), (12, 5)}
+    for q, r in sources:
+        costs[r, q] = 1
+    field = DistanceField(CostGrid(0, 0, costs.copy()), sources)
+
+    pick = random.Random(8)
+    for _ in range(60):
+        q, r = pick.randrange(25), pick.randrange(25)
+        costs[r, q] = pick.choice([0, 1, 2, 3])
+        if pick.random() < 0.2:
+            sources.symmetric_difference_update({(q, r)})
+        is_source = (q, r) in sources and costs[r, q] > 0
+        field.update(q, r, int(costs[r, q]), is_source)
+
+        fresh = DistanceField(CostGrid(0, 0, costs.copy()), sources)
+        assert list(field.dist) == list(fresh.dist), f"After changing {(q, r)}"
+
+    # Following next steps reaches the nearest source at the stated cost
+    for q, r in [(0, 0), (24, 24), (10, 10)]:
+        total, at = 0, (q, r)
+        while field.next_step(*at) is not None:
+            at = field.next_step(*at)
+            total += costs[at[1], at[0]]
+        if field.distance(q, r) is not None:
+            assert at == field.nearest_source(q, r) and total == field.distance(q, r)
+    print("✓ Incremental distance field")
+
+
+if __name__ == "__main__":
+    test_open_ground_is_straight()
+    test_wall_forces_detour_or_blocks()
+    test_matches_dijkstra_on_random_costs()
+    test_distance_field_updates_match_rebuild()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Test the hierarchical route planner"""
+
+import random
+
+import numpy as np
+
+import hex_math
+from pathfinding import CostGrid, astar
+from route_planner import HEURISTIC_WEIGHT, HierarchicalPlanner
+
+
+def _random_grid(seed, size=80):
+    rng = np.random.default_rng(seed)
+    costs = rng.choice([0, 1, 2, 3], size=(size, size), p=[0.1, 0.5, 0.25, 0.15])
+    return CostGrid(0, 0, costs)
+
+
+def _walk_cost(grid, path):
+    for a, b in zip(path.hexes, path.hexes[1:]):
+        assert hex_math.hex_distance(*a, *b) == 1, (a, b)
+    return sum(grid.costs[grid.index(*h)] for h in path.hexes[1:])
+
+
+def test_routes_refine_to_their_cost():
+    """Refined routes are connected, passable, and near optimal"""
+    grid = _random_grid(1)
+    planner = HierarchicalPlanner(grid, cluster_size=8)
+    pick = random.Random(2)
+    planned = 0
+    for _ in range(25):
+        a = (pick.randrange(80), pick.randrange(80))
+        b = (pick.randrange(80), pick.randrange(80))
+        route = planner.plan(a, b)
+        best = astar(grid, a, b)
+        assert (route is None) == (best is None), (a, b)
+        if route is None:
+            continue
+        path = route.to_path()
+        assert path.hexes[0] == a and path.hexes[-1] == b
+        assert _walk_cost(grid, path) == route.cost
+        assert best.cost <= route.cost <= HEURISTIC_WEIGHT * best.cost
+        planned += 1
+    print(f"✓ {planned} hierarchical routes refined")
+
+
+def test_update_rebuilds_around_changes():
+    """Walls raised after building are routed around"""
+    costs = np.ones((40, 40), dtype=np.int64)
+    grid = CostGrid(0, 0, costs)
+    planner = HierarchicalPlanner(grid, cluster_size=8)
+    assert planner.plan((2, 20), (37, 20)) is not None
+
+    # Wall off q = 20 except one gap near the top
+    for r in range(3, 40):
+        grid.set_cost(20, r, 0)
+        planner.update(20, r)
+    path = planner.plan((2, 20), (37, 20)).to_path()
+    assert all(grid.costs[grid.index(*h)] for h in path.hexes)
+    assert any(q == 20 and r < 3 for q, r in path.hexes), "Route uses the gap"
+
+    for r in range(3):
+        grid.set_cost(20, r, 0)
+        planner.update(20, r)
+    assert planner.plan((2, 20), (37, 20)) is None
+    print("✓ Planner follows terrain changes")
+
+
+def test_walk_survives_changes_after_planning():
+    """Segments blocked after planning replan the rest of the walk, or end it"""
+    for gap in (True, False):
+        grid = CostGrid(0, 0, np.ones((40, 40), dtype=np.int64))
+        planner = HierarchicalPlanner(grid, cluster_size=8)
+        route = planner.plan((2, 20), (37, 20))
+        steps = route.iter_steps()
+        walked = [(2, 20), next(steps)]
+
+        # Wall off q = 30, in the middle of a cluster the route has not reached yet
+        for r in range(1 if gap else 0, 40):
+            grid.set_cost(30, r, 0)
+            planner.update(30, r)
+        walked += list(steps)
+        for a, b in zip(walked, walked[1:]):
+            assert hex_math.hex_distance(*a, *b) == 1, (a, b)
+            assert grid.costs[grid.index(*b)], f"Walked into the wall at {b}"
+        assert (walked[-1] == (37, 20)) == gap
+    print("✓ Walks replan or stop when their route is cut")
+
+
+if __name__ == "__main__":
+    test_routes_refine_to_their_cost()
+    test_update_rebuilds_around_changes()
+    test_walk_survives_changes_after_planning()
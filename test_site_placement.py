@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Test Poisson-disk site placement"""
+
+import numpy as np
+
+import hex_math
+from site_placement import PoissonDiskSampler
+
+
+def _uniform_scores(q0, r0, width, height):
+    return np.ones((height, width))
+
+
+def _hash_keys(qs, rs):
+    return ((qs * 73856093) ^ (rs * 19349663)) % 1000003 / 1000003.0
+
+
+def test_sites_keep_their_spacing():
+    """No two sites are closer than the spacing, and the plane is covered"""
+    sampler = PoissonDiskSampler(8, _uniform_scores, _hash_keys, fixed=[(0, 0)])
+    sites = sampler.sites_in(-60, -60, 60, 60)
+    for i, a in enumerate(sites):
+        for b in sites[i + 1:]:
+            assert hex_math.hex_distance(*a, *b) >= 8, (a, b)
+    assert (0, 0) in sites
+    assert len(sites) > 60, f"Only {len(sites)} sites in a 120x120 area"
+    print(f"✓ {len(sites)} sites, all spaced")
+
+
+def test_regions_agree_with_whole():
+    """Sampling piecewise (as streamed chunks do) gives the same sites"""
+    whole = PoissonDiskSampler(8, _uniform_scores, _hash_keys)
+    expected = set(whole.sites_in(0, 0, 64, 64))
+    pieces = PoissonDiskSampler(8, _uniform_scores, _hash_keys)
+    found = set()
+    for q in range(0, 64, 16):
+        for r in range(0, 64, 16):
+            found |= set(pieces.sites_in(q, r, q + 16, r + 16))
+    assert found == expected
+    print("✓ Chunked sampling matches")
+
+
+def test_unsuitable_hexes_and_avoidance():
+    """Zero-score hexes never host sites; avoided sites keep their clearance"""
+    def left_half(q0, r0, width, height):
+        qs = np.arange(q0, q0 + width)
+        return np.broadcast_to((qs < 0).astype(float), (height, width))
+
+    towns = PoissonDiskSampler(10, _uniform_scores, _hash_keys)
+    dungeons = PoissonDiskSampler(6, left_half, lambda qs, rs: _hash_keys(rs, qs),
+                                  avoid=towns, avoid_spacing=4)
+    found = dungeons.sites_in(-40, -40, 40, 40)
+    town_sites = towns.sites_in(-60, -60, 60, 60)
+    assert found and all(q < 0 for q, _ in found)
+    for d in found:
+        assert all(hex_math.hex_distance(*d, *t) >= 4 for t in town_sites)
+    print(f"✓ {len(found)} dungeons on suitable ground, clear of towns")
+
+
+if __name__ == "__main__":
+    test_sites_keep_their_spacing()
+    test_regions_agree_with_whole()
+    test_unsuitable_hexes_and_avoidance()
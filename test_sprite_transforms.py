@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Test the memoized sprite transforms used to paint terrain variants (no window needed)"""
+
+import math
+from collections import OrderedDict
+
+from PIL import Image
+
+import hex_painter
+from hex_painter import HexPainter
+
+
+def _add_sprite(name, size=(40, 40)):
+    HexPainter._sprites[name] = Image.new("RGBA", size, (30, 120, 30, 255))
+
+
+def _save_caches():
+    """Swap in empty sprite caches; returns what _restore_caches needs to put the real ones back"""
+    saved = (HexPainter._sprites, HexPainter._sprite_sets, HexPainter._rotations, HexPainter._rotation_bytes,
+             HexPainter._transforms, HexPainter._transform_bytes)
+    HexPainter._sprites = dict(HexPainter._sprites)
+    HexPainter._sprite_sets = {}
+    HexPainter._rotations, HexPainter._rotation_bytes = OrderedDict(), 0
+    HexPainter._transforms, HexPainter._transform_bytes = OrderedDict(), 0
+    return saved
+
+
+def _restore_caches(saved):
+    (HexPainter._sprites, HexPainter._sprite_sets, HexPainter._rotations, HexPainter._rotation_bytes,
+     HexPainter._transforms, HexPainter._transform_bytes) = saved
+
+
+def test_nearby_transforms_share_one_image():
+    """Angles and scales in the same bucket return the same cached image"""
+    saved = _save_caches()
+    try:
+        _add_sprite("test_tree")
+        a = HexPainter.transformed_sprite("test_tree", 1.5, 10.0, True)
+        b = HexPainter.transformed_sprite("test_tree", 1.495, 10.4, True)
+        assert a is b
+        assert HexPainter.transformed_sprite("test_tree", 1.5, 10.0, False) is not a
+        assert HexPainter.transformed_sprite("test_tree", 1.7, 10.0, True) is not a
+
+        # Same result as transforming directly at the bucket's angle and scale
+        scale = math.exp(round(math.log(1.5) / hex_painter.SCALE_LOG_STEP) * hex_painter.SCALE_LOG_STEP)
+        direct = HexPainter._sprites["test_tree"].transpose(Image.FLIP_LEFT_RIGHT)
+        direct = direct.rotate(10.0, expand=True, resample=Image.BICUBIC)
+        direct = direct.resize((int(direct.width * scale), int(direct.height * scale)), Image.Resampling.LANCZOS)
+        assert a.size == direct.size and a.tobytes() == direct.tobytes()
+    finally:
+        _restore_caches(saved)
+    print("✓ Transforms in one bucket are shared")
+
+
+def test_transform_cache_is_bounded():
+    """The least recently used transforms are dropped once the byte budget is exceeded"""
+    saved = _save_caches()
+    saved_max = hex_painter.TRANSFORM_CACHE_MAX_BYTES
+    hex_painter.TRANSFORM_CACHE_MAX_BYTES = 1_000_000
+    try:
+        _add_sprite("test_big", (200, 200))
+        first = HexPainter.transformed_sprite("test_big", 1.0)
+        for i in range(1, 20):
+            HexPainter.transformed_sprite("test_big", 1.02 ** i)
+        assert HexPainter._transform_bytes <= hex_painter.TRANSFORM_CACHE_MAX_BYTES
+        assert HexPainter._transform_bytes == sum(
+            img.width * img.height * 4 for img in HexPainter._transforms.values())
+        assert HexPainter.transformed_sprite("test_big", 1.0) is not first
+        kept = len(HexPainter._transforms)
+    finally:
+        hex_painter.TRANSFORM_CACHE_MAX_BYTES = saved_max
+        _restore_caches(saved)
+    print(f"✓ {kept} transforms kept within the budget")
+
+
+def test_rotation_cache_is_bounded():
+    """Precomputed and on-demand rotations stay within their own byte budget"""
+    saved = _save_caches()
+    saved_max = hex_painter.ROTATION_CACHE_MAX_BYTES
+    hex_painter.ROTATION_CACHE_MAX_BYTES = 500_000
+    try:
+        for i in range(1, 19):
+            _add_sprite(f"tree_{i}", (60, 80))
+        HexPainter.precompute_forest_sprites()
+        assert 0 < len(HexPainter._rotations) < 18 * 2 * 31
+        for bucket in range(-15, 16):
+            HexPainter.rotated_sprite("tree_18", bucket, True)
+        assert HexPainter._rotation_bytes <= hex_painter.ROTATION_CACHE_MAX_BYTES
+        assert HexPainter._rotation_bytes == sum(
+            img.width * img.height * 4 for img in HexPainter._rotations.values())
+        kept = len(HexPainter._rotations)
+    finally:
+        hex_painter.ROTATION_CACHE_MAX_BYTES = saved_max
+        _restore_caches(saved)
+    print(f"✓ {kept} rotations kept within the budget")
+
+
+if __name__ == "__main__":
+    test_nearby_transforms_share_one_image()
+    test_transform_cache_is_bounded()
+    test_rotation_cache_is_bounded()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Test the persistent tile cache (no window needed)"""
+
+import os
+import tempfile
+import time
+
+from PIL import Image
+
+from tile_cache import TileDiskCache, sprite_set_hash
+
+
+def _tile(shade):
+    return Image.new("RGBA", (40, 30), (shade, 100, 50, 255))
+
+
+def test_tiles_survive_restarts():
+    """Stored tiles load back pixel-identical in a new session, per namespace"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TileDiskCache(tmp, "forest/1/74/abc", 10 ** 6)
+        cache.store(3, -2, _tile(7))
+        assert cache.load(5, 5) is None
+
+        reopened = TileDiskCache(tmp, "forest/1/74/abc", 10 ** 6)
+        assert reopened.load(3, -2).tobytes() == _tile(7).tobytes()
+        assert reopened.total_bytes == cache.total_bytes
+        assert TileDiskCache(tmp, "forest/2/74/abc", 10 ** 6).load(3, -2) is None
+    print("✓ Tiles persist and are keyed by namespace")
+
+
+def test_size_bound_evicts_least_recently_used():
+    """Over budget, the tiles used longest ago go first, even across sessions"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TileDiskCache(tmp, "ns", 10 ** 6)
+        for q in range(3):
+            cache.store(q, 0, _tile(q))
+        per_tile = cache.total_bytes // 3
+        time.sleep(0.01)
+        assert cache.load(0, 0) is not None  # Now the most recent
+
+        small = TileDiskCache(tmp, "ns", per_tile * 2 + per_tile // 2)
+        small.store(3, 0, _tile(3))
+        assert small.total_bytes <= small.max_bytes
+        assert small.load(1, 0) is None and small.load(2, 0) is None
+        assert small.load(0, 0) is not None and small.load(3, 0) is not None
+        assert len(os.listdir(tmp)) >= 1
+    print("✓ LRU eviction keeps the cache under its size bound")
+
+
+def test_unwritable_cache_is_skipped():
+    """A cache directory that cannot be written to stores nothing instead of raising"""
+    with tempfile.TemporaryDirectory() as tmp:
+        blocker = os.path.join(tmp, "not_a_dir")
+        with open(blocker, "w") as f:
+            f.write("x")
+        cache = TileDiskCache(os.path.join(blocker, "tiles"), "ns", 10 ** 6)
+        cache.store(1, 2, _tile(5))
+        assert cache.total_bytes == 0 and cache.load(1, 2) is None
+    print("✓ Unwritable cache skipped")
+
+
+def test_sprite_hash_tracks_file_contents():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tree_1.png")
+        before = sprite_set_hash([path])
+        _tile(1).save(path)
+        after = sprite_set_hash([path])
+        assert before != after
+        assert sprite_set_hash([path], "2") != after
+    print("✓ Sprite set hash changes with the sprites")
+
+
+if __name__ == "__main__":
+    test_tiles_survive_restarts()
+    test_size_bound_evicts_least_recently_used()
+    test_unwritable_cache_is_skipped()
+    test_sprite_hash_tracks_file_contents()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Test heading prediction and idle-time slicing of tile prefetching (no window needed)"""
+
+import time
+
+import tile_prefetch
+from tile_prefetch import TilePrefetcher
+
+
+class IdleWidget:
+    """Collects after_idle callbacks so the test decides when Tk is idle"""
+
+    def __init__(self):
+        self.pending = []
+
+    def after_idle(self, callback):
+        self.pending.append(callback)
+        return len(self.pending)
+
+    def after_cancel(self, job):
+        self.pending.clear()
+
+    def run_idle(self) -> int:
+        """Run one idle pass; returns how many callbacks ran"""
+        callbacks, self.pending = self.pending, []
+        for callback in callbacks:
+            callback()
+        return len(callbacks)
+
+
+def test_predicts_along_heading():
+    """Steady moves east predict the next hexes east; standing still predicts nothing"""
+    prefetcher = TilePrefetcher(IdleWidget(), lambda q, r: None, lambda q, r: True)
+    assert prefetcher.predicted_centers() == []
+    for q in range(4):
+        prefetcher.observe(q, 2)
+    assert prefetcher.predicted_centers(3) == [(4, 2), (5, 2), (6, 2)]
+
+    still = TilePrefetcher(IdleWidget(), lambda q, r: None, lambda q, r: True)
+    still.observe(1, 1)
+    still.observe(1, 1)
+    assert still.predicted_centers() == []
+    print("✓ Heading predicts the next positions")
+
+
+def test_work_is_sliced_across_idle_passes():
+    """Each idle pass stops after its time slice; skipped tiles are not produced"""
+    produced = []
+
+    def produce(q, r):
+        time.sleep(0.004)
+        produced.append((q, r))
+
+    widget = IdleWidget()
+    prefetcher = TilePrefetcher(widget, produce, lambda q, r: q % 2 == 0)
+    prefetcher.request([(q, 0) for q in range(20)])
+
+    passes = 0
+    while widget.run_idle():
+        passes += 1
+        assert len(produced) <= passes * (tile_prefetch.PREFETCH_SLICE_MS // 4 + 1)
+    assert produced == [(q, 0) for q in range(0, 20, 2)]
+    assert passes > 1
+    print(f"✓ {len(produced)} tiles produced over {passes} idle passes")
+
+
+if __name__ == "__main__":
+    test_predicts_along_heading()
+    test_work_is_sliced_across_idle_passes()
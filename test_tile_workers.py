@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Test forest tile synthesis in worker processes (no window needed)"""
+
+import os
+import tempfile
+import time
+
+from hex_painter import HexPainter
+from tile_cache import TileDiskCache
+from tile_workers import TileWorkerPool
+
+
+class AfterWidget:
+    """Collects after() callbacks so the test runs the Tk side by hand"""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+        return len(self.pending)
+
+    def after_cancel(self, job):
+        self.pending.clear()
+
+    def run_pending(self):
+        callbacks, self.pending = self.pending, []
+        for callback in callbacks:
+            callback()
+
+
+def test_workers_match_painting_in_process():
+    """Tiles arriving through shared memory are identical to painting them directly"""
+    ready = {}
+    widget = AfterWidget()
+    pool = TileWorkerPool(widget, 74, lambda q, r, img: ready.__setitem__((q, r), img), workers=2)
+    try:
+        hexes = [(q, r) for q in range(-2, 2) for r in range(3)]
+        for q, r in hexes:
+            pool.submit(q, r)
+        pool.submit(0, 0, urgent=True)  # Already queued: no duplicate
+
+        deadline = time.time() + 30
+        while pool.pending and time.time() < deadline:
+            time.sleep(0.01)
+            widget.run_pending()
+        assert set(ready) == set(hexes)
+        for (q, r), img in ready.items():
+            assert img.tobytes() == HexPainter.paint_forest_tile(q, r, 74).tobytes()
+    finally:
+        pool.close()
+    print(f"✓ {len(ready)} tiles painted by workers")
+
+
+def test_cache_write_failure_keeps_tiles():
+    """Tiles still arrive when the workers cannot write the disk cache"""
+    ready = {}
+    widget = AfterWidget()
+    with tempfile.TemporaryDirectory() as tmp:
+        blocker = os.path.join(tmp, "not_a_dir")
+        with open(blocker, "w") as f:
+            f.write("x")
+        cache = TileDiskCache(os.path.join(blocker, "tiles"), "ns", 10 ** 6)
+        pool = TileWorkerPool(widget, 74, lambda q, r, img: ready.__setitem__((q, r), img),
+                              workers=1, disk_cache=cache)
+        try:
+            pool.submit(4, -1)
+            deadline = time.time() + 30
+            while pool.pending and time.time() < deadline:
+                time.sleep(0.01)
+                widget.run_pending()
+            assert set(ready) == {(4, -1)}
+            assert cache.total_bytes == 0
+        finally:
+            pool.close()
+    print("✓ Cache write failures do not lose tiles")
+
+
+if __name__ == "__main__":
+    test_workers_match_painting_in_process()
+    test_cache_write_failure_keeps_tiles()
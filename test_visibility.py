@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Test hex shadowcasting line of sight"""
+
+import hex_math
+from visibility import VisibilityEngine, compute_visible
+
+
+def test_open_ground_sees_everything():
+    """With nothing blocking, the view is the full hex range"""
+    seen = compute_visible(3, -1, 5, lambda q, r: False)
+    assert seen == set(hex_math.hex_range(3, -1, 5))
+    print(f"✓ Open ground sees all {len(seen)} hexes")
+
+
+def test_wall_casts_shadow():
+    """A blocker is visible itself but hides the hexes directly behind it"""
+    wall = {(0, -1)}
+    seen = compute_visible(0, 0, 4, lambda q, r: (q, r) in wall)
+    assert (0, -1) in seen, "Blockers are lit"
+    for k in range(2, 5):
+        assert (0, -k) not in seen, f"(0, {-k}) should be in shadow"
+    assert (0, 1) in seen and (1, -2) in seen, "Off-axis hexes stay visible"
+    print("✓ Wall shadows the line behind it")
+
+
+def test_enclosed_viewer_sees_only_walls():
+    """A ring of blockers stops the view at the ring"""
+    ring = set(hex_math.ring(0, 0, 1))
+    seen = compute_visible(0, 0, 6, lambda q, r: (q, r) in ring)
+    assert seen == ring | {(0, 0)}
+    print("✓ Enclosed viewer sees only the enclosing ring")
+
+
+def test_engine_caches_until_invalidated():
+    """Repeat queries hit the cache; invalidate forces a recompute"""
+    calls = []
+
+    def blocks(q, r):
+        calls.append((q, r))
+        return False
+
+    engine = VisibilityEngine(blocks)
+    first = engine.visible_from(0, 0, 3)
+    count = len(calls)
+    assert engine.visible_from(0, 0, 3) is first and len(calls) == count
+    engine.invalidate()
+    engine.visible_from(0, 0, 3)
+    assert len(calls) == 2 * count
+    print("✓ Visibility cache")
+
+
+if __name__ == "__main__":
+    test_open_ground_sees_everything()
+    test_wall_casts_shadow()
+    test_enclosed_viewer_sees_only_walls()
+    test_engine_caches_until_invalidated()
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""Test HexMap generation, storage and snapshots (no window needed)"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import world_map
+from world_map import (DECORATION_POOLS, DUNGEON_SPACING, FLAG_EXPLORED, FLAG_VALID, TERRAIN_CODES,
+                       TERRAIN_TYPES, TOWN_SPACING, HexMap, TerrainType, hex_hash, hex_hash_batch)
+
+
+def test_same_seed_same_world():
+    """Bounded and streamed worlds agree hex for hex for the same seed"""
+    bounded = HexMap(radius=15, seed=1234)
+    bounded.generate_map()
+    streamed = HexMap(radius=None, seed=1234, max_chunks=4)
+    streamed.generate_map()
+
+    for (q, r), tile in bounded.hexes.items():
+        other = streamed.get_hex_at(q, r)
+        assert other.terrain == tile.terrain, f"Terrain differs at {(q, r)}"
+        assert other.variant_id == tile.variant_id, f"Variant differs at {(q, r)}"
+    assert bounded.get_hex_at(0, 0).terrain == TerrainType.TOWN
+    print(f"✓ {len(bounded.hexes)} hexes identical in both modes")
+
+
+def test_evicted_chunks_keep_fog():
+    """Chunks regenerate after eviction with their explored state intact"""
+    world = HexMap(radius=None, seed=99, max_chunks=2)
+    world.generate_map()
+    world.reveal_hex(200, -50, radius=1)
+    terrain = world.get_hex_at(200, -50).terrain
+
+    for i in range(10):
+        world.get_hex_at(i * 100, i * 100)
+    assert (200, -50) not in world.hexes, "Chunk should have been evicted"
+
+    fog = world._chunk_fog[world.chunk_key(200, -50)]
+    assert isinstance(fog, bytes) and len(fog) == 2 * world.chunk_size ** 2 // 8
+
+    tile = world.get_hex_at(200, -50)
+    assert tile.terrain == terrain
+    assert tile.is_explored and tile.is_visible
+    assert not world.get_hex_at(203, -50).is_explored
+    print("✓ Evicted chunk regenerated with fog")
+
+
+def test_tile_views_write_through_to_grid():
+    """HexTile setters land in the grid arrays, and the hexes mapping lists valid cells only"""
+    world = HexMap(radius=3, seed=2)
+    world.generate_map()
+    grid = world.grid
+    assert len(world.hexes) == 37 == int(np.count_nonzero(grid.flags & FLAG_VALID))
+    assert set(world.hexes) == {(q, r) for q in range(-3, 4) for r in range(-3, 4) if abs(q + r) <= 3}
+    assert (3, 3) not in world.hexes and world.get_hex_at(3, 3) is None
+    assert grid.cell(3, 3) is None and grid.flags[3 + 3, 3 + 3] == 0, "Rhombus corner is not a hex"
+
+    tile = world.hexes[(2, -1)]
+    row, col = -1 - grid.r0, 2 - grid.q0
+    tile.terrain = TerrainType.SWAMP
+    tile.is_explored = True
+    assert grid.terrain[row, col] == TERRAIN_CODES[TerrainType.SWAMP]
+    assert grid.flags[row, col] & FLAG_EXPLORED and grid.flags[row, col] & FLAG_VALID
+    assert world.get_hex_at(2, -1).terrain == TerrainType.SWAMP and world.get_hex_at(2, -1) == tile
+
+    tile.is_explored = False
+    assert grid.flags[row, col] == FLAG_VALID, "Clearing one flag leaves the others"
+    print("✓ Tile views write through to grid storage")
+
+
+def test_components_match_flood_fill():
+    """Component membership agrees with a plain flood fill, and edge components are flagged"""
+    world = HexMap(radius=8, seed=11)
+    world.generate_map()
+    directions = ((1, 0), (-1, 0), (0, -1), (0, 1), (1, -1), (-1, 1))
+    seen = set()
+    for start, tile in world.hexes.items():
+        if start in seen:
+            continue
+        members = {start}
+        frontier = [start]
+        while frontier:
+            q, r = frontier.pop()
+            for dq, dr in directions:
+                n = (q + dq, r + dr)
+                if n not in members and n in world.hexes and world.hexes[n].terrain == tile.terrain:
+                    members.add(n)
+                    frontier.append(n)
+        seen |= members
+
+        comp = world.component_at(*start)
+        assert comp.terrain == tile.terrain and comp.size == len(members)
+        assert set(zip(comp.qs.tolist(), comp.rs.tolist())) == members
+        on_edge = any(max(abs(q), abs(r), abs(q + r)) == world.radius for q, r in members)
+        assert comp.touches_boundary == on_edge, f"Boundary flag wrong for component at {start}"
+    assert world.component_at(world.radius, 0).touches_boundary
+    assert any(not c.touches_boundary for c in world.components)
+    assert sum(c.size for c in world.components) == len(world.hexes)
+    print(f"✓ {len(world.components)} components match flood fill")
+
+
+def test_batch_terrain_matches_per_hex():
+    """pick_terrain_batch agrees with _pick_terrain hex by hex and repeats for the same seed"""
+    qs, rs = np.meshgrid(np.arange(-30, 31, 3), np.arange(-40, 41, 4))
+    qs, rs = qs.ravel(), rs.ravel()
+    world = HexMap(radius=10, seed=42)
+    codes = world.pick_terrain_batch(qs, rs)
+    assert codes.shape == qs.shape and codes.dtype == np.uint8
+    for q, r, code in zip(qs.tolist(), rs.tolist(), codes.tolist()):
+        assert world._pick_terrain(q, r) == TERRAIN_TYPES[code], f"Terrain differs at {(q, r)}"
+
+    # The edge jitter hash matches its scalar form bit for bit
+    scalar = [hex_hash(q, r, 42, 1) for q, r in zip(qs.tolist(), rs.tolist())]
+    assert hex_hash_batch(qs, rs, 42, 1).tolist() == scalar
+
+    assert (HexMap(radius=10, seed=42).pick_terrain_batch(qs, rs) == codes).all()
+    assert (HexMap(radius=10, seed=43).pick_terrain_batch(qs, rs) != codes).any()
+    print(f"✓ Batch terrain matches per-hex terrain over {len(codes)} hexes")
+
+
+def test_regenerated_start_chunk_keeps_its_fog():
+    """The starting hex is only marked visible on first generation, not when its chunk returns"""
+    world = HexMap(radius=None, seed=99, max_chunks=2)
+    world.generate_map()
+    world.update_view(0, 0, radius=1)
+    world.update_view(300, 300, radius=1)
+    assert not world.get_hex_at(0, 0).is_visible
+
+    for i in range(1, 4):
+        world.get_hex_at(i * 100, -i * 100)
+    assert (0, 0) not in world.hexes, "Chunk should have been evicted"
+    tile = world.get_hex_at(0, 0)
+    assert tile.is_explored and not tile.is_visible
+    assert (0, 0) not in world._in_view
+    print("✓ Regenerated start chunk keeps its fog")
+
+
+def test_snapshot_round_trip():
+    """Saved worlds load with identical terrain, fog and labels"""
+    world = HexMap(radius=30, seed=7)
+    world.generate_map()
+    world.reveal_hex(3, 4, radius=2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "world.sdworld")
+        world.save_snapshot(path)
+        loaded = HexMap.load_snapshot(path)
+
+        assert loaded.seed == world.seed
+        assert len(loaded.hexes) == len(world.hexes)
+        assert (loaded.grid.terrain == world.grid.terrain).all()
+        assert loaded.get_hex_at(3, 5).is_explored
+        assert [l.text for l in loaded.labels] == [l.text for l in world.labels]
+        assert [l.anchor for l in loaded.labels] == [l.anchor for l in world.labels]
+        assert all(l.sprite is None for l in loaded.labels), "Sprites are rendered on first show"
+        del loaded  # Release the memory map before the directory is removed
+    print("✓ Snapshot round trip")
+
+
+def test_snapshot_load_is_fast():
+    """Loading maps the arrays and restores labels without rendering anything"""
+    world = HexMap(radius=100, seed=7)
+    world.generate_map()
+    assert len(world.labels) > 300, "Map should carry a realistic number of labels"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "world.sdworld")
+        world.save_snapshot(path)
+        start = time.perf_counter()
+        loaded = HexMap.load_snapshot(path)
+        elapsed = time.perf_counter() - start
+        assert len(loaded.labels) == len(world.labels)
+        assert elapsed < 0.25, f"Loading {len(loaded.labels)} labels took {elapsed:.2f}s"
+        del loaded
+    print(f"✓ Snapshot with {len(world.labels)} labels loaded in {elapsed * 1000:.1f} ms")
+
+
+def test_stale_snapshots_are_regenerated():
+    """Corrupt, outdated or wrong-radius saved worlds are replaced instead of loaded"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "world.sdworld")
+        world = HexMap.load_or_generate(path, 12)
+        assert world.radius == 12 and HexMap.load_snapshot(path).seed == world.seed
+        del world
+
+        resized = HexMap.load_or_generate(path, 14)
+        assert resized.radius == 14 and HexMap.load_snapshot(path).radius == 14
+        kept = HexMap.load_or_generate(path, 14)
+        assert kept.seed == resized.seed
+        fresh = HexMap.load_or_generate(path, 14, regenerate=True)
+        assert HexMap.load_snapshot(path).seed == fresh.seed
+        del resized, kept, fresh
+
+        version = world_map.GENERATOR_VERSION
+        world_map.GENERATOR_VERSION = version + 1
+        try:
+            try:
+                HexMap.load_snapshot(path)
+                assert False, "Snapshot from an older generator should be rejected"
+            except ValueError:
+                pass
+            assert HexMap.load_or_generate(path, 14).radius == 14
+        finally:
+            world_map.GENERATOR_VERSION = version
+
+        with open(path, "wb") as f:
+            f.write(b"not a world")
+        assert HexMap.load_or_generate(path, 10).radius == 10
+        assert HexMap.load_snapshot(path).radius == 10
+    print("✓ Stale snapshots regenerated")
+
+
+def test_reveal_returns_deltas():
+    """Reveals report only newly changed hexes and notify subscribers"""
+    world = HexMap(radius=20, seed=3)
+    world.generate_map()
+    received = []
+    world.subscribe_fog(received.append)
+
+    first = world.reveal_hex(5, 5, radius=2)
+    assert len(first.explored) == 19 and len(first.visible) == 19
+    step = world.reveal_hex(6, 5, radius=2)
+    assert step.explored == {(8, 3), (8, 4), (8, 5), (7, 6), (6, 7)}, step.explored
+    again = world.reveal_hex(6, 5, radius=2)
+    assert not again, "Repeat reveal should change nothing"
+    assert received == [first, step], "Empty deltas are not broadcast"
+
+    edge = world.reveal_hex(20, 0, radius=2)
+    assert len(edge.explored) == 9, "Off-map hexes are ignored"
+    print("✓ Reveal deltas")
+
+
+def test_view_shrouds_hexes_out_of_sight():
+    """Moving the view shrouds what fell out of sight; mountains block it"""
+    world = HexMap(radius=20, seed=3)
+    world.generate_map()
+    for q, r in [(0, 0), (1, 0), (2, 0), (3, 0), (1, -1)]:
+        world.get_hex_at(q, r).terrain = TerrainType.GRASS
+    world.get_hex_at(1, 0).terrain = TerrainType.MOUNTAIN
+    world.visibility.invalidate()
+
+    first = world.update_view(0, 0, radius=3)
+    assert (1, 0) in first.visible, "The mountain itself is seen"
+    assert not world.get_hex_at(3, 0).is_explored, "Hex behind the mountain stays fogged"
+
+    step = world.update_view(-10, 5, radius=3)
+    assert step.hidden == world.visibility.visible_from(0, 0, 3)
+    tile = world.get_hex_at(1, -1)
+    assert tile.is_explored and not tile.is_visible
+    print("✓ View update shrouds and blocks")
+
+
+def test_find_path_avoids_water():
+    """Routes step between adjacent passable hexes and report their cost"""
+    world = HexMap(radius=30, seed=21)
+    world.generate_map()
+    path = world.find_path((-20, 5), (18, -9))
+    assert path is not None and path.hexes[0] == (-20, 5) and path.hexes[-1] == (18, -9)
+
+    total = 0
+    for a, b in zip(path.hexes, path.hexes[1:]):
+        tile = world.get_hex_at(*b)
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) + abs(a[0] + a[1] - b[0] - b[1]) == 2
+        assert tile.terrain.passable, f"Route crosses {tile.terrain} at {b}"
+        total += max(tile.terrain.movement_cost, 1)
+    assert total == path.cost
+    print(f"✓ Route of {len(path)} steps, cost {path.cost}")
+
+
+def test_nearest_site_follows_terrain_changes():
+    """Nearest-town queries track towns added and removed with set_terrain"""
+    world = HexMap(radius=25, seed=21)
+    world.generate_map()
+    changes = []
+    world.subscribe_terrain(lambda q, r, old, new: changes.append((q, r, new)))
+
+    before = world.nearest(15, 0, TerrainType.TOWN)
+    site, cost = before
+    assert world.get_hex_at(*site).terrain == TerrainType.TOWN and cost > 0
+    assert world.nearest(0, 0, TerrainType.TOWN) == ((0, 0), 0)
+
+    world.set_terrain(14, 0, TerrainType.TOWN)
+    assert world.nearest(15, 0, TerrainType.TOWN) == ((14, 0), 1)
+    world.set_terrain(14, 0, TerrainType.GRASS)
+    assert world.nearest(15, 0, TerrainType.TOWN) == before
+    assert changes == [(14, 0, TerrainType.TOWN), (14, 0, TerrainType.GRASS)]
+    print("✓ Nearest town follows terrain changes")
+
+
+def test_plan_route_walks_long_distances():
+    """Long routes on bounded maps refine to a walkable path of the stated cost"""
+    world = HexMap(radius=60, seed=21)
+    world.generate_map()
+    route = world.plan_route((-45, 20), (40, -30))
+    assert route is not None
+    steps = list(route.iter_steps())
+    assert steps[-1] == (40, -30)
+    cost = sum(max(world.get_hex_at(q, r).terrain.movement_cost, 1) for q, r in steps)
+    assert cost == route.cost
+    assert route.cost >= world.find_path((-45, 20), (40, -30)).cost
+    print(f"✓ Planned route of {len(steps)} steps, cost {route.cost}")
+
+
+def test_towns_and_dungeons_are_placed():
+    """Generated maps carry spaced towns and dungeons on suitable terrain"""
+    world = HexMap(radius=40, seed=8)
+    world.generate_map()
+    for terrain, spacing in ((TerrainType.TOWN, TOWN_SPACING), (TerrainType.DUNGEON, DUNGEON_SPACING)):
+        sites = [(q, r) for (q, r), tile in world.hexes.items() if tile.terrain == terrain]
+        assert len(sites) > 3, f"Only {len(sites)} {terrain.display_name} sites"
+        for i, a in enumerate(sites):
+            for b in sites[i + 1:]:
+                assert abs(a[0] - b[0]) + abs(a[1] - b[1]) + abs(a[0] + a[1] - b[0] - b[1]) >= 2 * spacing
+    print("✓ Towns and dungeons placed")
+
+
+def test_decorations_derived_from_hash():
+    """Decorations come from the terrain's pool and agree across modes and snapshots"""
+    world = HexMap(radius=20, seed=5)
+    world.generate_map()
+    streamed = HexMap(radius=None, seed=5)
+    decorated = 0
+    for (q, r), tile in world.hexes.items():
+        decor = tile.decorations
+        assert all(name in DECORATION_POOLS.get(tile.terrain, []) for name in decor)
+        if streamed.get_hex_at(q, r).terrain == tile.terrain:
+            assert streamed.get_hex_at(q, r).decorations == decor
+        decorated += bool(decor)
+    assert decorated > 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "world.sdworld")
+        world.save_snapshot(path)
+        loaded = HexMap.load_snapshot(path)
+        assert all(loaded.get_hex_at(q, r).decorations == tile.decorations
+                   for (q, r), tile in world.hexes.items())
+        del loaded
+    print(f"✓ {decorated} decorated hexes, derived on demand")
+
+
+
+def test_cells_batch_matches_tiles():
+    """Batch terrain and flag lookups (used by the flat zoom levels) agree with per-hex tiles"""
+    qs, rs = np.meshgrid(np.arange(-25, 25), np.arange(-25, 25))
+    qs, rs = qs.ravel(), rs.ravel()
+    for world in (HexMap(radius=20, seed=5), HexMap(radius=None, seed=5, max_chunks=16)):
+        world.generate_map()
+        world.reveal_hex(2, 3, radius=2)
+        codes, flags = world.cells_batch(qs, rs)
+        for q, r, code, flag in zip(qs.tolist(), rs.tolist(), codes.tolist(), flags.tolist()):
+            tile = world.get_hex_at(q, r)
+            if tile is None:
+                assert flag == 0
+                continue
+            assert flag & FLAG_VALID and code == TERRAIN_CODES[tile.terrain]
+            assert bool(flag & FLAG_EXPLORED) == tile.is_explored
+    print("✓ Batch cell lookups match tiles")
+
+
+if __name__ == "__main__":
+    test_same_seed_same_world()
+    test_evicted_chunks_keep_fog()
+    test_regenerated_start_chunk_keeps_its_fog()
+    test_tile_views_write_through_to_grid()
+    test_components_match_flood_fill()
+    test_batch_terrain_matches_per_hex()
+    test_snapshot_round_trip()
+    test_snapshot_load_is_fast()
+    test_stale_snapshots_are_regenerated()
+    test_reveal_returns_deltas()
+    test_view_shrouds_hexes_out_of_sight()
+    test_find_path_avoids_water()
+    test_nearest_site_follows_terrain_changes()
+    test_plan_route_walks_long_distances()
+    test_towns_and_dungeons_are_placed()
+    test_decorations_derived_from_hash()
+    test_cells_batch_matches_tiles()
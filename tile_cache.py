@@ -0,0 +1,140 @@
+"""
+Persistent, content-addressed cache of rendered map tiles.
+
+A tile's file name is the SHA-1 of its namespace (what it was painted from:
+world seed, hex size and a hash of the sprite files) and its coordinates, so
+stale tiles are never read back: changing any input changes every address.
+Files hold zlib-compressed raw RGBA, which decodes much faster than PNG.
+Total size is bounded; the least recently used files are deleted first,
+with recency kept across sessions in the files' modification times.
+"""
+
+import hashlib
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from PIL import Image
+
+TILE_MAGIC = b"HXT1"
+TILE_HEADER = struct.Struct("<4sHH")  # Magic, width, height
+TILE_COMPRESSION = 6
+
+
+def sprite_set_hash(paths: Iterable[str], version: str = "") -> str:
+    """Hash of the contents of the files a tile is painted from (missing files count too)"""
+    digest = hashlib.sha1(version.encode())
+    for path in paths:
+        digest.update(path.encode())
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        else:
+            digest.update(b"<missing>")
+    return digest.hexdigest()[:16]
+
+
+_write_error_logged = False
+
+
+def write_tile(path: str, img: Image.Image) -> int:
+    """
+    Write a tile atomically (safe from worker processes).
+    
+    Returns:
+        The file size, or 0 if it could not be written (the cache is best-effort;
+        the first failure in each process is logged)
+    """
+    global _write_error_logged
+    data = TILE_HEADER.pack(TILE_MAGIC, img.width, img.height) + zlib.compress(img.tobytes(), TILE_COMPRESSION)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError as e:
+        if not _write_error_logged:
+            _write_error_logged = True
+            print(f"Tile cache disabled for writes: {e}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return 0
+    return len(data)
+
+
+def read_tile(path: str) -> Image.Image:
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, width, height = TILE_HEADER.unpack_from(data)
+    if magic != TILE_MAGIC:
+        raise ValueError(f"Not a tile file: {path}")
+    return Image.frombytes("RGBA", (width, height), zlib.decompress(data[TILE_HEADER.size:]))
+
+
+class TileDiskCache:
+    """Size-bounded LRU directory of tiles for one namespace"""
+
+    def __init__(self, directory: str, namespace: str, max_bytes: int):
+        self.directory = directory
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+
+        # Every file in the directory (all namespaces share the size budget), oldest first
+        self.files: "OrderedDict[str, int]" = OrderedDict()
+        self.total_bytes = 0
+        found = []
+        for root, _, names in os.walk(directory):
+            for name in names:
+                path = os.path.join(root, name)
+                if name.endswith(".tmp"):
+                    continue
+                st = os.stat(path)
+                found.append((st.st_mtime, path, st.st_size))
+        for _, path, size in sorted(found):
+            self.files[path] = size
+            self.total_bytes += size
+
+    def path_for(self, q: int, r: int) -> str:
+        name = hashlib.sha1(f"{self.namespace}:{q},{r}".encode()).hexdigest()
+        return os.path.join(self.directory, name[:2], name[2:] + ".tile")
+
+    def load(self, q: int, r: int) -> Optional[Image.Image]:
+        path = self.path_for(q, r)
+        if path not in self.files:
+            return None
+        try:
+            img = read_tile(path)
+        except (OSError, ValueError, struct.error, zlib.error):
+            self._remove(path)
+            return None
+        self.files.move_to_end(path)
+        try:
+            os.utime(path)  # Recency survives restarts
+        except OSError:
+            pass
+        return img
+
+    def store(self, q: int, r: int, img: Image.Image):
+        path = self.path_for(q, r)
+        size = write_tile(path, img)
+        if size:
+            self.record(path, size)
+
+    def record(self, path: str, size: int):
+        """Account for a file written (possibly by another process) and evict if over budget"""
+        self.total_bytes += size - self.files.pop(path, 0)
+        self.files[path] = size
+        while self.total_bytes > self.max_bytes and len(self.files) > 1:
+            self._remove(next(iter(self.files)))
+
+    def _remove(self, path: str):
+        self.total_bytes -= self.files.pop(path, 0)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
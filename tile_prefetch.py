@@ -0,0 +1,90 @@
+"""
+Idle-time prefetching of expensive map tiles.
+
+The player's recent positions give a heading; the hexes around the next few
+positions along it are queued, nearest first, and generated in short time
+slices from Tk idle callbacks so input and redraws are never held up. A new
+prediction replaces whatever was still queued.
+"""
+
+import time
+from collections import deque
+from typing import Callable, Deque, Iterable, List, Optional, Tuple
+
+import hex_math
+
+PREFETCH_HISTORY = 4  # Recent positions the heading is averaged over
+PREFETCH_LOOKAHEAD = 3  # Moves ahead to predict
+PREFETCH_SLICE_MS = 8  # Work per idle callback before yielding back to Tk
+
+
+class TilePrefetcher:
+    """Predicts where the view is heading and generates tiles there when Tk is idle"""
+
+    def __init__(self, widget, produce: Callable[[int, int], None],
+                 needed: Callable[[int, int], bool]):
+        """
+        Args:
+            widget: Any Tk widget, for after_idle scheduling
+            produce: produce(q, r) generates and caches the hex's tile
+            needed: needed(q, r) -> True if the tile is not cached yet
+        """
+        self.widget = widget
+        self.produce = produce
+        self.needed = needed
+        self.history: Deque[Tuple[int, int]] = deque(maxlen=PREFETCH_HISTORY)
+        self.queue: Deque[Tuple[int, int]] = deque()
+        self._job = None
+
+    def observe(self, q: int, r: int):
+        """Record the hex the view is centered on"""
+        if not self.history or self.history[-1] != (q, r):
+            self.history.append((q, r))
+
+    def heading(self) -> Optional[Tuple[float, float]]:
+        """Average axial move per step over the recent history, or None when standing still"""
+        if len(self.history) < 2:
+            return None
+        (q0, r0), (q1, r1) = self.history[0], self.history[-1]
+        steps = len(self.history) - 1
+        if (q0, r0) == (q1, r1):
+            return None
+        return (q1 - q0) / steps, (r1 - r0) / steps
+
+    def predicted_centers(self, lookahead: int = PREFETCH_LOOKAHEAD) -> List[Tuple[int, int]]:
+        """Hexes the view should be centered on over the next moves, nearest first"""
+        heading = self.heading()
+        if heading is None:
+            return []
+        q, r = self.history[-1]
+        centers = []
+        for k in range(1, lookahead + 1):
+            center = hex_math.axial_round(q + heading[0] * k, r + heading[1] * k)
+            if center not in centers:
+                centers.append(center)
+        return centers
+
+    def request(self, hexes: Iterable[Tuple[int, int]]):
+        """Replace the queue with these hexes (in priority order) and schedule work"""
+        self.queue = deque(dict.fromkeys(hexes))
+        if self.queue and self._job is None:
+            self._job = self.widget.after_idle(self._run_slice)
+
+    def cancel(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+        self.queue.clear()
+
+    def _run_slice(self):
+        """Generate queued tiles for up to PREFETCH_SLICE_MS, then yield until the next idle"""
+        self._job = None
+        deadline = time.perf_counter() + PREFETCH_SLICE_MS / 1000
+        while self.queue and time.perf_counter() < deadline:
+            q, r = self.queue.popleft()
+            if self.needed(q, r):
+                self.produce(q, r)
+        if self.queue:
+            # Idle callbacks added while idle callbacks run wait for the next idle
+            # pass, so pending events are handled in between
+            self._job = self.widget.after_idle(self._run_slice)
@@ -0,0 +1,144 @@
+"""
+Forest tile synthesis in worker processes.
+
+Workers paint tiles with HexPainter.paint_forest_tile and write the raw RGBA
+bytes into a slot of one shared memory block, so only (q, r, slot) crosses
+the process boundary. They also write the compressed copy for the disk cache. The Tk thread polls for finished tiles, copies each
+out of its slot into a PIL image and hands it to a callback; it never paints.
+"""
+
+import os
+import queue
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Deque, Dict, Optional, Set, Tuple
+
+from PIL import Image
+
+from hex_painter import HexPainter
+from tile_cache import TileDiskCache, write_tile
+
+TILE_POLL_MS = 15  # How often the Tk thread checks for finished tiles
+SLOTS_PER_WORKER = 4  # Tiles in flight per worker process
+
+# Worker process state, set by _init_worker
+_shm: Optional[shared_memory.SharedMemory] = None
+_slot_bytes = 0
+
+
+def _init_worker(shm_name: str, slot_bytes: int):
+    # Pool workers share the parent's resource tracker, so attaching here
+    # registers nothing new; the parent unlinks the block in close()
+    global _shm, _slot_bytes
+    _shm = shared_memory.SharedMemory(name=shm_name)
+    _slot_bytes = slot_bytes
+    HexPainter.precompute_forest_sprites()
+
+
+def _paint_into_slot(q: int, r: int, size: int, slot: int,
+                     cache_path: Optional[str]) -> Tuple[Tuple[int, int], int]:
+    """
+    Worker side: paint one tile into its slot, and into the disk cache if a path is given.
+    Returns the image size and the cache file's size (0 if not written; a cache
+    failure never loses the painted tile).
+    """
+    img = HexPainter.paint_forest_tile(q, r, size)
+    data = img.tobytes()
+    start = slot * _slot_bytes
+    _shm.buf[start:start + len(data)] = data
+    return img.size, write_tile(cache_path, img) if cache_path else 0
+
+
+class TileWorkerPool:
+    """Process pool producing forest tiles for the Tk thread"""
+
+    def __init__(self, widget, hex_size: int, on_ready: Callable[[int, int, Image.Image], None],
+                 workers: Optional[int] = None, disk_cache: Optional[TileDiskCache] = None):
+        """
+        Args:
+            widget: Any Tk widget, for after() polling
+            on_ready: on_ready(q, r, image), called on the Tk thread per finished tile
+            workers: Worker processes (default: one per CPU)
+            disk_cache: Workers also compress finished tiles into this cache
+        """
+        self.widget = widget
+        self.hex_size = hex_size
+        self.on_ready = on_ready
+        self.disk_cache = disk_cache
+        workers = workers or os.cpu_count() or 1
+
+        w, h = HexPainter.tile_size(hex_size)
+        self.slot_bytes = w * h * 4
+        slots = workers * SLOTS_PER_WORKER
+        self.shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * slots)
+        self.executor = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                            initargs=(self.shm.name, self.slot_bytes))
+
+        self.free_slots = list(range(slots))
+        self.waiting: Deque[Tuple[int, int]] = deque()  # Not yet given a slot, most urgent first
+        self.pending: Set[Tuple[int, int]] = set()  # Waiting or in flight
+        self.in_flight: Dict[Future, Tuple[int, int, int, Optional[str]]] = {}  # -> (q, r, slot, cache path)
+        self.finished: "queue.Queue[Future]" = queue.Queue()  # Filled from executor threads
+        self._poll_job = None
+
+    def is_pending(self, q: int, r: int) -> bool:
+        return (q, r) in self.pending
+
+    def submit(self, q: int, r: int, urgent: bool = False):
+        """Queue a tile; urgent ones (already on screen) jump ahead of prefetches"""
+        if (q, r) in self.pending:
+            if urgent and (q, r) in self.waiting:
+                self.waiting.remove((q, r))
+                self.waiting.appendleft((q, r))
+            return
+        self.pending.add((q, r))
+        if urgent:
+            self.waiting.appendleft((q, r))
+        else:
+            self.waiting.append((q, r))
+        self._dispatch()
+
+    def _dispatch(self):
+        while self.free_slots and self.waiting:
+            q, r = self.waiting.popleft()
+            slot = self.free_slots.pop()
+            path = self.disk_cache.path_for(q, r) if self.disk_cache else None
+            future = self.executor.submit(_paint_into_slot, q, r, self.hex_size, slot, path)
+            self.in_flight[future] = (q, r, slot, path)
+            future.add_done_callback(self.finished.put)
+        if self.in_flight and self._poll_job is None:
+            self._poll_job = self.widget.after(TILE_POLL_MS, self._poll)
+
+    def _poll(self):
+        """Tk thread: collect finished tiles and start the next ones"""
+        self._poll_job = None
+        while True:
+            try:
+                future = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            q, r, slot, path = self.in_flight.pop(future)
+            self.pending.discard((q, r))
+            try:
+                size, file_size = future.result()
+            except Exception as e:
+                print(f"Tile {(q, r)} failed: {e}")
+                self.free_slots.append(slot)
+                continue
+            start = slot * self.slot_bytes
+            img = Image.frombytes("RGBA", size, bytes(self.shm.buf[start:start + size[0] * size[1] * 4]))
+            self.free_slots.append(slot)
+            if file_size:
+                self.disk_cache.record(path, file_size)
+            self.on_ready(q, r, img)
+        self._dispatch()
+
+    def close(self):
+        """Stop the workers and free the shared memory"""
+        if self._poll_job is not None:
+            self.widget.after_cancel(self._poll_job)
+            self._poll_job = None
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.shm.close()
+        self.shm.unlink()
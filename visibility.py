@@ -0,0 +1,147 @@
+"""
+Hex shadowcasting line of sight.
+
+Each ring around the viewer is walked in angular order. A hex on ring k at
+index i covers the angular interval (i + 1 +/- 0.5) / 6k, measured in turns.
+Blocking hexes cast their interval into a merged shadow list that hides
+hexes on later rings whose center angle falls inside a shadow. Blockers
+themselves are lit if any part of them is, so ridges read as walls.
+"""
+
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, FrozenSet, List, Tuple
+
+import hex_math
+
+Interval = Tuple[float, float]
+
+_EPS = 1e-9  # Shadows closer than this are treated as touching
+
+
+@lru_cache(maxsize=None)
+def _ring_table(radius: int) -> Tuple[Tuple[int, int, float, float], ...]:
+    """(dq, dr, center angle, half width) for every hex of rings 1..radius, ring by ring"""
+    table = []
+    for k in range(1, radius + 1):
+        offsets = hex_math.ring_offsets(k)
+        n = len(offsets)
+        # ring_offsets starts one step past the top corner; shift so every
+        # ring's corners sit at the same angles (multiples of 1/6)
+        for i, (dq, dr) in enumerate(offsets):
+            table.append((dq, dr, ((i + 1) % n) / n, 0.5 / n))
+    return tuple(table)
+
+
+def _split(start: float, end: float) -> List[Interval]:
+    """Normalize an interval to [0, 1), splitting it where it wraps"""
+    if start < 0.0:
+        return [(start + 1.0, 1.0), (0.0, end)]
+    if end > 1.0:
+        return [(start, 1.0), (0.0, end - 1.0)]
+    return [(start, end)]
+
+
+class _Shadows:
+    """Sorted, merged list of shadowed angular intervals"""
+
+    def __init__(self):
+        self.starts: List[float] = []
+        self.ends: List[float] = []
+
+    def covers(self, angle: float) -> bool:
+        """Strictly inside a shadow; a center on a shadow edge is half lit"""
+        i = bisect_right(self.starts, angle) - 1
+        if i < 0:
+            return False
+        if self.starts[i] < angle < self.ends[i]:
+            return True
+        # Angle 0 is interior when a shadow was split across the wrap point
+        return angle == 0.0 and self.starts[0] == 0.0 and self.ends[0] > 0.0 and self.ends[-1] >= 1.0
+
+    def covers_all(self, start: float, end: float) -> bool:
+        for a, b in _split(start, end):
+            i = bisect_right(self.starts, a) - 1
+            if i < 0 or self.ends[i] < b:
+                return False
+        return True
+
+    def is_full(self) -> bool:
+        return len(self.starts) == 1 and self.starts[0] <= _EPS and self.ends[0] >= 1.0 - _EPS
+
+    def add(self, start: float, end: float):
+        for a, b in _split(start, end):
+            i = bisect_right(self.starts, a)
+            # Merge with the previous interval if they touch
+            if i > 0 and self.ends[i - 1] >= a - _EPS:
+                i -= 1
+                a = self.starts[i]
+                b = max(b, self.ends[i])
+                del self.starts[i], self.ends[i]
+            # Swallow following intervals that overlap
+            while i < len(self.starts) and self.starts[i] <= b + _EPS:
+                b = max(b, self.ends[i])
+                del self.starts[i], self.ends[i]
+            self.starts.insert(i, a)
+            self.ends.insert(i, b)
+
+
+def compute_visible(q: int, r: int, radius: int,
+                    blocks: Callable[[int, int], bool]) -> FrozenSet[Tuple[int, int]]:
+    """
+    Hexes visible from (q, r) within `radius`.
+
+    Args:
+        blocks: blocks(q, r) -> True if the hex stops sight beyond it
+    """
+    visible = {(q, r)}
+    shadows = _Shadows()
+    pending: List[Interval] = []
+    ring_end = 0
+    table = _ring_table(radius)
+
+    for idx, (dq, dr, center, half) in enumerate(table):
+        # Shadows cast by a ring only apply from the next ring outward
+        if idx == ring_end:
+            for a, b in pending:
+                shadows.add(a, b)
+            pending.clear()
+            if shadows.is_full():
+                break
+            ring_end += 6 * (hex_math.hex_distance(0, 0, dq, dr))
+
+        hq, hr = q + dq, r + dr
+        if blocks(hq, hr):
+            if not shadows.covers_all(center - half, center + half):
+                visible.add((hq, hr))
+            pending.append((center - half, center + half))
+        elif not shadows.covers(center):
+            visible.add((hq, hr))
+
+    return frozenset(visible)
+
+
+class VisibilityEngine:
+    """Line-of-sight queries with a bounded per-(position, radius) cache"""
+
+    def __init__(self, blocks: Callable[[int, int], bool], cache_size: int = 512):
+        self.blocks = blocks
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[int, int, int], FrozenSet[Tuple[int, int]]]" = OrderedDict()
+
+    def visible_from(self, q: int, r: int, radius: int) -> FrozenSet[Tuple[int, int]]:
+        key = (q, r, radius)
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+            return result
+        result = compute_visible(q, r, radius, self.blocks)
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def invalidate(self):
+        """Forget cached results (call when blocking terrain changes)"""
+        self._cache.clear()
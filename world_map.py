@@ -6,20 +6,112 @@ Handles terrain generation, rendering, fog of war, and player movement.
 import random
 import math
 import os
+import sys
+from collections import OrderedDict, deque
+from collections.abc import Mapping
 from enum import Enum
-from typing import Tuple, List, Dict, Optional
-from dataclasses import dataclass
+from typing import Tuple, List, Dict, Optional, Set, Callable, Iterator
+from dataclasses import dataclass, field
+import numpy as np
 import tkinter as tk
 from tkinter import Canvas, messagebox
-from PIL import Image, ImageDraw, ImageTk, ImageFont
+from PIL import Image, ImageChops, ImageDraw, ImageTk
 from name_generator import generate_forest_name, generate_desert_name, generate_ocean_name, generate_lake_name
 from player_controls import PlayerControls
 from hex_painter import HexPainter
+from geometry import hull_diameter, axial_width
+from label_placement import LabelCandidate, LabelPlacer, estimate_text_size
+from label_sprites import render_label
+from world_snapshot import read_snapshot, write_snapshot
+from visibility import VisibilityEngine
+from pathfinding import CostGrid, DistanceField, TravelPath, astar
+from route_planner import HierarchicalPlanner, PlannedRoute
+from site_placement import PoissonDiskSampler
+from asset_atlas import AssetAtlas, source_fingerprint
+from tile_prefetch import TilePrefetcher
+from tile_cache import TileDiskCache, sprite_set_hash
+from tile_workers import TileWorkerPool
+import hex_math
+from hex_math import SQRT3
 
 # Constants
 HEX_SIZE = 74  # Radius (center to corner). Width ~= 128px, Height = 148px
 HIDDEN_FOG_ALPHA = 255  # Fully opaque
-SHROUD_FOG_ALPHA = 150  # Explored but not currently visible (if we implement LoS)
+SHROUD_FOG_ALPHA = 150  # Explored but not currently in line of sight
+SIGHT_RADIUS = 2  # Hexes the player can see, before terrain blocks the view
+FOREST_BLOCKS_SIGHT = False  # Mountains always block sight; forests optionally
+WORLD_RADIUS = 100  # None = unbounded world, streamed in chunks around the player
+CHUNK_SIZE = 16  # Streamed chunks are CHUNK_SIZE x CHUNK_SIZE axial rhombi
+MAX_LOADED_CHUNKS = 256  # Least recently touched chunks beyond this are evicted
+WORLD_SNAPSHOT_PATH = "world.sdworld"  # Saved world reused across launches (bounded maps)
+GENERATOR_VERSION = 3  # Bump when world generation changes, so older saved worlds are regenerated
+MINIMAP_STREAM_RADIUS = 40  # Hex radius shown on the minimap for streamed worlds
+MINIMAP_STREAM_SNAP = 8  # Streamed minimaps rebuild their terrain layer only after the player moves this far
+TOWN_SPACING = 14  # Minimum hex distance between towns
+DUNGEON_SPACING = 11  # Minimum hex distance between dungeons
+SITE_CLEARANCE = 5  # Minimum hex distance between a dungeon and a town
+SITE_MIN_SUITABILITY = 0.6  # Mean terrain affinity (0-1) a hex needs to host a site
+PATH_SEARCH_MARGIN = 16  # Streamed worlds search a window this far around start and goal
+TRAVEL_STEP_MS = 150  # Delay between steps when walking a clicked route
+RENDER_CHUNK_SIZE = 4  # The renderer composites RENDER_CHUNK_SIZE x RENDER_CHUNK_SIZE offset-coordinate blocks
+CHUNK_IMAGE_CACHE_SIZE = 16  # Composited chunk images kept, including some that scrolled off-screen
+TILE_WORKERS = None  # Forest tile worker processes (None = one per CPU, 0 = paint on the UI thread)
+TILE_CACHE_DIR = "cache/tiles"  # Forest tiles persist here across sessions (None = memory only)
+TILE_CACHE_MAX_BYTES = 256 * 2 ** 20  # Least recently used tiles beyond this are deleted
+ASSET_DIR = "assets/hex_tiles"  # Hand-made terrain tiles; missing ones are painted procedurally
+ASSET_ATLAS_PATH = "cache/hex_atlas_{hex_size}.bin"  # Packed renderer assets, rebuilt when stale (None = not saved)
+ASSET_ATLAS_VERSION = "1"  # Bump when the procedural assets change, to rebuild saved atlases
+TERRAIN_VARIANTS = 4  # Tile variants per terrain type
+ZOOM_SCALES = (1, 2, 4, 8, 16, 32)  # Zoom levels as divisors of the hex size (level 0 is full detail)
+FLAT_ZOOM_LEVEL = 3  # From this level on hexes are flat colors instead of tiles
+MIP_CACHE_SIZE = 4000  # Loose limit on reduced tile images kept for the mipmapped zoom levels
+
+# Hash salts so each per-hex random decision draws from its own stream
+SALT_TERRAIN_JITTER = 1
+SALT_VARIANT = 2
+SALT_DECORATIONS = 3
+SALT_TOWN_SITES = 4
+SALT_DUNGEON_SITES = 5
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+
+def hex_hash(q: int, r: int, seed: int, salt: int = 0) -> int:
+    """Deterministic 64-bit hash of a hex coordinate (splitmix64 finalizer)"""
+    h = (q * 0x9E3779B97F4A7C15 + r * 0xC2B2AE3D27D4EB4F
+         + seed * 0x165667B19E3779F9 + salt) & _MASK64
+    h ^= h >> 30
+    h = (h * 0xBF58476D1CE4E5B9) & _MASK64
+    h ^= h >> 27
+    h = (h * 0x94D049BB133111EB) & _MASK64
+    h ^= h >> 31
+    return h
+
+
+def hex_unit(q: int, r: int, seed: int, salt: int = 0) -> float:
+    """Deterministic float in [0, 1) for a hex coordinate"""
+    return (hex_hash(q, r, seed, salt) >> 11) / float(1 << 53)
+
+
+def hex_hash_batch(qs: np.ndarray, rs: np.ndarray, seed: int, salt: int = 0) -> np.ndarray:
+    """Vectorized hex_hash: same 64-bit values for arrays of coordinates"""
+    base = np.uint64((seed * 0x165667B19E3779F9 + salt) & _MASK64)
+    with np.errstate(over="ignore"):
+        h = (np.asarray(qs, dtype=np.int64).astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+             + np.asarray(rs, dtype=np.int64).astype(np.uint64) * np.uint64(0xC2B2AE3D27D4EB4F)
+             + base)
+        h ^= h >> np.uint64(30)
+        h *= np.uint64(0xBF58476D1CE4E5B9)
+        h ^= h >> np.uint64(27)
+        h *= np.uint64(0x94D049BB133111EB)
+        h ^= h >> np.uint64(31)
+    return h
+
+
+def hex_unit_batch(qs: np.ndarray, rs: np.ndarray, seed: int, salt: int = 0) -> np.ndarray:
+    """Vectorized hex_unit"""
+    return (hex_hash_batch(qs, rs, seed, salt) >> np.uint64(11)) / float(1 << 53)
+
 
 class TerrainType(Enum):
     """Terrain types with associated rules and generation weights"""
@@ -41,29 +133,245 @@ class TerrainType(Enum):
         self.passable = passable
         self.movement_cost = movement_cost
 
-@dataclass
+# Compact terrain codes (index into TERRAIN_TYPES) used by the batch/array APIs
+TERRAIN_TYPES: List[TerrainType] = list(TerrainType)
+TERRAIN_CODES: Dict[TerrainType, int] = {t: i for i, t in enumerate(TERRAIN_TYPES)}
+
+# Flat colors of the minimap and the far zoom levels, by terrain code
+TERRAIN_COLORS: Dict[TerrainType, Tuple[int, int, int]] = {
+    TerrainType.GRASS: (100, 200, 100),
+    TerrainType.FOREST: (34, 139, 34),
+    TerrainType.MOUNTAIN: (169, 169, 169),
+    TerrainType.WATER: (65, 105, 225),
+    TerrainType.SWAMP: (85, 107, 47),
+    TerrainType.HILLS: (218, 165, 32),
+    TerrainType.DESERT: (237, 201, 175),
+    TerrainType.TOWN: (205, 92, 92),
+    TerrainType.DUNGEON: (75, 0, 130),
+}
+TERRAIN_PALETTE = np.array([TERRAIN_COLORS.get(t, (128, 128, 128)) for t in TERRAIN_TYPES], dtype=np.uint8)
+
+# Cost of entering a hex, by terrain code. Every step costs at least 1 so hex
+# distance stays an admissible A* heuristic; 0 marks impassable terrain.
+STEP_COSTS = np.array([max(t.movement_cost, 1) if t.passable else 0 for t in TERRAIN_TYPES],
+                      dtype=np.int64)
+
+# Main biome gradient: normalized noise below each threshold picks that biome.
+# Order aims for logical adjacency: Water <-> Swamp <-> Forest <-> Grass <-> Hills <-> Desert
+BIOME_THRESHOLDS = np.array([0.18, 0.28, 0.50, 0.72, 0.88])
+BIOME_CODES = np.array([TERRAIN_CODES[t] for t in (
+    TerrainType.WATER, TerrainType.SWAMP, TerrainType.FOREST,
+    TerrainType.GRASS, TerrainType.HILLS, TerrainType.DESERT,
+)], dtype=np.uint8)
+MOUNTAIN_RIDGE_THRESHOLD = 0.88
+
+# Decoration pools per terrain. Nothing is stored per hex: hex_decorations
+# derives each hex's picks from its hash.
+DECORATION_POOLS: Dict[TerrainType, List[str]] = {
+    TerrainType.FOREST: ["tree_1", "tree_2", "tree_group", "tree_tall_nw"],
+    TerrainType.MOUNTAIN: ["mountain_1", "mountain_peak_nw", "mountain_small"],
+    TerrainType.GRASS: ["grass_tuft_1", "flower_1", "rock_small"],
+    TerrainType.WATER: ["waves_1", "lilypad"],
+    TerrainType.SWAMP: ["dead_tree", "swamp_grass"],
+    TerrainType.HILLS: ["hill_1", "hill_2"],
+    TerrainType.DESERT: ["cactus", "rocks", "dune"],
+    TerrainType.TOWN: ["house_1", "tower"],
+    TerrainType.DUNGEON: ["ruins", "cave_entrance"]
+}
+# Compact form: every name once, plus each terrain code's pool as ids into it
+DECORATION_NAMES: Tuple[str, ...] = tuple(name for t in TERRAIN_TYPES for name in DECORATION_POOLS.get(t, []))
+DECORATION_POOL_IDS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(DECORATION_NAMES.index(name) for name in DECORATION_POOLS.get(t, [])) for t in TERRAIN_TYPES)
+
+
+def hex_decorations(q: int, r: int, code: int, seed: int) -> List[str]:
+    """Decoration asset names for a hex of terrain `code`, derived from its hash"""
+    pool = DECORATION_POOL_IDS[code]
+    if not pool:
+        return []
+    h = hex_hash(q, r, seed, SALT_DECORATIONS)
+    # 40% chance of decoration, then 1-2 picks from the terrain's pool
+    if (h >> 11) / float(1 << 53) >= 0.4:
+        return []
+    picks = [pool[(h & 0xFF) % len(pool)]]
+    if (h >> 16) & 1:
+        picks.append(pool[((h >> 8) & 0xFF) % len(pool)])
+    return [DECORATION_NAMES[i] for i in picks]
+
+# Per-hex flag bits in HexGrid.flags
+FLAG_EXPLORED = 1
+FLAG_VISIBLE = 2
+FLAG_VALID = 4  # Cell is part of the map (the storage rhombus is larger than a hex map)
+
+
+class HexGrid:
+    """
+    Dense struct-of-arrays storage for an axial rhombus of hexes.
+    Cell (q, r) lives at [r - r0, q - q0] in every array.
+    """
+    
+    def __init__(self, q0: int, r0: int, width: int, height: int, seed: int = 0):
+        self.q0 = q0
+        self.r0 = r0
+        self.width = width
+        self.height = height
+        self.seed = seed  # World seed, for per-hex hash-derived details
+        self.terrain = np.zeros((height, width), dtype=np.uint8)  # TERRAIN_TYPES index
+        self.variant = np.zeros((height, width), dtype=np.uint8)  # 0-3 visual variant
+        self.flags = np.zeros((height, width), dtype=np.uint8)    # FLAG_* bits
+    
+    @classmethod
+    def from_arrays(cls, q0: int, r0: int, terrain: np.ndarray, variant: np.ndarray,
+                    flags: np.ndarray, seed: int = 0) -> "HexGrid":
+        """Wrap existing (e.g. memory-mapped) arrays without copying them"""
+        grid = cls.__new__(cls)
+        grid.q0 = q0
+        grid.r0 = r0
+        grid.height, grid.width = terrain.shape
+        grid.seed = seed
+        grid.terrain = terrain
+        grid.variant = variant
+        grid.flags = flags
+        return grid
+    
+    def axial_coords(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(q, r) arrays matching the storage layout"""
+        qs = np.arange(self.q0, self.q0 + self.width, dtype=np.int64)
+        rs = np.arange(self.r0, self.r0 + self.height, dtype=np.int64)
+        return np.broadcast_to(qs, (self.height, self.width)), \
+            np.broadcast_to(rs[:, None], (self.height, self.width))
+    
+    def cell(self, q: int, r: int) -> Optional[Tuple[int, int]]:
+        """(row, col) of a valid hex, or None if it is not stored here"""
+        row, col = r - self.r0, q - self.q0
+        if 0 <= row < self.height and 0 <= col < self.width and self.flags[row, col] & FLAG_VALID:
+            return row, col
+        return None
+    
+    def valid_coords(self):
+        """Iterate (q, r) of every valid hex"""
+        rows, cols = np.nonzero(self.flags & FLAG_VALID)
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            yield col + self.q0, row + self.r0
+    
+    def valid_count(self) -> int:
+        return int(np.count_nonzero(self.flags & FLAG_VALID))
+
+
 class HexTile:
-    """Represents a single hex tile with terrain, decorations, and fog state"""
-    q: int  # Axial coordinate Q
-    r: int  # Axial coordinate R
-    terrain: TerrainType
-    decorations: List[str]  # Asset names like "tall_tree_nw", "mountain_peak"
-    is_explored: bool = False
-    is_visible: bool = False
-    variant_id: int = 0  # 0-3 for random visual variations
+    """Lightweight view of a single hex stored in a HexGrid"""
+    __slots__ = ("grid", "q", "r", "_row", "_col")
+    
+    def __init__(self, grid: HexGrid, q: int, r: int):
+        self.grid = grid
+        self.q = q  # Axial coordinate Q
+        self.r = r  # Axial coordinate R
+        self._row = r - grid.r0
+        self._col = q - grid.q0
+    
+    @property
+    def terrain(self) -> TerrainType:
+        return TERRAIN_TYPES[self.grid.terrain[self._row, self._col]]
+    
+    @terrain.setter
+    def terrain(self, value: TerrainType):
+        self.grid.terrain[self._row, self._col] = TERRAIN_CODES[value]
+    
+    @property
+    def variant_id(self) -> int:
+        """0-3 for random visual variations"""
+        return int(self.grid.variant[self._row, self._col])
+    
+    @property
+    def decorations(self) -> List[str]:
+        """Asset names like "tree_tall_nw", "mountain_peak_nw" (derived on demand)"""
+        return hex_decorations(self.q, self.r, int(self.grid.terrain[self._row, self._col]), self.grid.seed)
+    
+    def _get_flag(self, bit: int) -> bool:
+        return bool(self.grid.flags[self._row, self._col] & bit)
+    
+    def _set_flag(self, bit: int, value: bool):
+        if value:
+            self.grid.flags[self._row, self._col] |= bit
+        else:
+            self.grid.flags[self._row, self._col] &= ~bit & 0xFF
+    
+    @property
+    def is_explored(self) -> bool:
+        return self._get_flag(FLAG_EXPLORED)
+    
+    @is_explored.setter
+    def is_explored(self, value: bool):
+        self._set_flag(FLAG_EXPLORED, value)
+    
+    @property
+    def is_visible(self) -> bool:
+        return self._get_flag(FLAG_VISIBLE)
+    
+    @is_visible.setter
+    def is_visible(self, value: bool):
+        self._set_flag(FLAG_VISIBLE, value)
     
     def get_pixel_coords(self, size: int) -> Tuple[float, float]:
         """Convert axial hex coordinates to pixel coordinates (pointy-top orientation)"""
-        # x = size * sqrt(3) * (q + r/2)
-        # y = size * 3/2 * r
-        # NOTE: The formula in the advice was slightly different, using typical pointy-top conversion here
-        x = size * (math.sqrt(3) * self.q + math.sqrt(3)/2 * self.r)
-        y = size * (3./2 * self.r)
-        return (x, y)
+        return hex_math.axial_to_pixel(self.q, self.r, size)
     
     @property
     def key(self) -> Tuple[int, int]:
         return (self.q, self.r)
+    
+    def __eq__(self, other):
+        return (isinstance(other, HexTile) and self.grid is other.grid
+                and self.q == other.q and self.r == other.r)
+    
+    def __hash__(self):
+        return hash((id(self.grid), self.q, self.r))
+    
+    def __repr__(self):
+        return f"HexTile(q={self.q}, r={self.r}, terrain={self.terrain.name})"
+
+
+class HexTileMapping(Mapping):
+    """Read-only (q, r) -> HexTile view over a HexMap's grids"""
+    
+    def __init__(self, hex_map: "HexMap"):
+        self._map = hex_map
+    
+    def __getitem__(self, key: Tuple[int, int]) -> HexTile:
+        tile = self._map._peek_hex(*key)
+        if tile is None:
+            raise KeyError(key)
+        return tile
+    
+    def __contains__(self, key) -> bool:
+        return self._map._peek_hex(*key) is not None
+    
+    def __iter__(self):
+        for grid in self._map._grids():
+            yield from grid.valid_coords()
+    
+    def __len__(self) -> int:
+        return sum(grid.valid_count() for grid in self._map._grids())
+
+@dataclass
+class TerrainComponent:
+    """A connected cluster of same-terrain hexes"""
+    id: int
+    terrain: TerrainType
+    size: int
+    touches_boundary: bool  # Some member borders the edge of the generated map
+    qs: np.ndarray  # Axial Q of every member
+    rs: np.ndarray  # Axial R of every member
+
+@dataclass
+class FogDelta:
+    """Hexes whose fog state changed in one reveal"""
+    explored: Set[Tuple[int, int]] = field(default_factory=set)  # Newly explored
+    visible: Set[Tuple[int, int]] = field(default_factory=set)   # Newly visible
+    hidden: Set[Tuple[int, int]] = field(default_factory=set)    # Newly out of sight (shrouded)
+    
+    def __bool__(self):
+        return bool(self.explored or self.visible or self.hidden)
 
 @dataclass
 class MapLabel:
@@ -72,22 +380,74 @@ class MapLabel:
     y: float
     angle: float
     color: str = "white"
+    priority: float = 0.0  # Placement importance (larger features rank higher)
+    anchor: Tuple[int, int] = (0, 0)  # Hex under the label; the label shows once it is explored
+    # Rendered text, filled in by the renderer the first time the label is shown
+    sprite: Optional[Image.Image] = field(default=None, repr=False, compare=False)
+    sprite_offset: Tuple[float, float] = (0.0, 0.0)  # Sprite center relative to (x, y)
 
 class HexMap:
     """Manages hex generation, storage, and queries"""
     
-    def __init__(self, radius: int = 10, hex_size: int = HEX_SIZE):
+    def __init__(self, radius: Optional[int] = 10, hex_size: int = HEX_SIZE,
+                 seed: Optional[int] = None, chunk_size: int = CHUNK_SIZE,
+                 max_chunks: int = MAX_LOADED_CHUNKS,
+                 forest_blocks_sight: bool = FOREST_BLOCKS_SIGHT):
         """
         Args:
-            radius: Number of hex rings around center (10 = ~300+ hexes)
+            radius: Number of hex rings around center (10 = ~300+ hexes).
+                None streams an unbounded world in chunks as hexes are touched.
             hex_size: Pixel size of each hex (radius)
+            seed: World seed. Every hex is derived from (seed, q, r) alone.
+            chunk_size: Side length of a streamed chunk, in hexes
+            max_chunks: Loaded chunk budget before cold chunks are evicted
+            forest_blocks_sight: Forests block line of sight like mountains
         """
         self.radius = radius
         self.hex_size = hex_size
-        self.hexes: Dict[Tuple[int, int], HexTile] = {}
+        self.seed = seed if seed is not None else random.randrange(1 << 32)
+        self.grid: Optional[HexGrid] = None  # Dense storage for bounded maps
+        self.hexes = HexTileMapping(self)  # Dict-like (q, r) -> HexTile view
         self.center = (0, 0)  # Center hex at origin
         self.labels: List[MapLabel] = []
         
+        # Connected components, filled by _label_components (bounded maps only)
+        self.components: List[TerrainComponent] = []
+        self.component_ids: Optional[np.ndarray] = None  # Grid-shaped, -1 = not a hex
+        self.component_edges: Optional[np.ndarray] = None  # Grid-shaped, borders another component
+        
+        # Fog change subscribers, called with a FogDelta after each reveal
+        self._fog_listeners: List[Callable[[FogDelta], None]] = []
+        # Terrain change subscribers, called with (q, r, old, new) after set_terrain
+        self._terrain_listeners: List[Callable[[int, int, TerrainType, TerrainType], None]] = []
+        
+        # Line of sight; hexes currently flagged visible are tracked so the
+        # next view update can shroud the ones that fell out of sight
+        blockers = {TerrainType.MOUNTAIN}
+        if forest_blocks_sight:
+            blockers.add(TerrainType.FOREST)
+        self._sight_blockers = frozenset(TERRAIN_CODES[t] for t in blockers)
+        self.visibility = VisibilityEngine(self._blocks_sight)
+        self._in_view: Set[Tuple[int, int]] = set()
+        
+        # Step costs of the whole bounded map, built on the first route query
+        # (or ahead of it by prepare_routes)
+        self._cost_grid: Optional[CostGrid] = None
+        # Nearest-site flow fields by source terrain, built on first query
+        self._distance_fields: Dict[TerrainType, DistanceField] = {}
+        # Cluster-level route abstraction over the cost grid, built by prepare_routes
+        self._route_planner: Optional[HierarchicalPlanner] = None
+        
+        # Chunk streaming (only used when radius is None)
+        self.streaming = radius is None
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        # Loaded chunk grids in LRU order
+        self._chunks: "OrderedDict[Tuple[int, int], HexGrid]" = OrderedDict()
+        # Fog bits of evicted chunks as packed explored/visible bitmaps,
+        # restored when they are regenerated
+        self._chunk_fog: Dict[Tuple[int, int], bytes] = {}
+        
         # Terrain adjacency weights - higher = more likely to be adjacent
         self.terrain_affinity = {
             TerrainType.WATER: {
@@ -166,200 +526,356 @@ class HexMap:
             },
         }
     
+        # Town and dungeon sites, sampled lazily around whatever is generated
+        self.town_sites = PoissonDiskSampler(
+            TOWN_SPACING,
+            lambda *rect: self._site_scores(TerrainType.TOWN, *rect),
+            lambda qs, rs: hex_unit_batch(qs, rs, self.seed, SALT_TOWN_SITES),
+            fixed=[self.center])
+        self.dungeon_sites = PoissonDiskSampler(
+            DUNGEON_SPACING,
+            lambda *rect: self._site_scores(TerrainType.DUNGEON, *rect),
+            lambda qs, rs: hex_unit_batch(qs, rs, self.seed, SALT_DUNGEON_SITES),
+            avoid=self.town_sites, avoid_spacing=SITE_CLEARANCE)
+    
     def generate_map(self):
         """Generate all hexes with terrain using coherent clustering"""
-        # Ensure spiral order so neighbors exist when we generate
-        hexes_to_gen = self._get_spiral_coords(self.radius)
-        
-        for q, r in hexes_to_gen:
-            if q == 0 and r == 0:
-                # Center is always Town or safe Grass
-                terrain = TerrainType.TOWN
-                decorations = []
-                self.hexes[(q, r)] = HexTile(q, r, terrain, decorations, is_explored=True, is_visible=True)
-            else:
-                self.hexes[(q, r)] = self._generate_hex_tile(q, r)
+        if self.streaming:
+            # Chunks are produced on first touch; just warm up the origin.
+            # Cluster labels need whole clusters, so streamed worlds have none.
+            self._chunks.clear()
+            self._chunk_fog.clear()
+            self._load_chunk(self.chunk_key(0, 0))
+            return
+        
+        for _, step in self.generation_phases():
+            step()
+
+    def generation_phases(self) -> List[Tuple[str, Callable[[], None]]]:
+        """Bounded-map generation steps in order, as (name, step) pairs (timed by bench_worldgen)"""
+        return [
+            ("coordinates", self._layout_grid),
+            ("terrain", lambda: self._fill_grid(self.grid)),
+            ("clusters", self._label_components),
+            ("labels", self._generate_labels),
+        ]
+
+    def _layout_grid(self):
+        """Allocate one dense rhombus covering the hexagon; cells outside it stay invalid"""
+        size = 2 * self.radius + 1
+        self.grid = HexGrid(-self.radius, -self.radius, size, size, seed=self.seed)
+        qs, rs = self.grid.axial_coords()
+        inside = np.maximum(np.maximum(np.abs(qs), np.abs(rs)), np.abs(qs + rs)) <= self.radius
+        self.grid.flags[inside] = FLAG_VALID
+        self._cost_grid = None
+        self._distance_fields.clear()
+        self._route_planner = None
+
+    def save_snapshot(self, path: str):
+        """Write terrain, variant and flag arrays plus labels and seed to a binary snapshot"""
+        if self.streaming or self.grid is None:
+            raise ValueError("Only generated bounded maps can be saved as snapshots")
+        meta = {
+            "generator_version": GENERATOR_VERSION,
+            "radius": self.radius,
+            "hex_size": self.hex_size,
+            "seed": self.seed,
+            "q0": self.grid.q0,
+            "r0": self.grid.r0,
+            "labels": [[l.text, l.x, l.y, l.angle, l.color, l.priority] for l in self.labels],
+        }
+        write_snapshot(path, meta, {
+            "terrain": self.grid.terrain,
+            "variant": self.grid.variant,
+            "flags": self.grid.flags,
+        })
+
+    @classmethod
+    def load_snapshot(cls, path: str, radius: Optional[int] = None) -> "HexMap":
+        """
+        Open a snapshot written by save_snapshot; arrays are memory-mapped, not read.
         
-        self._analyze_clusters()
+        Raises:
+            ValueError: If the file is unreadable, was written by another generator
+                version, or (when radius is given) holds a map of a different radius
+        """
+        meta, arrays = read_snapshot(path)
+        version = meta.get("generator_version")
+        if version != GENERATOR_VERSION:
+            raise ValueError(f"{path} was generated by version {version}, expected {GENERATOR_VERSION}")
+        if radius is not None and meta["radius"] != radius:
+            raise ValueError(f"{path} has radius {meta['radius']}, expected {radius}")
+        hex_map = cls(radius=meta["radius"], hex_size=meta["hex_size"], seed=meta["seed"])
+        hex_map.grid = HexGrid.from_arrays(meta["q0"], meta["r0"], arrays["terrain"],
+                                           arrays["variant"], arrays["flags"], seed=hex_map.seed)
+        hex_map.labels = [MapLabel(text, x, y, angle, color, priority)
+                          for text, x, y, angle, color, priority in meta["labels"]]
+        hex_map._prepare_labels()
+        rows, cols = np.nonzero(hex_map.grid.flags & FLAG_VISIBLE)
+        hex_map._in_view = set(zip((cols + meta["q0"]).tolist(), (rows + meta["r0"]).tolist()))
+        return hex_map
+
+    @classmethod
+    def load_or_generate(cls, path: str, radius: int, regenerate: bool = False) -> "HexMap":
+        """Reuse the world saved at path, or generate and save a new one when the file is
+        missing, unreadable, stale or of another radius (or regenerate is set)"""
+        if not regenerate and os.path.exists(path):
+            try:
+                return cls.load_snapshot(path, radius=radius)
+            except (KeyError, ValueError) as e:
+                print(f"Regenerating world: {e}")
+        hex_map = cls(radius=radius)
+        hex_map.generate_map()
+        hex_map.save_snapshot(path)
+        return hex_map
+
+    def chunk_key(self, q: int, r: int) -> Tuple[int, int]:
+        """Chunk containing hex (q, r)"""
+        return (q // self.chunk_size, r // self.chunk_size)
+
+    def _grids(self) -> List[HexGrid]:
+        """All currently loaded storage grids"""
+        if self.streaming:
+            return list(self._chunks.values())
+        return [self.grid] if self.grid is not None else []
+
+    def _peek_hex(self, q: int, r: int) -> Optional[HexTile]:
+        """Tile view for an already loaded hex, without streaming anything in"""
+        if self.streaming:
+            grid = self._chunks.get(self.chunk_key(q, r))
+        else:
+            grid = self.grid
+        if grid is None or grid.cell(q, r) is None:
+            return None
+        return HexTile(grid, q, r)
 
-    def _analyze_clusters(self):
-        """Identify clusters of terrain and generate labels"""
+    def _load_chunk(self, key: Tuple[int, int]) -> HexGrid:
+        """Generate every hex of a chunk from the world seed, evicting cold chunks"""
+        grid = self._chunks.get(key)
+        if grid is not None:
+            self._chunks.move_to_end(key)
+            return grid
+        
+        cq, cr = key
+        grid = HexGrid(cq * self.chunk_size, cr * self.chunk_size, self.chunk_size, self.chunk_size,
+                       seed=self.seed)
+        grid.flags[:] = FLAG_VALID
+        # Regenerated chunks get their saved fog back instead of the starting view
+        self._fill_grid(grid, first_time=key not in self._chunk_fog)
+        
+        fog = self._chunk_fog.pop(key, None)
+        if fog is not None:
+            bits = np.unpackbits(np.frombuffer(fog, dtype=np.uint8), count=2 * grid.flags.size)
+            explored, visible = bits.reshape(2, *grid.flags.shape)
+            grid.flags |= explored * FLAG_EXPLORED | visible * FLAG_VISIBLE
+        
+        self._chunks[key] = grid
+        while len(self._chunks) > self.max_chunks:
+            self._evict_chunk(next(iter(self._chunks)))
+        return grid
+
+    def _evict_chunk(self, key: Tuple[int, int]):
+        """Drop a chunk's storage, keeping only its fog bits (two bits per hex)"""
+        grid = self._chunks.pop(key)
+        if (grid.flags & (FLAG_EXPLORED | FLAG_VISIBLE)).any():
+            bits = np.stack([grid.flags & FLAG_EXPLORED, grid.flags & FLAG_VISIBLE]).astype(bool)
+            self._chunk_fog[key] = np.packbits(bits).tobytes()
+
+    def _generate_labels(self):
+        """Name large forest, desert and water components and place their labels"""
         print("Analyzing map clusters...")
+        candidates: List[LabelCandidate] = []
         
         # Find forest clusters
-        visited_forest = set()
         forest_count = 0
-        for coord, tile in self.hexes.items():
-            if tile.terrain == TerrainType.FOREST and coord not in visited_forest:
-                cluster = self._flood_fill_terrain(coord, visited_forest, TerrainType.FOREST)
-                if len(cluster) >= 5:  # Increased threshold to avoid clutter
-                    self._generate_cluster_label(cluster, generate_forest_name)
-                    forest_count += 1
-        print(f"Generated {forest_count} forest labels.")
+        for comp in self.components_of(TerrainType.FOREST):
+            if comp.size >= 5:  # Increased threshold to avoid clutter
+                candidates.append(self._generate_cluster_label(
+                    self._component_tiles(comp), generate_forest_name, comp.size))
+                forest_count += 1
+        print(f"Found {forest_count} forest clusters.")
         
         # Find desert clusters
-        visited_desert = set()
         desert_count = 0
-        for coord, tile in self.hexes.items():
-            if tile.terrain == TerrainType.DESERT and coord not in visited_desert:
-                cluster = self._flood_fill_terrain(coord, visited_desert, TerrainType.DESERT)
-                if len(cluster) >= 5:  # Same threshold
-                    self._generate_cluster_label(cluster, generate_desert_name)
-                    desert_count += 1
-        print(f"Generated {desert_count} desert labels.")
+        for comp in self.components_of(TerrainType.DESERT):
+            if comp.size >= 5:  # Same threshold
+                candidates.append(self._generate_cluster_label(
+                    self._component_tiles(comp), generate_desert_name, comp.size))
+                desert_count += 1
+        print(f"Found {desert_count} desert clusters.")
         
         # Find water clusters
-        visited_water = set()
         water_count = 0
-        for coord, tile in self.hexes.items():
-            if tile.terrain == TerrainType.WATER and coord not in visited_water:
-                cluster = self._flood_fill_terrain(coord, visited_water, TerrainType.WATER)
-                if len(cluster) >= 3:  # Smaller threshold for water
-                    # Determine if ocean or lake/inland sea
-                    touches_boundary = self._cluster_touches_boundary(cluster)
-                    cluster_width = self._measure_cluster_width(cluster)
-                    
-                    if touches_boundary or cluster_width >= 10:
-                        # Ocean - can have multiple labels
-                        self._generate_water_labels(cluster, generate_ocean_name, cluster_width >= 10)
-                        water_count += 1
-                    else:
-                        # Lake/Inland Sea - single label
-                        self._generate_cluster_label(cluster, generate_lake_name)
-                        water_count += 1
-        print(f"Generated {water_count} water labels.")
-
-    def _flood_fill_terrain(self, start_coord, visited, terrain_type: TerrainType) -> List[HexTile]:
-        """Flood fill to find all connected hexes of a specific terrain type"""
-        cluster = []
-        queue = [start_coord]
-        visited.add(start_coord)
-        
-        while queue:
-            curr = queue.pop(0)
-            if curr in self.hexes:
-                cluster.append(self.hexes[curr])
-            
-            for nq, nr in self._get_neighbors(*curr):
-                if (nq, nr) not in visited and (nq, nr) in self.hexes:
-                    if self.hexes[(nq, nr)].terrain == terrain_type:
-                        visited.add((nq, nr))
-                        queue.append((nq, nr))
-                        
-        return cluster
-
-    def _flood_fill_forest(self, start_coord, visited) -> List[HexTile]:
-        """Legacy method - delegates to _flood_fill_terrain"""
-        return self._flood_fill_terrain(start_coord, visited, TerrainType.FOREST)
-
-    def _cluster_touches_boundary(self, cluster: List[HexTile]) -> bool:
-        """Check if a cluster touches the edge of the generated map"""
-        for tile in cluster:
-            # Check if any neighbor is outside our hex map
-            for nq, nr in self._get_neighbors(tile.q, tile.r):
-                if (nq, nr) not in self.hexes:
-                    return True
-        return False
-    
+        for comp in self.components_of(TerrainType.WATER):
+            if comp.size >= 3:  # Smaller threshold for water
+                cluster = self._component_tiles(comp)
+                # Determine if ocean or lake/inland sea
+                cluster_width = self._measure_cluster_width(cluster)
+                
+                if comp.touches_boundary or cluster_width >= 10:
+                    # Ocean - can have multiple labels
+                    candidates.extend(self._generate_water_labels(
+                        comp, cluster, generate_ocean_name, cluster_width >= 10))
+                else:
+                    # Lake/Inland Sea - single label
+                    candidates.append(self._generate_cluster_label(
+                        cluster, generate_lake_name, comp.size))
+                water_count += 1
+        print(f"Found {water_count} water clusters.")
+        
+        self._place_labels(candidates)
+
+    def _label_components(self):
+        """
+        Label every hex with a connected-component id in one linear pass.
+        Fills self.component_ids and the self.components table.
+        """
+        grid = self.grid
+        h, w = grid.height, grid.width
+        valid = (grid.flags & FLAG_VALID).astype(bool)
+        
+        # Pad with a one-cell border of non-hexes so neighbor offsets never leave the array
+        pw = w + 2
+        padded_valid = np.zeros((h + 2, pw), dtype=bool)
+        padded_valid[1:-1, 1:-1] = valid
+        padded = np.full((h + 2, pw), 255, dtype=np.uint8)
+        padded[1:-1, 1:-1][valid] = grid.terrain[valid]
+        
+        # Axial neighbor vectors (1,0) (-1,0) (0,-1) (0,1) (1,-1) (-1,1) as flat offsets
+        offsets = (1, -1, -pw, pw, 1 - pw, pw - 1)
+        terrain = padded.ravel().tolist()
+        labels = [-1] * len(terrain)
+        count = 0
+        
+        for start in np.flatnonzero(padded_valid).tolist():
+            if labels[start] != -1:
+                continue
+            code = terrain[start]
+            labels[start] = count
+            queue = deque([start])
+            while queue:
+                cur = queue.popleft()
+                for off in offsets:
+                    nxt = cur + off
+                    if labels[nxt] == -1 and terrain[nxt] == code:
+                        labels[nxt] = count
+                        queue.append(nxt)
+            count += 1
+        
+        ids = np.array(labels, dtype=np.int32).reshape(h + 2, pw)
+        
+        # A hex is on the map boundary if any of its six neighbors is not a hex
+        interior = padded_valid.copy()
+        interior[1:-1, 1:-1] &= padded_valid[1:-1, 2:] & padded_valid[1:-1, :-2]
+        interior[1:-1, 1:-1] &= padded_valid[:-2, 1:-1] & padded_valid[2:, 1:-1]
+        interior[1:-1, 1:-1] &= padded_valid[:-2, 2:] & padded_valid[2:, :-2]
+        edge_ids = ids[padded_valid & ~interior]
+        touches = np.bincount(edge_ids, minlength=count) > 0
+        
+        self.component_ids = ids[1:-1, 1:-1].copy()
+        
+        # Hexes with a neighbor in another component (or off the map)
+        same = np.ones((h, w), dtype=bool)
+        for dr, dq in ((0, 1), (0, -1), (-1, 0), (1, 0), (-1, 1), (1, -1)):
+            same &= ids[1 + dr:h + 1 + dr, 1 + dq:w + 1 + dq] == self.component_ids
+        self.component_edges = valid & ~same
+        
+        # Group member cells by component id
+        flat_ids = self.component_ids.ravel()
+        members = np.flatnonzero(flat_ids >= 0)
+        members = members[np.argsort(flat_ids[members], kind="stable")]
+        sizes = np.bincount(flat_ids[members], minlength=count)
+        
+        self.components = []
+        start = 0
+        for cid, size in enumerate(sizes.tolist()):
+            cells = members[start:start + size]
+            start += size
+            rows, cols = np.divmod(cells, w)
+            self.components.append(TerrainComponent(
+                id=cid,
+                terrain=TERRAIN_TYPES[grid.terrain[rows[0], cols[0]]],
+                size=size,
+                touches_boundary=bool(touches[cid]),
+                qs=cols + grid.q0,
+                rs=rows + grid.r0,
+            ))
+
+    def component_at(self, q: int, r: int) -> Optional[TerrainComponent]:
+        """Connected component containing hex (q, r)"""
+        if self.grid is None:
+            return None
+        if self.component_ids is None:
+            self._label_components()  # Maps loaded from a snapshot label lazily
+        cell = self.grid.cell(q, r)
+        if cell is None:
+            return None
+        return self.components[self.component_ids[cell]]
+
+    def components_of(self, terrain: TerrainType) -> List[TerrainComponent]:
+        """All connected components of one terrain type"""
+        if self.component_ids is None and self.grid is not None:
+            self._label_components()
+        return [c for c in self.components if c.terrain == terrain]
+
+    def _component_tiles(self, comp: TerrainComponent) -> List[HexTile]:
+        return [HexTile(self.grid, q, r) for q, r in zip(comp.qs.tolist(), comp.rs.tolist())]
+
     def _measure_cluster_width(self, cluster: List[HexTile]) -> int:
         """Measure the maximum width of a cluster (max distance between any two points)"""
         if len(cluster) < 2:
             return 1
-        
-        points = [(h.q, h.r) for h in cluster]
-        max_dist = 0
-        
-        for i in range(len(points)):
-            for j in range(i + 1, len(points)):
-                q1, r1 = points[i]
-                q2, r2 = points[j]
-                # Axial distance = (|q1-q2| + |r1-r2| + |q1+r1-q2-r2|) / 2
-                dist = (abs(q1 - q2) + abs(r1 - r2) + abs(q1 + r1 - q2 - r2)) // 2
-                max_dist = max(max_dist, dist)
-        
-        return max_dist
+        return axial_width([h.q for h in cluster], [h.r for h in cluster])
     
-    def _generate_water_labels(self, cluster: List[HexTile], name_gen_func, is_large: bool):
-        """Generate water labels. For large oceans, place multiple labels at least 3 hexes apart."""
+    def _generate_water_labels(self, comp: TerrainComponent, cluster: List[HexTile],
+                               name_gen_func, is_large: bool) -> List[LabelCandidate]:
+        """Generate water labels. For large oceans, offer labels along the shore at least 3 hexes apart."""
         if not is_large:
             # Single label for small water bodies
-            self._generate_cluster_label(cluster, name_gen_func)
-            return
+            return [self._generate_cluster_label(cluster, name_gen_func, comp.size)]
         
         # For large oceans, find boundary water tiles (adjacent to non-water)
-        boundary_tiles = []
-        for tile in cluster:
-            is_boundary = False
-            for nq, nr in self._get_neighbors(tile.q, tile.r):
-                if (nq, nr) not in self.hexes or self.hexes[(nq, nr)].terrain != TerrainType.WATER:
-                    is_boundary = True
-                    break
-            if is_boundary:
-                boundary_tiles.append(tile)
-        
-        if not boundary_tiles:
-            # Fallback if no boundary found
-            self._generate_cluster_label(cluster, name_gen_func)
-            return
+        edge = self.component_edges[comp.rs - self.grid.r0, comp.qs - self.grid.q0]
+        boundary_qs, boundary_rs = comp.qs[edge].tolist(), comp.rs[edge].tolist()
         
-        # Place labels on boundary tiles, at least 3 hexes apart
-        placed_labels = []
-        for tile in boundary_tiles:
-            # Check if this tile is at least 3 hexes away from all already placed labels
-            can_place = True
-            for placed_tile in placed_labels:
-                q1, r1 = tile.q, tile.r
-                q2, r2 = placed_tile.q, placed_tile.r
-                dist = (abs(q1 - q2) + abs(r1 - r2) + abs(q1 + r1 - q2 - r2)) // 2
-                if dist < 3:
-                    can_place = False
-                    break
+        if not boundary_qs:
+            # Fallback if no boundary found
+            return [self._generate_cluster_label(cluster, name_gen_func, comp.size)]
+        
+        # Calculate angle for each label (simple approach: use cluster center direction)
+        center_q = float(comp.qs.mean())
+        center_r = float(comp.rs.mean())
+        spacing = 3 * SQRT3 * self.hex_size  # ~3 hexes between labels of this ocean
+        
+        candidates = []
+        for q, r in zip(boundary_qs, boundary_rs):
+            px, py = HexTile(self.grid, q, r).get_pixel_coords(self.hex_size)
+            dy = center_r - r
+            dx = center_q - q
+            angle = math.degrees(math.atan2(dy, dx))
             
-            if can_place:
-                px, py = tile.get_pixel_coords(self.hex_size)
-                # Calculate angle for this label (simple approach: use cluster center direction)
-                center_q = sum(t.q for t in cluster) / len(cluster)
-                center_r = sum(t.r for t in cluster) / len(cluster)
-                dy = center_r - tile.r
-                dx = center_q - tile.q
-                angle = math.degrees(math.atan2(dy, dx))
-                
-                if angle > 90:
-                    angle -= 180
-                elif angle < -90:
-                    angle += 180
-                
-                name = name_gen_func()
-                self.labels.append(MapLabel(name, px, py, angle))
-                placed_labels.append(tile)
+            if angle > 90:
+                angle -= 180
+            elif angle < -90:
+                angle += 180
+            
+            # The first shore label competes with other features; the rest only fill gaps
+            priority = comp.size if not candidates else 0.0
+            candidates.append(LabelCandidate(px, py, angle, priority, name_gen_func,
+                                             group=comp.id, min_distance=spacing))
+        return candidates
 
-    def _generate_cluster_label(self, cluster: List[HexTile], name_generator_func):
-        # Calculate centroids and fit a line
-        if not cluster: return
-        
+    def _generate_cluster_label(self, cluster: List[HexTile], name_generator_func,
+                                priority: float = 0.0) -> LabelCandidate:
+        """Label candidate along the cluster's longest axis"""
         # Get pixel coordinates for all hexes
         points = []
         for h in cluster:
             px, py = h.get_pixel_coords(self.hex_size)
             points.append((px, py))
             
-        # Find the two most distant points to define length and angle
-        max_dist = 0
-        p1_best, p2_best = points[0], points[0]
-        
-        # Simple N^2 search for diameter (N is usually small < 20 for forests)
-        # If N is large, we might want a convex hull, but this is fine only running once
-        for i in range(len(points)):
-            for j in range(i + 1, len(points)):
-                p1 = points[i]
-                p2 = points[j]
-                dx = p2[0] - p1[0]
-                dy = p2[1] - p1[1]
-                dist = dx*dx + dy*dy
-                if dist > max_dist:
-                    max_dist = dist
-                    p1_best = p1
-                    p2_best = p2
+        # The two most distant points define length and angle
+        _, p1_best, p2_best = hull_diameter(points)
         
         # Midpoint
         mx = (p1_best[0] + p2_best[0]) / 2
@@ -376,690 +892,1072 @@ class HexMap:
         elif angle < -90:
             angle += 180
             
-        name = name_generator_func()
-        
-        self.labels.append(MapLabel(name, mx, my, angle))
-
-    def _get_spiral_coords(self, radius: int) -> List[Tuple[int, int]]:
-        """Get hex coordinates in spiral from center outward"""
-        results = [(0, 0)]
-        for k in range(1, radius + 1):
-            q, r = 0, -k
-            for _ in range(k):
-                q += 1; results.append((q, r))
-            for _ in range(k):
-                r += 1; results.append((q, r))
-            for _ in range(k):
-                q -= 1; r += 1; results.append((q, r))
-            for _ in range(k):
-                q -= 1; results.append((q, r))
-            for _ in range(k):
-                r -= 1; results.append((q, r))
-            for _ in range(k):
-                q += 1; r -= 1; results.append((q, r))
-        return results
-    
-    def _generate_hex_tile(self, q: int, r: int) -> HexTile:
-        """Generate a single hex with terrain using weighted adjacency"""
-        terrain = self._pick_terrain(q, r)
-        decorations = self._generate_decorations(terrain)
-        variant_id = random.randint(0, 3) 
-        return HexTile(q, r, terrain, decorations, variant_id=variant_id)
-
-    def _get_noise_val(self, q: int, r: int, scale: float) -> float:
-        """Deterministic noise helper. Returns roughly -1.0 to 1.0"""
+        return LabelCandidate(mx, my, angle, priority, name_generator_func())
+
+    def _place_labels(self, candidates: List[LabelCandidate]):
+        """Single placement stage over every label candidate on the map"""
+        placer = LabelPlacer(cell_size=4 * self.hex_size)
+        self.labels = [MapLabel(p.text, p.x, p.y, p.angle, priority=p.priority)
+                       for p in placer.place_all(candidates)]
+        self._prepare_labels()
+        print(f"Placed {len(self.labels)} of {len(candidates)} label candidates.")
+
+    def _prepare_labels(self):
+        """Find each label's anchor hex once, so culling never converts label positions"""
+        for label in self.labels:
+            label.anchor = hex_math.pixel_to_hex(label.x, label.y, self.hex_size)
+
+    def _fill_grid(self, grid: HexGrid, first_time: bool = True):
+        """
+        Generate terrain and variants for every valid cell of a grid.
+        On first generation the starting hex is also marked seen.
+        """
+        qs, rs = grid.axial_coords()
+        valid = (grid.flags & FLAG_VALID).astype(bool)
+        qs, rs = qs[valid], rs[valid]
+        
+        codes = self.pick_terrain_batch(qs, rs)
+        grid.terrain[valid] = codes
+        grid.variant[valid] = hex_hash_batch(qs, rs, self.seed, SALT_VARIANT) % np.uint64(4)
+        self._place_sites(grid)
+        
+        # Center is always Town or safe Grass
+        center = grid.cell(0, 0)
+        if center is not None:
+            grid.terrain[center] = TERRAIN_CODES[TerrainType.TOWN]
+            if first_time:
+                grid.flags[center] |= FLAG_EXPLORED | FLAG_VISIBLE
+                self._in_view.add((0, 0))
+
+    def _site_scores(self, site: TerrainType, q0: int, r0: int, width: int, height: int) -> np.ndarray:
+        """
+        How well each hex of an axial rectangle suits a site: the mean
+        terrain_affinity of the site for the hex and its six neighbors, scaled
+        to 0-1. Uses the natural terrain, so scores never depend on sites
+        already placed. Impassable or poorly suited hexes score 0.
+        """
+        affinity = self.terrain_affinity[site]
+        table = np.array([affinity.get(t, 0) for t in TERRAIN_TYPES], dtype=np.float64)
+        # Terrain with a one-hex border, so neighbors are array shifts
+        qs, rs = np.meshgrid(np.arange(q0 - 1, q0 + width + 1, dtype=np.int64),
+                             np.arange(r0 - 1, r0 + height + 1, dtype=np.int64))
+        codes = self.pick_terrain_batch(qs.ravel(), rs.ravel()).reshape(qs.shape)
+        weights = table[codes]
+        total = weights[1:-1, 1:-1].copy()
+        for dq, dr in hex_math.AXIAL_DIRECTIONS:
+            total += weights[1 + dr:height + 1 + dr, 1 + dq:width + 1 + dq]
+        scores = total / (7 * 10)
+        own = codes[1:-1, 1:-1]
+        return np.where((STEP_COSTS[own] > 0) & (scores >= SITE_MIN_SUITABILITY), scores, 0.0)
+
+    def _place_sites(self, grid: HexGrid):
+        """Stamp the town and dungeon sites that fall inside a grid"""
+        q1, r1 = grid.q0 + grid.width, grid.r0 + grid.height
+        for terrain, sampler in ((TerrainType.TOWN, self.town_sites),
+                                 (TerrainType.DUNGEON, self.dungeon_sites)):
+            sites = [(q, r) for q, r in sampler.sites_in(grid.q0, grid.r0, q1, r1)
+                     if grid.cell(q, r) is not None]
+            if not sites:
+                continue
+            qs = np.array([q for q, _ in sites], dtype=np.int64)
+            rs = np.array([r for _, r in sites], dtype=np.int64)
+            grid.terrain[rs - grid.r0, qs - grid.q0] = TERRAIN_CODES[terrain]
+
+    def _get_noise_val(self, q, r, scale: float):
+        """Deterministic noise helper. Returns roughly -1.0 to 1.0.
+        Accepts scalars or NumPy arrays of coordinates."""
         # Simple coordinate hashing for randomness consistency
         # Using primes to avoid repeating patterns on integer grids
-        val = math.sin(q * scale) + math.cos(r * scale * 1.1) 
-        val += 0.5 * math.sin((q + r) * scale * 1.7)
+        val = np.sin(q * scale) + np.cos(r * scale * 1.1)
+        val += 0.5 * np.sin((q + r) * scale * 1.7)
         return val / 2.5  # Normalize roughly to [-1, 1]
     
     def _pick_terrain(self, q: int, r: int) -> TerrainType:
+        """Pick terrain for a single hex (see pick_terrain_batch)"""
+        code = self.pick_terrain_batch(np.array([q]), np.array([r]))[0]
+        return TERRAIN_TYPES[code]
+    
+    def pick_terrain_batch(self, qs: np.ndarray, rs: np.ndarray) -> np.ndarray:
         """
-        Pick terrain using a noise-based approach to ensure proper clump sizes.
+        Pick terrain codes for arrays of (q, r) in one NumPy pass, using a
+        noise-based approach to ensure proper clump sizes.
         - Primary biomes uses medium-freq noise (scale ~0.35) for ~5-hex blobs.
         - Mountains use high-freq ridged noise (scale ~0.4) for narrow bands.
+        
+        Returns:
+            uint8 array of indices into TERRAIN_TYPES
         """
+        qs = np.asarray(qs, dtype=np.int64)
+        rs = np.asarray(rs, dtype=np.int64)
         
         # 1. MOUNTAINS (Narrow Bands)
         # Use a "ridge" function: 1.0 - abs(noise). High values = center of ridge.
         # Scale 0.45 creates bands. Thresholding creates width.
-        m_noise = self._get_noise_val(q + 123, r - 456, 0.45) # Offset coordinates
-        ridge_val = 1.0 - abs(m_noise)
+        m_noise = self._get_noise_val(qs + 123, rs - 456, 0.45) # Offset coordinates
+        ridge_val = 1.0 - np.abs(m_noise)
         # Threshold > 0.85 keeps it narrow (top 15% of the wave)
         # This averages roughly 2 hexes wide
-        if ridge_val > 0.88:
-            return TerrainType.MOUNTAIN
-            
+        is_mountain = ridge_val > MOUNTAIN_RIDGE_THRESHOLD
+        
         # 2. MAIN BIOMES (Broad Clumps)
         # Use smoother noise for main terrain blobs
-        b_noise = self._get_noise_val(q, r, 0.35) 
+        b_noise = self._get_noise_val(qs, rs, 0.35)
+        
+        # Add slight local randomness to blur edges (irregularity).
+        # Drawn from a per-hex hash so the same seed reproduces the same map.
+        b_noise += -0.15 + 0.3 * hex_unit_batch(qs, rs, self.seed, SALT_TERRAIN_JITTER)
         
-        # Add slight local randomness to blur edges (irregularity)
-        b_noise += random.uniform(-0.15, 0.15)
+        # Normalize roughly to 0..1 and map onto the biome gradient
+        val = np.clip((b_noise + 1.0) / 2.0, 0.0, 1.0)
+        codes = BIOME_CODES[np.digitize(val, BIOME_THRESHOLDS)]
         
-        # Map noise range (-1.2 to 1.2) to terrain gradient
-        # Order aims for logical adjacency: Water <-> Swamp <-> Forest <-> Grass <-> Hills <-> Desert
-        # This naturally groups them.
+        codes[is_mountain] = TERRAIN_CODES[TerrainType.MOUNTAIN]
+        return codes
+    
+    def get_hex_at(self, q: int, r: int) -> Optional[HexTile]:
+        if self.streaming:
+            # Touching a hex loads (or refreshes) its chunk
+            return HexTile(self._load_chunk(self.chunk_key(q, r)), q, r)
+        return self._peek_hex(q, r)
+    
+    def _cells_by_grid(self, qs: np.ndarray, rs: np.ndarray):
+        """
+        Split coordinate arrays by the grid that stores them (streaming loads chunks).
+        Yields (grid, qs, rs, mask) where mask selects those coordinates in the input.
+        """
+        if not self.streaming:
+            grid = self.grid
+            if grid is None:
+                return
+            inside = ((qs >= grid.q0) & (qs < grid.q0 + grid.width)
+                      & (rs >= grid.r0) & (rs < grid.r0 + grid.height))
+            yield grid, qs[inside], rs[inside], inside
+            return
         
-        # Normalize roughly to 0..1
-        val = (b_noise + 1.0) / 2.0
-        val = max(0.0, min(1.0, val))
+        cqs, crs = qs // self.chunk_size, rs // self.chunk_size
+        for key in set(zip(cqs.ravel().tolist(), crs.ravel().tolist())):
+            grid = self._load_chunk(key)
+            mask = (cqs == key[0]) & (crs == key[1])
+            yield grid, qs[mask], rs[mask], mask
+
+    def cells_batch(self, qs: np.ndarray, rs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Terrain codes and flags of many hexes (flags are 0 off the map)"""
+        codes = np.zeros(qs.shape, dtype=np.uint8)
+        flags = np.zeros(qs.shape, dtype=np.uint8)
+        for grid, gqs, grs, mask in self._cells_by_grid(qs, rs):
+            rows, cols = grs - grid.r0, gqs - grid.q0
+            codes[mask] = grid.terrain[rows, cols]
+            flags[mask] = grid.flags[rows, cols]
+        return codes, flags
+
+    def subscribe_fog(self, callback: Callable[[FogDelta], None]):
+        """Call callback(delta) whenever a reveal changes fog state"""
+        self._fog_listeners.append(callback)
+
+    def unsubscribe_fog(self, callback: Callable[[FogDelta], None]):
+        if callback in self._fog_listeners:
+            self._fog_listeners.remove(callback)
+
+    def cost_grid(self, start: Tuple[int, int], goal: Tuple[int, int]) -> CostGrid:
+        """
+        Step costs covering a route search from start to goal.
+        Bounded maps share one grid for the whole map; streamed worlds get a
+        window around both ends, loading the chunks it covers.
+        """
+        if not self.streaming:
+            if self._cost_grid is None:
+                grid = self.grid
+                valid = (grid.flags & FLAG_VALID).astype(bool)
+                self._cost_grid = CostGrid(grid.q0, grid.r0,
+                                           np.where(valid, STEP_COSTS[grid.terrain], 0))
+            return self._cost_grid
+        
+        m = PATH_SEARCH_MARGIN
+        q0, r0 = min(start[0], goal[0]) - m, min(start[1], goal[1]) - m
+        width = max(start[0], goal[0]) + m + 1 - q0
+        height = max(start[1], goal[1]) + m + 1 - r0
+        costs = np.zeros((height, width), dtype=np.int64)
+        qs = np.arange(q0, q0 + width, dtype=np.int64)
+        rs = np.arange(r0, r0 + height, dtype=np.int64)
+        qs, rs = np.meshgrid(qs, rs)
+        for grid, gqs, grs, _ in self._cells_by_grid(qs.ravel(), rs.ravel()):
+            codes = grid.terrain[grs - grid.r0, gqs - grid.q0]
+            costs[grs - r0, gqs - q0] = STEP_COSTS[codes]
+        return CostGrid(q0, r0, costs)
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[TravelPath]:
+        """Cheapest walkable route between two hexes by movement cost, or None"""
+        return astar(self.cost_grid(start, goal), start, goal)
+
+    def plan_route(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[PlannedRoute]:
+        """
+        Route for travel over any distance, or None. Bounded maps plan long
+        routes on the cluster abstraction and refine hexes as they are walked;
+        streamed worlds fall back to a windowed find_path.
+        """
+        if self.streaming:
+            path = self.find_path(start, goal)
+            if path is None:
+                return None
+            return PlannedRoute(start, goal, path.cost, [start, goal], None, path.hexes)
+        self.prepare_routes()
+        return self._route_planner.plan(start, goal)
+
+    def prepare_routes(self):
+        """Build the bounded map's cost grid and route planner ahead of the first plan_route"""
+        if not self.streaming and self._route_planner is None:
+            self._route_planner = HierarchicalPlanner(self.cost_grid(self.center, self.center))
+
+    def distance_field(self, terrain: TerrainType) -> DistanceField:
+        """Flow field toward the nearest hex of `terrain` (bounded maps only)"""
+        if self.streaming:
+            raise ValueError("Distance fields need a bounded map")
+        dist_field = self._distance_fields.get(terrain)
+        if dist_field is None:
+            rows, cols = np.nonzero((self.grid.terrain == TERRAIN_CODES[terrain])
+                                    & (self.grid.flags & FLAG_VALID).astype(bool))
+            sources = zip((cols + self.grid.q0).tolist(), (rows + self.grid.r0).tolist())
+            # Each field gets its own cost grid since update() writes costs into it
+            dist_field = DistanceField(self.cost_grid(self.center, self.center).copy(), sources)
+            self._distance_fields[terrain] = dist_field
+        return dist_field
+
+    def nearest(self, q: int, r: int, terrain: TerrainType) -> Optional[Tuple[Tuple[int, int], int]]:
+        """(hex, travel cost) of the cheapest-to-reach hex of `terrain` from (q, r), or None"""
+        dist_field = self.distance_field(terrain)
+        site = dist_field.nearest_source(q, r)
+        if site is None:
+            return None
+        return site, dist_field.distance(q, r)
+
+    def subscribe_terrain(self, callback: Callable[[int, int, TerrainType, TerrainType], None]):
+        """Call callback(q, r, old, new) whenever set_terrain changes a hex"""
+        self._terrain_listeners.append(callback)
+
+    def unsubscribe_terrain(self, callback: Callable[[int, int, TerrainType, TerrainType], None]):
+        if callback in self._terrain_listeners:
+            self._terrain_listeners.remove(callback)
+
+    def set_terrain(self, q: int, r: int, terrain: TerrainType):
+        """
+        Change one hex's terrain and bring derived data up to date: route
+        costs and planner, distance fields, line of sight and components.
+        Prefer this over assigning HexTile.terrain, which only touches storage.
+        """
+        tile = self.get_hex_at(q, r)
+        if tile is None:
+            raise KeyError(f"No hex at {(q, r)}")
+        old = tile.terrain
+        if old == terrain:
+            return
+        tile.terrain = terrain
+        
+        cost = int(STEP_COSTS[TERRAIN_CODES[terrain]])
+        if self._cost_grid is not None:
+            self._cost_grid.set_cost(q, r, cost)
+        if self._route_planner is not None:
+            self._route_planner.update(q, r)
+        for source, dist_field in self._distance_fields.items():
+            dist_field.update(q, r, cost, terrain == source)
+        if (TERRAIN_CODES[old] in self._sight_blockers) != (TERRAIN_CODES[terrain] in self._sight_blockers):
+            self.visibility.invalidate()
+        self.component_ids = None  # Relabelled lazily on the next component query
+        
+        for callback in list(self._terrain_listeners):
+            callback(q, r, old, terrain)
+
+    def _blocks_sight(self, q: int, r: int) -> bool:
+        """True if the hex at (q, r) stops line of sight (void never blocks)"""
+        if self.streaming:
+            grid = self._load_chunk(self.chunk_key(q, r))
+        else:
+            grid = self.grid
+        cell = grid.cell(q, r)
+        return cell is not None and int(grid.terrain[cell]) in self._sight_blockers
+
+    def _notify_fog(self, delta: FogDelta):
+        if delta:
+            for callback in list(self._fog_listeners):
+                callback(delta)
+
+    def _mark_visible(self, qs: np.ndarray, rs: np.ndarray, delta: FogDelta):
+        """Set explored and visible bits on hexes, recording the changes in delta"""
+        for grid, gqs, grs, _ in self._cells_by_grid(qs, rs):
+            rows, cols = grs - grid.r0, gqs - grid.q0
+            flags = grid.flags[rows, cols]
+            valid = (flags & FLAG_VALID) != 0
+            new_explored = valid & ((flags & FLAG_EXPLORED) == 0)
+            new_visible = valid & ((flags & FLAG_VISIBLE) == 0)
+            grid.flags[rows[valid], cols[valid]] |= FLAG_EXPLORED | FLAG_VISIBLE
+            
+            delta.explored.update(zip(gqs[new_explored].tolist(), grs[new_explored].tolist()))
+            delta.visible.update(zip(gqs[new_visible].tolist(), grs[new_visible].tolist()))
+            self._in_view.update(zip(gqs[valid].tolist(), grs[valid].tolist()))
+
+    def reveal_hex(self, q: int, r: int, radius: int = 1) -> FogDelta:
+        """
+        Reveal every hex within radius, ignoring line of sight (e.g. scripted reveals).
+        The hexes stay visible until the next update_view shrouds them.
         
-        if val < 0.18: return TerrainType.WATER
-        if val < 0.28: return TerrainType.SWAMP
-        if val < 0.50: return TerrainType.FOREST
-        if val < 0.72: return TerrainType.GRASS
-        if val < 0.88: return TerrainType.HILLS
-        return TerrainType.DESERT
+        Returns:
+            FogDelta with the hexes whose explored/visible bits were newly set
+        """
+        dq, dr = hex_math.range_offsets_array(radius)
+        delta = FogDelta()
+        self._mark_visible(q + dq, r + dr, delta)
+        self._notify_fog(delta)
+        return delta
 
-        # Step 3: Rare Features (Town/Dungeon) - applied as random overrides
-        if random.random() < 0.005: return TerrainType.TOWN
-        if random.random() < 0.005: return TerrainType.DUNGEON
+    def update_view(self, q: int, r: int, radius: int = SIGHT_RADIUS) -> FogDelta:
+        """
+        Recompute what a viewer at (q, r) can see.
+        Hexes in line of sight become explored and visible; hexes that were
+        visible before but are not now drop to the shroud (explored, not visible).
         
-        return TerrainType.GRASS # Fallback
+        Returns:
+            FogDelta including the newly hidden hexes
+        """
+        seen = self.visibility.visible_from(q, r, radius)
+        delta = FogDelta()
+        
+        lost = self._in_view - seen
+        self._in_view = set()
+        if lost:
+            coords = np.array(list(lost), dtype=np.int64)
+            for grid, qs, rs, _ in self._cells_by_grid(coords[:, 0], coords[:, 1]):
+                grid.flags[rs - grid.r0, qs - grid.q0] &= ~np.uint8(FLAG_VISIBLE)
+                delta.hidden.update(zip(qs.tolist(), rs.tolist()))
+        
+        coords = np.array(list(seen), dtype=np.int64)
+        self._mark_visible(coords[:, 0], coords[:, 1], delta)
+        self._notify_fog(delta)
+        return delta
+
+
+def _paste_centered(dest: Image.Image, src: Image.Image, x: float, y: float):
+    """Alpha-composite src over dest with its center at (x, y), clipped to dest"""
+    # Round half up (not to even) so shifting the origin by whole pixels shifts the result
+    left = math.floor(x - src.width / 2 + 0.5)
+    top = math.floor(y - src.height / 2 + 0.5)
+    sx, sy = max(0, -left), max(0, -top)
+    ex, ey = min(src.width, dest.width - left), min(src.height, dest.height - top)
+    if sx < ex and sy < ey:
+        dest.alpha_composite(src, (left + sx, top + sy), (sx, sy, ex, ey))
+
+
+@dataclass
+class ChunkImage:
+    """One composited block of hexes and the fog version it was built from"""
+    x: int  # World pixel position of the top-left corner
+    y: int
+    width: int
+    height: int
+    terrain: Optional[Image.Image] = None  # Tiles (or fog) of the chunk and its border, unclipped
+    mask: Optional[Image.Image] = None  # The chunk's own hexes
+    photo: Optional[ImageTk.PhotoImage] = None  # Clipped terrain plus shroud
+    dirty: Set[Tuple[int, int]] = field(default_factory=set)  # Hexes whose tiles need repainting
+    fog_version: int = -1
+    empty: bool = False  # No hex of the map falls inside
+    # Flat zoom levels: hexes (qs, rs) around the chunk and which of them each pixel shows
+    cells: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+
+def asset_source_paths() -> List[str]:
+    """Every file the packed assets are built from"""
+    paths = [os.path.join(ASSET_DIR, f"{terrain.display_name}_v{v}.png")
+             for terrain in TerrainType for v in range(TERRAIN_VARIANTS)]
+    paths.append(os.path.join(ASSET_DIR, "fog.png"))
+    paths += [os.path.join(ASSET_DIR, f"forest_base_{i}.png") for i in range(1, 7)]
+    paths += [f"assets/sprites/{name}.png" for name in HexPainter.SPRITE_NAMES]
+    return paths
+
+
+def paint_asset_images(hex_size: int) -> Dict[str, Image.Image]:
+    """
+    Every image the renderer draws from, by atlas name: terrain variants
+    ("<terrain>_v<n>", painted procedurally where no PNG exists), "fog",
+    "shroud", "shoreline_<edge>", "forest_base_<n>" and "sprite/<name>".
+    """
+    images = {}
+    # Sprites first: the shoreline overlays and procedural tiles are painted from them
+    for name in HexPainter.SPRITE_NAMES:
+        path = f"assets/sprites/{name}.png"
+        if os.path.exists(path):
+            images[f"sprite/{name}"] = Image.open(path).convert("RGBA")
+    for i in range(1, 7):
+        path = os.path.join(ASSET_DIR, f"forest_base_{i}.png")
+        if os.path.exists(path):
+            images[f"forest_base_{i}"] = Image.open(path).convert("RGBA")
+
+    for terrain in TerrainType:
+        for v in range(TERRAIN_VARIANTS):
+            path = os.path.join(ASSET_DIR, f"{terrain.display_name}_v{v}.png")
+            if os.path.exists(path):
+                img = Image.open(path).convert("RGBA")
+            else:
+                img = _paint_procedural_hex(terrain, v, hex_size)
+            images[f"{terrain.display_name}_v{v}"] = img
+
+    for i in range(6):
+        images[f"shoreline_{i}"] = _paint_shoreline_overlay(i, hex_size)
+
+    fog_path = os.path.join(ASSET_DIR, "fog.png")
+    fog_img = Image.open(fog_path).convert("RGBA") if os.path.exists(fog_path) else _paint_fog_placeholder(hex_size)
+    images["fog"] = fog_img
+    # Shroud: the same fog, scaled down to SHROUD_FOG_ALPHA
+    shroud_img = fog_img.copy()
+    shroud_img.putalpha(fog_img.getchannel("A").point(lambda a: a * SHROUD_FOG_ALPHA // 255))
+    images["shroud"] = shroud_img
+    return images
+
+
+def load_asset_atlas(hex_size: int, path: Optional[str] = ASSET_ATLAS_PATH) -> AssetAtlas:
+    """
+    The renderer's packed assets for this hex size: read from path in one go,
+    or painted, packed and written there when missing or built from other files.
+    """
+    fingerprint = source_fingerprint(asset_source_paths(),
+                                     f"{ASSET_ATLAS_VERSION}/{hex_size}/{SHROUD_FOG_ALPHA}")
+    if path is not None:
+        path = path.format(hex_size=hex_size)
+        atlas = AssetAtlas.load(path, fingerprint)
+        if atlas is not None:
+            return atlas
+    atlas = AssetAtlas.from_images(paint_asset_images(hex_size), fingerprint)
+    if path is not None:
+        atlas.save(path)
+    return atlas
+
+
+def _paint_shoreline_overlay(edge_index: int, hex_size: int) -> Image.Image:
+    """A transparent overlay with a shoreline on one edge"""
+    img_w, img_h = HexPainter.tile_size(hex_size)
+    img = Image.new('RGBA', (img_w, img_h), (0, 0, 0, 0))
+    HexPainter.draw_shoreline_overlay(img, img_w / 2, img_h / 2, hex_size, edge_index)
+    return img
+
+
+def _paint_procedural_hex(terrain: TerrainType, variant_id: int, hex_size: int) -> Image.Image:
+    """A procedurally painted hex tile"""
+    # Padded so trees/mountains are not cut off
+    img_w, img_h = HexPainter.tile_size(hex_size)
+    img = Image.new('RGBA', (img_w, img_h), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
     
-    def _get_neighbors(self, q: int, r: int) -> List[Tuple[int, int]]:
-        """Get 6 neighboring hex coordinates (axial)"""
-        # Pointy-top hex neighbors in axial coordinates:
-        # (+1, 0), (+1, -1), (0, -1), (-1, 0), (-1, +1), (0, +1)
-        vectors = [
-            (1, 0), (1, -1), (0, -1), 
-            (-1, 0), (-1, 1), (0, 1)
-        ]
-        return [(q + dq, r + dr) for dq, dr in vectors]
+    cx, cy = img_w / 2, img_h / 2
     
-    def _generate_decorations(self, terrain: TerrainType) -> List[str]:
-        """Generate random decorations/assets for a hex"""
-        decorations = []
-        
-        decoration_pools = {
-            TerrainType.FOREST: ["tree_1", "tree_2", "tree_group", "tree_tall_nw"],
-            TerrainType.MOUNTAIN: ["mountain_1", "mountain_peak_nw", "mountain_small"],
-            TerrainType.GRASS: ["grass_tuft_1", "flower_1", "rock_small"],
-            TerrainType.WATER: ["waves_1", "lilypad"],
-            TerrainType.SWAMP: ["dead_tree", "swamp_grass"],
-            TerrainType.HILLS: ["hill_1", "hill_2"],
-            TerrainType.DESERT: ["cactus", "rocks", "dune"],
-            TerrainType.TOWN: ["house_1", "tower"],
-            TerrainType.DUNGEON: ["ruins", "cave_entrance"]
-        }
-        
-        if terrain in decoration_pools:
-            if random.random() < 0.4: # 40% chance of decoration
-                count = random.randint(1, 2)
-                pool = decoration_pools[terrain]
-                decorations = random.choices(pool, k=count)
-        
-        return decorations
+    # Base Colors
+    colors = {
+        TerrainType.GRASS: (100, 200, 100, 255),
+        TerrainType.FOREST: (34, 100, 34, 255), # Darker green base
+        TerrainType.MOUNTAIN: (140, 140, 140, 255),
+        TerrainType.WATER: (65, 105, 225, 255),
+        TerrainType.SWAMP: (85, 107, 47, 255),
+        TerrainType.HILLS: (218, 165, 32, 255),
+        TerrainType.DESERT: (237, 201, 175, 255),
+        TerrainType.TOWN: (205, 92, 92, 255),
+        TerrainType.DUNGEON: (75, 0, 130, 255),
+    }
+    fill_col = colors.get(terrain, (255, 255, 255, 255))
     
-    def get_hex_at(self, q: int, r: int) -> Optional[HexTile]:
-        return self.hexes.get((q, r))
+    # 1. Draw Base Hex
+    HexPainter.draw_hex_base(draw, cx, cy, hex_size, fill_col)
     
-    def reveal_hex(self, q: int, r: int, radius: int = 1):
-        """Reveal hex and neighbors (fog of war removal)"""
-        # Simple BFS / flooding for range
-        seen = set()
-        queue = [(q, r, 0)]
-        seen.add((q, r))
-        
-        while queue:
-            curr_q, curr_r, dist = queue.pop(0)
-            
-            # Mark as explored
-            if (curr_q, curr_r) in self.hexes:
-                self.hexes[(curr_q, curr_r)].is_explored = True
-                # In this simple implementation, explored = visible
-                # A proper LoS system would separate known-but-dark from visible
-                self.hexes[(curr_q, curr_r)].is_visible = True
-            
-            if dist < radius:
-                for nq, nr in self._get_neighbors(curr_q, curr_r):
-                    if (nq, nr) not in seen:
-                        seen.add((nq, nr))
-                        queue.append((nq, nr, dist + 1))
+    # 2. Draw Features based on terrain
+    seed = f"{terrain.name}_{variant_id}" # Consistent seed for this variant asset
+    
+    if terrain == TerrainType.MOUNTAIN:
+        HexPainter.draw_mountain_variant(img, cx, cy, hex_size, seed)
+    elif terrain == TerrainType.FOREST:
+        # Forest hexes get unique tiles; these variants stand in while they are painted
+        HexPainter.draw_forest_variant(img, cx, cy, hex_size, seed)
+    elif terrain == TerrainType.GRASS:
+        HexPainter.draw_grass_variant(img, cx, cy, hex_size, seed)
+    # Hills are left flat colored for now
+    return img
+
+
+def _paint_fog_placeholder(hex_size: int) -> Image.Image:
+    img_w, img_h = HexPainter.tile_size(hex_size)
+    img = Image.new('RGBA', (img_w, img_h), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    
+    # Draw hex with same radius as terrain, filled completely with fog
+    points = hex_math.hex_corners(img_w / 2, img_h / 2, hex_size)
+    draw.polygon(points, fill=(20, 20, 20, 255), outline=(0, 0, 0, 255))
+    return img
 
 
 class HexMapRenderer:
     """Handles rendering of hex map with layers using PIL and Tkinter"""
     
-    def __init__(self, world_map: HexMap, canvas: Canvas):
+    def __init__(self, world_map: HexMap, canvas: Canvas, workers: Optional[int] = TILE_WORKERS,
+                 tile_cache_dir: Optional[str] = TILE_CACHE_DIR, atlas_path: Optional[str] = ASSET_ATLAS_PATH):
         self.world_map = world_map
         self.canvas = canvas
-        self.hex_size = world_map.hex_size
+        self.base_hex_size = world_map.hex_size  # Tiles are painted at this size
+        # Zoom level (index into ZOOM_SCALES), with the hex size and chunk span drawn at
+        self.zoom = 0
+        self.hex_size = self.base_hex_size
+        self.chunk_span = RENDER_CHUNK_SIZE
         
         # Caches
-        self.asset_cache: Dict[str, Image.Image] = {} # Key: "TerrainName_vX"
-        self.tk_asset_cache: Dict[str, ImageTk.PhotoImage] = {} 
-        self.shoreline_cache: Dict[int, ImageTk.PhotoImage] = {} # Key: edge_index 0-5
-        self.tk_images: Dict[str, ImageTk.PhotoImage] = {} # Per-frame unique items if needed
-        self.label_cache: Dict[str, ImageTk.PhotoImage] = {} # Cache for label images
-        self.unique_hex_cache: Dict[Tuple[int, int], ImageTk.PhotoImage] = {} # Key: (q, r) for unique tiles
-        self.forest_base_cache: Dict[int, Image.Image] = {} # Key: base index 1-6
-        
-        self._init_assets()
+        self.asset_cache: Mapping[str, Image.Image] = {} # Packed assets, key e.g. "mountain_v0" (see paint_asset_images)
+        self.label_cache: Dict[int, ImageTk.PhotoImage] = {} # Key: index into world_map.labels
+        self.unique_hex_cache: Dict[Tuple[int, int], Image.Image] = {} # Key: (q, r) for unique tiles
+        # Tiles reduced for the zoom levels, key: (asset name or (q, r), level) -> (source, reduced)
+        self.mip_cache: Dict[tuple, Tuple[Image.Image, Image.Image]] = {}
+        self.chunk_cache: "OrderedDict[Tuple[int, int], ChunkImage]" = OrderedDict() # LRU, key: chunk
+        
+        # Cached chunks track the hexes whose tiles changed (explored or terrain)
+        # and are recomposited when their fog version moves on
+        self.fog_versions: Dict[Tuple[int, int], int] = {}
+        
+        # Retained canvas state: one item per on-screen chunk, moved as a group
+        self.chunk_items: Dict[Tuple[int, int], int] = {}
+        self.label_items: Dict[int, int] = {} # Key: index into world_map.labels
+        # Label indices by the render chunk of their anchor hex, built for one labels list
+        self.label_index: Dict[Tuple[int, int], List[int]] = {}
+        self.label_margin = 0.0  # How far a label reaches past its anchor hex's chunk
+        self._indexed_labels: Optional[List[MapLabel]] = None
+        self.origin: Optional[Tuple[float, float]] = None # Screen position of hex (0, 0)
+        self.offset: Tuple[float, float] = (0, 0) # Camera offset of the last render
+        self._refresh_job = None
+        self._init_assets(atlas_path)
+        
+        # Forest tiles are loaded from disk if painted before, with the same sprites
+        self.tile_cache = None
+        if tile_cache_dir is not None:
+            sprites = sprite_set_hash(HexPainter.forest_sprite_paths(), HexPainter.FOREST_TILE_VERSION)
+            self.tile_cache = TileDiskCache(tile_cache_dir, f"forest/{world_map.seed}/{self.base_hex_size}/{sprites}",
+                                            TILE_CACHE_MAX_BYTES)
+        # ... otherwise painted by worker processes; a placeholder stands in until they arrive
+        self.tile_pool = None
+        if workers != 0:
+            self.tile_pool = TileWorkerPool(canvas, self.base_hex_size, self._on_tile_ready, workers, self.tile_cache)
+        # Forest tiles along the player's heading are requested ahead of time
+        self.prefetcher = TilePrefetcher(canvas, self._prefetch_tile, self._tile_needed)
+        world_map.subscribe_fog(self._on_fog_delta)
+        world_map.subscribe_terrain(self._on_terrain_change)
     
-    def _init_assets(self):
-        """Load or generate assets"""
-        asset_dir = "assets/hex_tiles"
-        if not os.path.exists(asset_dir):
-            os.makedirs(asset_dir)
-            
-        # Ensure we have base images for all terrains with variants
-        for terrain in TerrainType:
-            for v in range(4): # 0 to 3 variants
-                filename = f"{terrain.display_name}_v{v}.png"
-                path = os.path.join(asset_dir, filename)
-                
-                # key e.g. "mountain_v0"
-                key = f"{terrain.display_name}_v{v}"
-                
-                if not os.path.exists(path):
-                    self._generate_procedural_hex(terrain, path, v)
-                
-                img = Image.open(path).convert("RGBA")
-                self.asset_cache[key] = img
-                self.tk_asset_cache[key] = ImageTk.PhotoImage(img)
-            
-        # Generate Shoreline Overlays (RAM only, fast enough)
-        for i in range(6):
-            self._generate_shoreline_overlay(i)
-            
-        # Decorations placeholder generation (simplified)
-        # In a real scenario, these would be separate files
-        # We can simulate them by drawing on top of copies or new images
-        
-        # Fog
-        fog_path = os.path.join(asset_dir, "fog.png")
-        if not os.path.exists(fog_path):
-            self._generate_fog_placeholder(fog_path)
-        
-        fog_img = Image.open(fog_path).convert("RGBA")
-        self.asset_cache["fog"] = fog_img
-        self.tk_asset_cache["fog"] = ImageTk.PhotoImage(fog_img)
-
-    def _generate_shoreline_overlay(self, edge_index: int):
-        """Generate a transparent overlay with a shoreline on one edge"""
-        width = int(math.sqrt(3) * self.hex_size)
-        height = int(2 * self.hex_size)
-        padding = 80  # Match hex tile padding
-        img_w, img_h = width + padding, height + padding
-        
-        img = Image.new('RGBA', (img_w, img_h), (0, 0, 0, 0))
-        # draw = ImageDraw.Draw(img) # No longer needed for sprite pasting
-        
-        cx, cy = img_w / 2, img_h / 2
-        HexPainter.draw_shoreline_overlay(img, cx, cy, self.hex_size, edge_index)
-        
-        self.shoreline_cache[edge_index] = ImageTk.PhotoImage(img)
-
-    def _generate_procedural_hex(self, terrain: TerrainType, path: str, variant_id: int):
-        """Generate a procedurally painted hex tile"""
-        width = int(math.sqrt(3) * self.hex_size)
-        height = int(2 * self.hex_size)
-        # Increased padding to prevent trees/mountains from being cut off
-        padding = 80  # Large enough for rotated/scaled sprites
-        img_w, img_h = width + padding, height + padding
-        
-        img = Image.new('RGBA', (img_w, img_h), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        cx, cy = img_w / 2, img_h / 2
-        
-        # Base Colors
-        colors = {
-            TerrainType.GRASS: (100, 200, 100, 255),
-            TerrainType.FOREST: (34, 100, 34, 255), # Darker green base
-            TerrainType.MOUNTAIN: (140, 140, 140, 255),
-            TerrainType.WATER: (65, 105, 225, 255),
-            TerrainType.SWAMP: (85, 107, 47, 255),
-            TerrainType.HILLS: (218, 165, 32, 255),
-            TerrainType.DESERT: (237, 201, 175, 255),
-            TerrainType.TOWN: (205, 92, 92, 255),
-            TerrainType.DUNGEON: (75, 0, 130, 255),
-        }
-        fill_col = colors.get(terrain, (255, 255, 255, 255))
-        
-        # 1. Draw Base Hex
-        HexPainter.draw_hex_base(draw, cx, cy, self.hex_size, fill_col)
-        
-        # 2. Draw Features based on terrain
-        seed = f"{terrain.name}_{variant_id}" # Consistent seed for this variant asset
-        
-        if terrain == TerrainType.MOUNTAIN:
-            # Passes 'img' now, not 'draw'
-            HexPainter.draw_mountain_variant(img, cx, cy, self.hex_size, seed)
-        
-        elif terrain == TerrainType.FOREST:
-            # For cached variants, we now only draw the base if we want unique trees later.
-            # But _init_assets generates generic variants v0-v3.
-            # If we switch to unique on-the-fly generation for FOREST, 
-            # we should still generate these as fallbacks or just regular full tiles?
-            # User wants UNIQUE.
-            # Let's keep this as is for fallback, but _draw_hex will ignore it.
-            HexPainter.draw_forest_variant(img, cx, cy, self.hex_size, seed)
-            
-        elif terrain == TerrainType.GRASS:
-            HexPainter.draw_grass_variant(img, cx, cy, self.hex_size, seed)
-            
-        elif terrain == TerrainType.HILLS:
-            # We can reuse mountain painter but fewer/smaller? 
-            # Or just leave hills as flat colored for now
-            pass
-            
-        # Draw Text Label (debug or style)
-        # try:
-        #    draw.text((cx - 20, cy - 10), f"{terrain.display_name[:3]}", fill=(0,0,0,128))
-        # except:
-        #    pass
-            
-        img.save(path)
+    def _init_assets(self, atlas_path: Optional[str]):
+        """Load the packed assets, building them first if missing or stale"""
+        atlas = load_asset_atlas(self.base_hex_size, atlas_path)
+        HexPainter.use_atlas(atlas)  # Sprites and forest bases too, inherited by tile workers
+        self.asset_cache = atlas
+        self.tile_size = atlas["fog"].size  # Every tile and overlay is padded to this size
 
-    def _load_forest_base_image(self, index: int) -> Image.Image:
-        if index in self.forest_base_cache:
-            return self.forest_base_cache[index]
+    # --- Chunks ---
 
-        asset_dir = "assets/hex_tiles"
-        path = os.path.join(asset_dir, f"forest_base_{index}.png")
+    def chunk_of(self, q: int, r: int) -> Tuple[int, int]:
+        """Render chunk of a hex; chunks are rectangles of offset coordinates (odd rows shifted right)"""
+        col = q + (r - (r & 1)) // 2
+        return col // self.chunk_span, r // self.chunk_span
 
-        if os.path.exists(path):
-            img = Image.open(path).convert("RGBA")
-        else:
-            # Fallback: generate a simple green base if the file is missing
-            width = int(math.sqrt(3) * self.hex_size)
-            height = int(2 * self.hex_size)
-            padding = 80
-            img_w, img_h = width + padding, height + padding
-            img = Image.new("RGBA", (img_w, img_h), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            cx, cy = img_w / 2, img_h / 2
-            HexPainter.draw_hex_base(draw, cx, cy, self.hex_size, (34, 100, 34, 255))
-
-        self.forest_base_cache[index] = img
-        return img
+    def _chunk_hexes(self, key: Tuple[int, int], border: int = 0) -> List[Tuple[int, int]]:
+        """(q, r) of a chunk's hexes, grown by `border` rows and columns, in paint order"""
+        n = self.chunk_span
+        c0, r0 = key[0] * n - border, key[1] * n - border
+        # Rows top-to-bottom, each row right-to-left, so a tile's trees overlap
+        # its neighbor to the right and the row above
+        return [(col - (r - (r & 1)) // 2, r)
+                for r in range(r0, r0 + n + 2 * border)
+                for col in range(c0 + n + 2 * border - 1, c0 - 1, -1)]
 
-    def _generate_unique_forest_tile(self, hex_tile: HexTile) -> ImageTk.PhotoImage:
-        """Generate a unique forest tile on the fly"""
-        width = int(math.sqrt(3) * self.hex_size)
-        height = int(2 * self.hex_size)
-        padding = 80
-        img_w, img_h = width + padding, height + padding
+    def _chunk_bounds(self, key: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        """World pixel (x, y, width, height) covering a chunk's hexes"""
+        n = self.chunk_span
+        hex_w = SQRT3 * self.hex_size
+        x0 = math.floor(hex_w * (key[0] * n - 0.5))
+        y0 = math.floor(1.5 * self.hex_size * key[1] * n - self.hex_size)
+        x1 = math.ceil(hex_w * (key[0] * n + n))
+        y1 = math.ceil(1.5 * self.hex_size * (key[1] * n + n - 1) + self.hex_size)
+        return x0, y0, x1 - x0, y1 - y0
 
-        img = Image.new("RGBA", (img_w, img_h), (0, 0, 0, 0))
-        cx, cy = img_w / 2, img_h / 2
+    def _tiles_changed(self, hexes):
+        """Queue repaints of the cached chunks each hex's tile reaches into"""
+        # Tile sprites reach at most one hex past their own
+        for q, r in hexes:
+            keys = {self.chunk_of(q, r)}
+            keys.update(self.chunk_of(nq, nr) for nq, nr in hex_math.neighbors(q, r))
+            for key in keys:
+                chunk = self.chunk_cache.get(key)
+                if chunk is not None and chunk.terrain is not None:
+                    chunk.dirty.add((q, r))
 
-        # Deterministic seed unique to this hex
-        seed = (hex_tile.q * 73856093) ^ (hex_tile.r * 19349663)
-        rng = random.Random(seed)
+    def _on_fog_delta(self, delta: FogDelta):
+        self._tiles_changed(delta.explored)
+        # The shroud only covers the hex itself
+        for key in {self.chunk_of(q, r) for q, r in delta.visible | delta.hidden}:
+            self.fog_versions[key] = self.fog_versions.get(key, 0) + 1
 
-        # 1. Choose a random forest base (1-6) and rotate it
-        base_index = rng.randint(1, 6)
-        base_img = self._load_forest_base_image(base_index).copy()
-        rotation = rng.choice([0, 60, 120, 180, 240, 300])
-        if rotation:
-            base_img = base_img.rotate(rotation, expand=True, resample=Image.BICUBIC)
+    def _on_terrain_change(self, q: int, r: int, old: TerrainType, new: TerrainType):
+        # Neighboring water redraws its shorelines
+        self._tiles_changed([(q, r)] + hex_math.neighbors(q, r))
 
-        bw, bh = base_img.size
-        left = int(cx - bw / 2)
-        top = int(cy - bh / 2)
-        img.paste(base_img, (left, top), base_img)
+    def _paint_tiles(self, dest: Image.Image, hexes: List[Tuple[int, int]], x0: int, y0: int):
+        """Composite the hexes' layers, in the given order, onto dest whose corner is world pixel (x0, y0)"""
+        for q, r in hexes:
+            hex_tile = self.world_map.get_hex_at(q, r)
+            if hex_tile:
+                px, py = hex_tile.get_pixel_coords(self.hex_size)
+                for layer in self._hex_layers(hex_tile):
+                    _paste_centered(dest, layer, px - x0, py - y0)
 
-        # 2. Draw Unique Trees seeded by coordinates
-        tree_seed = seed ^ 0xA5A5A5A5
-        HexPainter.draw_forest_variant(img, cx, cy, self.hex_size, tree_seed)
+    def _repaint_tile(self, chunk: ChunkImage, key: Tuple[int, int], q: int, r: int):
+        """Repaint the part of a chunk's terrain layer under one hex's tile"""
+        tw, th = self.tile_size
+        px, py = hex_math.axial_to_pixel(q, r, self.hex_size)
+        left = max(0, math.floor(px - tw / 2 + 0.5) - chunk.x)
+        top = max(0, math.floor(py - th / 2 + 0.5) - chunk.y)
+        right = min(chunk.width, math.floor(px - tw / 2 + 0.5) - chunk.x + tw)
+        bottom = min(chunk.height, math.floor(py - th / 2 + 0.5) - chunk.y + th)
+        if left >= right or top >= bottom:
+            return
+        # Every tile overlapping this one, still in paint order
+        hexes = [(hq, hr) for hq, hr in self._chunk_hexes(key, border=1)
+                 if abs(hex_math.axial_to_pixel(hq, hr, self.hex_size)[0] - px) < tw
+                 and abs(1.5 * self.hex_size * hr - py) < th]
+        region = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+        self._paint_tiles(region, hexes, chunk.x + left, chunk.y + top)
+        chunk.terrain.paste(region, (left, top))
 
-        return ImageTk.PhotoImage(img)
+    def _chunk_image(self, key: Tuple[int, int]) -> ChunkImage:
+        """The chunk's composited image, repainting whatever is out of date"""
+        chunk = self.chunk_cache.get(key)
+        if chunk is None:
+            chunk = ChunkImage(*self._chunk_bounds(key))
+            self.chunk_cache[key] = chunk
+        self.chunk_cache.move_to_end(key)
+        if chunk.empty:
+            return chunk
+        
+        fog_version = self.fog_versions.get(key, 0)
+        if chunk.terrain is not None and not chunk.dirty and chunk.fog_version == fog_version:
+            return chunk
+        if self.zoom >= FLAT_ZOOM_LEVEL:
+            return self._raster_chunk(chunk, key, fog_version)
+        
+        if chunk.mask is None:
+            chunk.mask = Image.new("L", (chunk.width, chunk.height), 0)
+            draw = ImageDraw.Draw(chunk.mask)
+            for q, r in self._chunk_hexes(key):
+                if self.world_map.get_hex_at(q, r):
+                    px, py = hex_math.axial_to_pixel(q, r, self.hex_size)
+                    draw.polygon(hex_math.hex_corners(px - chunk.x, py - chunk.y, self.hex_size), fill=255)
+            if not chunk.mask.getbbox():
+                chunk.empty = True
+                chunk.mask = None
+                return chunk
+        
+        if chunk.terrain is None or len(chunk.dirty) > self.chunk_span ** 2 // 2:
+            chunk.terrain = Image.new("RGBA", (chunk.width, chunk.height), (0, 0, 0, 0))
+            self._paint_tiles(chunk.terrain, self._chunk_hexes(key, border=1), chunk.x, chunk.y)
+        else:
+            for q, r in chunk.dirty:
+                self._repaint_tile(chunk, key, q, r)
+        chunk.dirty.clear()
+        
+        # The shroud goes over the terrain of the chunk's own hexes, then
+        # everything is clipped to those hexes so neighboring chunks never overlap
+        img = chunk.terrain.copy()
+        shroud = self._scaled("shroud")
+        for q, r in self._chunk_hexes(key):
+            hex_tile = self.world_map.get_hex_at(q, r)
+            if hex_tile and hex_tile.is_explored and not hex_tile.is_visible:
+                px, py = hex_tile.get_pixel_coords(self.hex_size)
+                _paste_centered(img, shroud, px - chunk.x, py - chunk.y)
+        img.putalpha(ImageChops.multiply(img.getchannel("A"), chunk.mask))
+        if chunk.photo is None:
+            chunk.photo = ImageTk.PhotoImage(img)
+        else:
+            chunk.photo.paste(img)  # In place: canvas items showing it update too
+        chunk.fog_version = fog_version
+        self._evict_chunks(key)
+        return chunk
 
-    def _generate_fog_placeholder(self, path: str):
-        width = int(math.sqrt(3) * self.hex_size)
-        height = int(2 * self.hex_size)
-        padding = 80  # Match the hex tile padding
-        img = Image.new('RGBA', (width + padding, height + padding), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        cx, cy = (width + padding) / 2, (height + padding) / 2
-        
-        # Draw hex with same radius as terrain, filled completely with fog
-        points = []
-        for i in range(6):
-            angle_deg = 60 * i - 30
-            angle_rad = math.radians(angle_deg)
-            x = cx + self.hex_size * math.cos(angle_rad)
-            y = cy + self.hex_size * math.sin(angle_rad)
-            points.append((x, y))
-            
-        draw.polygon(points, fill=(20, 20, 20, 255), outline=(0, 0, 0, 255))
-        img.save(path)
+    def _evict_chunks(self, key: Tuple[int, int]):
+        """Forget the least recently shown chunks that are off-screen"""
+        for old in list(self.chunk_cache):
+            if len(self.chunk_cache) <= CHUNK_IMAGE_CACHE_SIZE:
+                break
+            if old not in self.chunk_items and old != key:
+                del self.chunk_cache[old]
+
+    def _raster_chunk(self, chunk: ChunkImage, key: Tuple[int, int], fog_version: int) -> ChunkImage:
+        """Flat zoom levels: color every pixel by its hex's terrain and fog, straight from the map arrays"""
+        if chunk.cells is None:
+            # Which hex each pixel center falls in; fixed for the chunk's lifetime
+            xs = np.arange(chunk.x, chunk.x + chunk.width) + 0.5
+            ys = np.arange(chunk.y, chunk.y + chunk.height) + 0.5
+            px, py = np.meshgrid(xs, ys)
+            qs, rs = hex_math.pixel_to_hex_batch(px.ravel(), py.ravel(), self.hex_size)
+            # Number the hexes of the axial bounding box (cheaper than finding the distinct ones)
+            q0, r0 = qs.min(), rs.min()
+            span = int(rs.max() - r0) + 1
+            cells = np.arange((int(qs.max() - q0) + 1) * span)
+            inverse = ((qs - q0) * span + (rs - r0)).reshape(chunk.height, chunk.width)
+            chunk.cells = (cells // span + q0, cells % span + r0, inverse)
+        
+        qs, rs, inverse = chunk.cells
+        codes, flags = self.world_map.cells_batch(qs, rs)
+        if not (flags & FLAG_VALID).any():
+            chunk.empty = True
+            chunk.cells = None
+            return chunk
+        
+        colors = np.zeros((len(qs), 4), dtype=np.uint8)
+        colors[:, :3] = TERRAIN_PALETTE[codes]
+        colors[:, 3] = 255
+        fog_img = self.asset_cache["fog"]
+        fog = np.array(fog_img.getpixel((fog_img.width // 2, fog_img.height // 2)), dtype=np.float32)
+        explored = (flags & FLAG_EXPLORED) != 0
+        shrouded = explored & ((flags & FLAG_VISIBLE) == 0)
+        a = SHROUD_FOG_ALPHA / 255
+        colors[shrouded] = (colors[shrouded] * (1 - a) + fog * a).astype(np.uint8)
+        colors[~explored] = fog.astype(np.uint8)
+        colors[(flags & FLAG_VALID) == 0] = 0
+        
+        # Gather whole pixels as uint32, much faster than rows of four bytes
+        pixels = colors.view(np.uint32)[:, 0][inverse]
+        img = Image.frombuffer("RGBA", (chunk.width, chunk.height), pixels, "raw", "RGBA", 0, 1)
+        chunk.terrain = img
+        chunk.dirty.clear()
+        if chunk.photo is None:
+            chunk.photo = ImageTk.PhotoImage(img)
+        else:
+            chunk.photo.paste(img)
+        chunk.fog_version = fog_version
+        self._evict_chunks(key)
+        return chunk
+
+    def _chunks_in_view(self, width: int, height: int,
+                        origin: Optional[Tuple[float, float]] = None) -> Set[Tuple[int, int]]:
+        """Chunks overlapping the canvas (scrolled to `origin` if given)"""
+        n = self.chunk_span
+        hex_w = SQRT3 * self.hex_size
+        row_h = 1.5 * self.hex_size
+        ox, oy = origin or self.origin
+        min_x, max_x = -ox, width - ox
+        min_y, max_y = -oy, height - oy
+        cols = range(math.floor(min_x / hex_w / n), math.floor((max_x / hex_w + 0.5) / n) + 1)
+        rows = range(math.floor((min_y - self.hex_size) / row_h / n),
+                     math.floor((max_y + self.hex_size) / row_h / n) + 1)
+        found = set()
+        for cr in rows:
+            for cc in cols:
+                x, y, w, h = self._chunk_bounds((cc, cr))
+                if x < max_x and x + w > min_x and y < max_y and y + h > min_y:
+                    found.add((cc, cr))
+        return found
 
     def render_all(self, offset_x=0, offset_y=0):
-        """Render the map to the canvas with viewport culling"""
-        self.canvas.delete("all")
-        self.tk_images.clear() # Clear reference cache
-        
+        """
+        Bring the canvas up to date with the viewport.
+        The map is one image item per on-screen chunk: panning is a single
+        canvas.move, and a chunk is only recomposited when a hex in or next
+        to it changes fog or terrain.
+        """
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
-        canvas_center_x = canvas_width / 2
-        canvas_center_y = canvas_height / 2
-        
-        # Calculate viewing rectangle in world pixel coordinates relative to map center
-        # padding of 200px to ensure huge assets overlap correctly
-        view_min_x = -canvas_center_x - offset_x - 200
-        view_max_x = canvas_center_x - offset_x + canvas_width + 200
-        view_min_y = -canvas_center_y - offset_y - 200
-        view_max_y = canvas_center_y - offset_y + canvas_height + 200
-        
-        # Convert bounding box corners to axial coordinates to find Q/R range
-        # Corners: (min_x, min_y), (max_x, min_y), (max_x, max_y), (min_x, max_y)
-        corners = [
-            (view_min_x, view_min_y),
-            (view_max_x, view_min_y),
-            (view_max_x, view_max_y),
-            (view_min_x, view_max_y)
-        ]
-        
-        qs = []
-        rs = []
-        
-        for x, y in corners:
-            # Axial conversion:
-            # q = (sqrt(3)/3 * x - 1/3 * y) / size
-            # r = (2/3 * y) / size
-            q = (math.sqrt(3)/3 * x - 1.0/3 * y) / self.hex_size
-            r = (2.0/3 * y) / self.hex_size
-            qs.append(q)
-            rs.append(r)
-            
-        q_start = int(min(qs)) - 1
-        q_end = int(max(qs)) + 1
-        r_start = int(min(rs)) - 1
-        r_end = int(max(rs)) + 1
-        
-        # Collect visible hexes
-        visible_hexes = []
-        
-        for r in range(r_start, r_end + 1):
-            for q in range(q_start, q_end + 1):
-                hex_tile = self.world_map.get_hex_at(q, r)
-                if hex_tile:
-                    visible_hexes.append(hex_tile)
-        
-        # Sort by depth (r, then -q) to handle occlusion correctly
-        # We process rows top-to-bottom (increasing r)
-        # But within a row, we draw Right-to-Left (decreasing q) so that
-        # the Left tile (drawn last) overlaps the Right tile.
-        # This prevents the Right tile's base from cutting off the Left tile's trees.
-        sorted_hexes = sorted(visible_hexes, key=lambda h: (h.r, -h.q))
-        
-        for hex_tile in sorted_hexes:
-            px, py = hex_tile.get_pixel_coords(self.hex_size)
-            screen_x = canvas_center_x + px + offset_x
-            screen_y = canvas_center_y + py + offset_y
-            
-            self._draw_hex(hex_tile, screen_x, screen_y)
-            
-        # 4. Render Labels (Overlays)
-        self._render_labels(offset_x, offset_y, canvas_width, canvas_height)
-
-    def _pixel_to_axial(self, x: float, y: float) -> Tuple[int, int]:
-        """Convert pixel coordinates to axial hex coordinates"""
-        q = (math.sqrt(3)/3 * x - 1/3 * y) / self.hex_size
-        r = (2/3 * y) / self.hex_size
-        return self._round_axial(q, r)
-    
-    def _round_axial(self, q: float, r: float) -> Tuple[int, int]:
-        """Round fractional axial coordinates to nearest hex"""
-        xgrid = q
-        zgrid = r
-        ygrid = -q - r
-        
-        rx = round(xgrid)
-        ry = round(ygrid)
-        rz = round(zgrid)
-        
-        x_diff = abs(rx - xgrid)
-        y_diff = abs(ry - ygrid)
-        z_diff = abs(rz - zgrid)
-        
-        if x_diff > y_diff and x_diff > z_diff:
-            rx = -ry - rz
-        elif y_diff > z_diff:
-            ry = -rx - rz
-        else:
-            rz = -rx - ry
-            
-        return int(rx), int(rz)
+        self.offset = (offset_x, offset_y)
+        origin = (canvas_width / 2 + offset_x, canvas_height / 2 + offset_y)
+        if self.origin is not None and origin != self.origin:
+            self.canvas.move("map", origin[0] - self.origin[0], origin[1] - self.origin[1])
+        self.origin = origin
+        
+        in_view = self._chunks_in_view(canvas_width, canvas_height)
+        for key in self.chunk_items.keys() - in_view:
+            self.canvas.delete(self.chunk_items.pop(key))
+        for key in in_view:
+            chunk = self._chunk_image(key)
+            if chunk.photo is not None and key not in self.chunk_items:
+                self.chunk_items[key] = self.canvas.create_image(
+                    origin[0] + chunk.x, origin[1] + chunk.y, image=chunk.photo, anchor="nw", tags="map")
+        
+        # Labels (Overlays)
+        self._render_labels(canvas_width, canvas_height)
+        
+        self._prefetch(canvas_width, canvas_height)
 
-    def _render_labels(self, offset_x, offset_y, width, height):
-        canvas_center_x = width / 2
-        canvas_center_y = height / 2
-        
-        # Simple bounds check for labels
-        # Labels are centered at mx, my (world coords)
-        # Screen x = center_x + mx + offset_x
+    def _prefetch(self, width: int, height: int):
+        """Queue the forest tiles the next few moves will draw"""
+        if self.zoom >= FLAT_ZOOM_LEVEL:
+            return  # No tiles drawn
+        cx, cy = width / 2 - self.origin[0], height / 2 - self.origin[1]
+        self.prefetcher.observe(*hex_math.pixel_to_hex(cx, cy, self.hex_size))
+        centers = self.prefetcher.predicted_centers()
+        if not centers:
+            return
         
-        for label in self.world_map.labels:
-            screen_x = canvas_center_x + label.x + offset_x
-            screen_y = canvas_center_y + label.y + offset_y
-            
-            # Loose culling
-            if -200 < screen_x < width + 200 and -200 < screen_y < height + 200:
-                # Check if the hex at label's world position is visible (fog of war)
-                hex_q, hex_r = self._pixel_to_axial(label.x, label.y)
-                hex_tile = self.world_map.get_hex_at(hex_q, hex_r)
-                
-                # Only render label if the hex is visible (not hidden by fog)
-                if hex_tile and hex_tile.is_visible:
-                    self._draw_label_text(label, screen_x, screen_y)
-
-    def _draw_label_text(self, label: MapLabel, x: float, y: float):
-        # We need to draw rotated text. Canvas doesn't support it natively well.
-        # We use PIL to create a text image, rotate it, and stamp it.
-        
-        # Check cache
-        cache_key = f"{label.text}_{label.angle}"
-        if cache_key in self.label_cache:
-            tk_img = self.label_cache[cache_key]
-        else:
-            # Create image for text
-            # Guess size
-            font_size = 24
-            # We don't have a reliable way to get text size without a font object context, 
-            # but we can overestimate.
-            # 20 chars * 15px width ~= 300px
-            w, h = 600, 100
-            
-            # Create transparent image
-            txt_img = Image.new('RGBA', (w, h), (0,0,0,0))
-            draw = ImageDraw.Draw(txt_img)
-            
-            # Load font if available, else default
-            try:
-                # Try strict path for Windows or generic name
-                font = ImageFont.truetype("arial.ttf", font_size)
-            except IOError:
-                try:
-                    font = ImageFont.truetype("C:\\Windows\\Fonts\\Arial.ttf", font_size)
-                except:
-                    font = ImageFont.load_default()
-            
-            # Draw text in center
-            # New Pillow versions use specific text bbox
-            try:
-                bbox = draw.textbbox((0, 0), label.text, font=font)
-                text_w = bbox[2] - bbox[0]
-                text_h = bbox[3] - bbox[1]
-            except:
-                # Fallback for old Pillow
-                try:
-                    text_w, text_h = draw.textsize(label.text, font=font)
-                except:
-                     text_w, text_h = 200, 30 # absolute fallback
-            
-            # High contrast text for visibility
-            # Stroke: Black, Fill: White/Gold
-            draw.text(((w - text_w)/2, (h - text_h)/2), label.text, font=font, fill=(255, 255, 240, 255), stroke_width=3, stroke_fill=(0, 0, 0, 255))
-            
-            # Rotate
-            # PIL rotates counter-clockwise. Our angle is math atan2 (standard math).
-            # If angle is 30 deg (pointing SE), we want text to follow that line.
-            # rotate takes degrees.
-            rot_img = txt_img.rotate(-label.angle, expand=True, resample=Image.BICUBIC)
-            
-            tk_img = ImageTk.PhotoImage(rot_img)
-            self.label_cache[cache_key] = tk_img
-            
-        self.tk_images[f"lbl_{x}_{y}"] = tk_img # Keep reference
-        # Ensure label is drawn on top of everything
-        self.canvas.create_image(x, y, image=tk_img, tags="label")
-        self.canvas.tag_raise("label")
-
-    def _draw_hex(self, hex_tile: HexTile, x: float, y: float):
-        # 3. Fog
-        # If the tile is not explored, ONLY draw the fog and return
-        if not hex_tile.is_explored:
-            tk_fog = self.tk_asset_cache.get("fog")
-            if tk_fog:
-                self.canvas.create_image(x, y, image=tk_fog, tags="fog")
+        # Hexes about to come into sight, nearest first, whether explored yet or not
+        wanted = [h for q, r in centers for h in hex_math.spiral(q, r, SIGHT_RADIUS + 1)]
+        # Explored hexes of the chunks the view is scrolling towards
+        px, py = hex_math.axial_to_pixel(*centers[-1], self.hex_size)
+        ahead = self._chunks_in_view(width, height, (self.origin[0] - (px - cx), self.origin[1] - (py - cy)))
+        edge = [h for key in ahead - self.chunk_items.keys() for h in self._chunk_hexes(key, border=1)]
+        
+        hexes = []
+        for (q, r), must_be_explored in [(h, False) for h in wanted] + [(h, True) for h in edge]:
+            if (q, r) in self.unique_hex_cache:
+                continue
+            hex_tile = self.world_map.get_hex_at(q, r)
+            if (hex_tile and hex_tile.terrain == TerrainType.FOREST
+                    and (hex_tile.is_explored or not must_be_explored)):
+                hexes.append((q, r))
+        self.prefetcher.request(hexes)
+
+    def _tile_needed(self, q: int, r: int) -> bool:
+        return (q, r) not in self.unique_hex_cache and not (self.tile_pool and self.tile_pool.is_pending(q, r))
+
+    def _prefetch_tile(self, q: int, r: int):
+        if self._load_forest_tile(q, r) is not None:
             return
+        if self.tile_pool is not None:
+            self.tile_pool.submit(q, r)
+        else:
+            self._paint_forest_tile(q, r)
 
-        # 1. Terrain Base
-        tk_img = None
+    def _on_tile_ready(self, q: int, r: int, img: Image.Image):
+        """A worker finished a forest tile: swap it in for the placeholder on the next refresh"""
+        self._cache_forest_tile(q, r, img)
+        hex_tile = self.world_map.get_hex_at(q, r)
+        if hex_tile and hex_tile.is_explored:
+            self._tiles_changed([(q, r)])
+            if self._refresh_job is None:
+                self._refresh_job = self.canvas.after_idle(self.refresh)
+
+    def set_zoom(self, level: int) -> bool:
+        """
+        Switch to a zoom level (clamped to ZOOM_SCALES); returns False if it is already current.
+        The caller re-renders, with camera offsets in the new level's pixels.
+        """
+        level = max(0, min(level, len(ZOOM_SCALES) - 1))
+        if level == self.zoom:
+            return False
+        self.zoom = level
+        self.hex_size = self.base_hex_size / ZOOM_SCALES[level]
+        # Chunks span more hexes as they shrink, keeping about the same size on screen
+        self.chunk_span = RENDER_CHUNK_SIZE * ZOOM_SCALES[level]
+        self.tile_size = self._scaled("fog").size
+        
+        # Chunk keys and every composited pixel change with the scale
+        self.canvas.delete("map")
+        self.chunk_items.clear()
+        self.label_items.clear()
+        self.chunk_cache.clear()
+        self.fog_versions.clear()
+        self._index_labels()
+        self.origin = None
+        self.prefetcher.cancel()
+        return True
+
+    def refresh(self):
+        """Redraw with the last camera offset"""
+        self._refresh_job = None
+        self.render_all(*self.offset)
+
+    def close(self):
+        """Stop background work (the worker processes and idle callbacks)"""
+        self.prefetcher.cancel()
+        if self._refresh_job is not None:
+            self.canvas.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        if self.tile_pool is not None:
+            self.tile_pool.close()
+            self.tile_pool = None
+
+    def _index_labels(self):
+        """
+        Bucket the map's labels by chunk so culling only looks at those near the view.
+        Zoomed out, labels keep their size while the map shrinks, so placement is
+        rerun at the level's scale: the labels that would collide are left out.
+        """
+        labels = self.world_map.labels
+        self.label_index = {}
+        self.label_margin = 0.0
+        shown = range(len(labels))
+        if self.zoom > 0:
+            scale = 1 / ZOOM_SCALES[self.zoom]
+            placer = LabelPlacer()
+            shown = []
+            for index in sorted(range(len(labels)), key=lambda i: -labels[i].priority):
+                label = labels[index]
+                if placer.try_place(LabelCandidate(label.x * scale, label.y * scale, label.angle,
+                                                   label.priority, label.text)):
+                    shown.append(index)
+        for index in shown:
+            label = labels[index]
+            self.label_index.setdefault(self.chunk_of(*label.anchor), []).append(index)
+            self._extend_label_margin(label)
+        self._indexed_labels = labels
+
+    @staticmethod
+    def _label_extent(label: MapLabel) -> Tuple[float, float, float, float]:
+        """(width, height, dx, dy) of a label's sprite, estimated from its text until it is rendered"""
+        if label.sprite is not None:
+            return (*label.sprite.size, *label.sprite_offset)
+        w, h = estimate_text_size(label.text)
+        a = math.radians(label.angle)
+        cos, sin = abs(math.cos(a)), abs(math.sin(a))
+        return w * cos + h * sin, w * sin + h * cos, 0.0, 0.0
+
+    def _extend_label_margin(self, label: MapLabel):
+        # The label's position lies within its anchor hex
+        w, h, dx, dy = self._label_extent(label)
+        self.label_margin = max(self.label_margin, max(w, h) / 2 + max(abs(dx), abs(dy)) + self.hex_size)
+
+    def _label_sprite(self, label: MapLabel) -> Image.Image:
+        """A label's sprite, rendered the first time it is shown and kept on the label"""
+        if label.sprite is None:
+            label.sprite, label.sprite_offset = render_label(label.text, label.angle)
+            self._extend_label_margin(label)
+        return label.sprite
+
+    def _label_bounds(self, label: MapLabel) -> Tuple[float, float, float, float]:
+        """Screen (left, top, right, bottom) of a label's sprite (estimated until it is rendered)"""
+        scale = 1 / ZOOM_SCALES[self.zoom]
+        w, h, dx, dy = self._label_extent(label)
+        cx = self.origin[0] + label.x * scale + dx
+        cy = self.origin[1] + label.y * scale + dy
+        return cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2
+
+    def _render_labels(self, width, height):
+        """Create labels coming on screen once their hex is explored; delete those leaving"""
+        labels = self.world_map.labels
+        if self._indexed_labels is not labels:
+            for item in self.label_items.values():
+                self.canvas.delete(item)
+            self.label_items.clear()
+            self.label_cache.clear()
+            self._index_labels()
+        
+        def on_screen(label):
+            left, top, right, bottom = self._label_bounds(label)
+            return right > 0 and left < width and bottom > 0 and top < height
+        
+        for index in [i for i in self.label_items if not on_screen(labels[i])]:
+            self.canvas.delete(self.label_items.pop(index))
+        
+        # Only the chunks around the view can hold labels reaching into it
+        m = self.label_margin
+        for key in self._chunks_in_view(width + 2 * m, height + 2 * m, (self.origin[0] + m, self.origin[1] + m)):
+            for index in self.label_index.get(key, ()):
+                label = labels[index]
+                if index in self.label_items or not on_screen(label):
+                    continue
+                # Only render label if the hex is known (shrouded hexes keep their names)
+                hex_tile = self.world_map.get_hex_at(*label.anchor)
+                if hex_tile and hex_tile.is_explored:
+                    self.label_items[index] = self._draw_label(index, label)
+        
+        # Ensure labels are drawn on top of everything, including newly placed hexes
+        if self.label_items:
+            self.canvas.tag_raise("label")
+
+    def _draw_label(self, index: int, label: MapLabel) -> int:
+        """Canvas item showing a label's sprite, rendering it on first use"""
+        tk_img = self.label_cache.get(index)
+        if tk_img is None:
+            tk_img = self.label_cache[index] = ImageTk.PhotoImage(self._label_sprite(label))
+        # label_cache keeps the image alive for as long as the item shows it
+        left, top, _, _ = self._label_bounds(label)
+        return self.canvas.create_image(left, top, image=tk_img, anchor="nw", tags=("map", "label"))
+
+    def _cache_forest_tile(self, q: int, r: int, img: Image.Image):
+        # Simple cache management - loose limit
+        if len(self.unique_hex_cache) > 2000:
+            self.unique_hex_cache.clear()
+        self.unique_hex_cache[(q, r)] = img
+
+    def _load_forest_tile(self, q: int, r: int) -> Optional[Image.Image]:
+        """A forest tile from memory or the disk cache, if it was painted before"""
+        img = self.unique_hex_cache.get((q, r))
+        if img is None and self.tile_cache is not None:
+            img = self.tile_cache.load(q, r)
+            if img is not None:
+                self._cache_forest_tile(q, r, img)
+        return img
+
+    def _paint_forest_tile(self, q: int, r: int) -> Image.Image:
+        img = HexPainter.paint_forest_tile(q, r, self.base_hex_size)
+        self._cache_forest_tile(q, r, img)
+        if self.tile_cache is not None:
+            self.tile_cache.store(q, r, img)
+        return img
+
+    def _forest_tile(self, hex_tile: HexTile) -> Image.Image:
+        """The hex's unique forest tile, or the shared variant while a worker paints it"""
+        img = self._load_forest_tile(hex_tile.q, hex_tile.r)
+        if img is not None:
+            return self._scaled((hex_tile.q, hex_tile.r), img)
+        if self.tile_pool is not None:
+            self.tile_pool.submit(hex_tile.q, hex_tile.r, urgent=True)
+            return self._scaled(f"forest_v{hex_tile.variant_id}")
+        # Generate on the fly
+        return self._scaled((hex_tile.q, hex_tile.r), self._paint_forest_tile(hex_tile.q, hex_tile.r))
+
+    def _scaled(self, key, img: Optional[Image.Image] = None, level: Optional[int] = None) -> Image.Image:
+        """
+        A tile at a zoom level's scale (the current one by default): each level
+        halves the one above it, so the levels form a mipmap pyramid.
+        key is an asset name (img defaults to that asset) or the (q, r) of a unique tile.
+        """
+        if img is None:
+            img = self.asset_cache[key]
+        level = self.zoom if level is None else level
+        if level == 0:
+            return img
+        cached = self.mip_cache.get((key, level))
+        if cached is not None and cached[0] is img:
+            return cached[1]
+        if len(self.mip_cache) > MIP_CACHE_SIZE:
+            self.mip_cache.clear()
+        mip = self._scaled(key, img, level - 1).reduce(2)
+        self.mip_cache[(key, level)] = (img, mip)
+        return mip
+
+    def _hex_layers(self, hex_tile: HexTile) -> List[Image.Image]:
+        """Images making up a hex (terrain, then shorelines), bottom to top"""
+        # If the tile is not explored, ONLY draw the fog
+        if not hex_tile.is_explored:
+            return [self._scaled("fog")]
         
+        # 1. Terrain Base
         # If FOREST, use unique generated tile
         if hex_tile.terrain == TerrainType.FOREST:
-            tile_key = (hex_tile.q, hex_tile.r)
-            if tile_key in self.unique_hex_cache:
-                tk_img = self.unique_hex_cache[tile_key]
-            else:
-                # Generate on the fly
-                tk_img = self._generate_unique_forest_tile(hex_tile)
-                # Simple cache management - loose limit
-                if len(self.unique_hex_cache) > 2000:
-                    self.unique_hex_cache.clear()
-                self.unique_hex_cache[tile_key] = tk_img
-        
-        # Standard variant lookup for other terrains (or fallback)
-        if not tk_img:
-            # Use variant ID
-            key = f"{hex_tile.terrain.display_name}_v{hex_tile.variant_id}"
-            tk_img = self.tk_asset_cache.get(key)
-            
-            # Fallback to v0 if specific variant missing (safety)
-            if not tk_img:
-                tk_img = self.tk_asset_cache.get(f"{hex_tile.terrain.display_name}_v0")
-            
-        if tk_img:
-            self.canvas.create_image(x, y, image=tk_img, tags=f"hex_{hex_tile.q}_{hex_tile.r}")
-
-        # 1.5 Shoreline Overlays
+            img = self._forest_tile(hex_tile)
+        else:
+            # Use variant ID, falling back to v0 if the variant is missing (safety)
+            name = f"{hex_tile.terrain.display_name}_v{hex_tile.variant_id}"
+            if name not in self.asset_cache:
+                name = f"{hex_tile.terrain.display_name}_v0"
+            img = self._scaled(name) if name in self.asset_cache else None
+        layers = [img] if img else []
+        
+        # 2. Shoreline Overlays
         # If this tile is WATER, check neighbors for Land
         if hex_tile.terrain == TerrainType.WATER:
-            neighbors = self.world_map._get_neighbors(hex_tile.q, hex_tile.r)
-            # We need strictly ordered directions 0..5
-            # _get_neighbors returns list, but directions are fixed order in the method:
-            # [(1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1)]
-            # 0: (+1, 0) -> Right (0 deg? No.)
-            #
-            # Let's re-verify angles. 
-            # Flat top vs Pointy top.
-            # HexPainter assumes: 60*i - 30.
-            # i=0: -30 (Top Right).
-            # i=1: 30 (Bottom Right).
-            # i=2: 90 (Bottom).
-            # i=3: 150 (Bottom Left).
-            # i=4: 210 (Top Left).
-            # i=5: 270 (Top).
-            
-            # Axial Neighbors (Pointy Top):
-            # (+1, -1): Top Right
-            # (+1, 0): Right (Wait, +1 q means move right-ish)
-            
-            # Let's trust logic mapping:
-            # i=0 (Top Right): q+1, r-1
-            # i=1 (Right): q+1, r (Actually this is 30deg?)
-            # 
-            # Standard Pointy Top Axial directions starting from 0 deg (Right) going clockwise?
-            # Convention usually:
-            # Direction 0: (+1, 0)
-            # Direction 1: (+1, -1) --- Wait, +1, -1 is Top Right
-            # Direction 2: (0, -1) --- Top Left
-            # Direction 3: (-1, 0) --- Left
-            # Direction 4: (-1, 1) --- Bottom Left
-            # Direction 5: (0, 1) --- Bottom Right
-            
-            # _get_neighbors lists them as:
-            # (1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1)
-            # If HexPainter expects i=0 to be Top Right (-30 deg)...
-            # Top Right in axial is (+1, -1). That is index 1 in _get_neighbors.
-            
-            # Let's map explicitly to be safe.
-            # HexPainter Vertices:
-            # 0: -30 deg (Top Right)
-            # 1: 30 deg (Bottom Right)
-            # 2: 90 deg (Bottom)
-            # 3: 150 deg (Bottom Left)
-            # 4: 210 deg (Top Left)
-            # 5: 270 deg (Top)
-            
-            # Axial Neighbors for those directions:
-            # Top Right: (+1, -1)
-            # Bottom Right: (0, +1)
-            # Bottom: ... wait. Pointy top hexes don't have a "Bottom" neighbor directly below?
-            # Yes, Pointy top has neighbors at 30, 90, 150...
-            # Wait. Pointy top means the "point" is at the top. Vertices are at -90 (top), -30...
-            # My HexPainter says `angle_deg = 60 * i - 30`.
-            # i=0: -30 (Top Right Vertex). Edge 0 connects Vertex 0 (-30) and Vertex 1 (30).
-            # So Edge 0 is the Right-hand vertical-ish edge?
-            # Vertex 0 (-30) to Vertex 1 (30). The edge is at 0 degrees (Right).
-            # So Edge 0 corresponds to neighbor at (+1, 0).
-            
-            # i=1: Edge between V1 (30) and V2 (90). Edge is at 60 deg (Bottom Right).
-            # Neighbor at (0, +1)?
-            
-            # Let's assume standard sequence:
-            # Edge 0: Right (+1, 0)
-            # Edge 1: Bottom Right (0, +1)
-            # Edge 2: Bottom Left (-1, +1)
-            # Edge 3: Left (-1, 0)
-            # Edge 4: Top Left (-1, -1) -- wait (-1, -1)? No.
-            # Edge 5: Top Right (+1, -1)
-            
-            neighbor_deltas = [
-                (1, 0),   # Edge 0 (Right)
-                (0, 1),   # Edge 1 (Bottom Right)
-                (-1, 1),  # Edge 2 (Bottom Left)
-                (-1, 0),  # Edge 3 (Left)
-                (0, -1),  # Edge 4 (Top Left)
-                (1, -1)   # Edge 5 (Top Right)
-            ]
-            
-            for i, (dq, dr) in enumerate(neighbor_deltas):
-                nq, nr = hex_tile.q + dq, hex_tile.r + dr
-                neighbor = self.world_map.get_hex_at(nq, nr)
-                
-                # If neighbor is LAND (or at least NOT water), draw shoreline
-                # Also treat 'None' (void) as water? No, void is void.
+            # Edge i of the hex (HexPainter vertex order) faces EDGE_DIRECTIONS[i]
+            for i, (dq, dr) in enumerate(hex_math.EDGE_DIRECTIONS):
+                neighbor = self.world_map.get_hex_at(hex_tile.q + dq, hex_tile.r + dr)
+                # If neighbor is LAND (or at least NOT water), draw shoreline; void is void
                 if neighbor and neighbor.terrain != TerrainType.WATER:
-                     tk_overlay = self.shoreline_cache.get(i)
-                     if tk_overlay:
-                         self.canvas.create_image(x, y, image=tk_overlay, tags=f"shore_{hex_tile.q}_{hex_tile.r}_{i}")
-
-        # 2. Decoration (Pseudo-implementation)
-        # In a real version, we'd lookup `hex_tile.decorations` and draw respective images
-        # offset by y to create the "pop up" effect.
-        if hex_tile.decorations:
-            # Just draw a simple indicator for now or use the logic from advice
-            # For this MVP, we rely on the base tile text.
-            pass
+                    layers.append(self._scaled(f"shoreline_{i}"))
         
-        # 3. Fog - Handled at start of method now
-        if not hex_tile.is_visible:
-            # Shroud (explored but not current) - semi transparent fog
-            pass # Implement later
+        # 3. Decoration (Pseudo-implementation)
+        # In a real version, we'd add images for `hex_tile.decorations`
+        # offset by y to create the "pop up" effect.
+        return layers
 
 
 class WorldMapApp:
-    def __init__(self, root):
+    def __init__(self, root, regenerate: bool = False):
+        """
+        Args:
+            root: Tk root window
+            regenerate: Generate a new world even if a saved one matches
+        """
         self.root = root
         self.root.title("ShadowDark World Map")
         self.root.geometry("1024x768")
@@ -1067,17 +1965,22 @@ class WorldMapApp:
         # Frame for UI
         self.toolbar = tk.Frame(root, bg="#333", height=40)
         self.toolbar.pack(side=tk.TOP, fill=tk.X)
-        tk.Label(self.toolbar, text="Use Arrows to Move | Click to Select", fg="white", bg="#333").pack()
+        tk.Label(self.toolbar, text="Use Arrows to Move | Click to Travel", fg="white", bg="#333").pack()
+        self.status_label = tk.Label(self.toolbar, text="", fg="#ccc", bg="#333")
+        self.status_label.pack()
         
         self.canvas = Canvas(root, bg="#1a1a1a")
         self.canvas.pack(fill=tk.BOTH, expand=True)
         
         # Initialize Logic
-        self.map_data = HexMap(radius=100)
-        self.map_data.generate_map()
+        if WORLD_RADIUS is not None:
+            self.map_data = HexMap.load_or_generate(WORLD_SNAPSHOT_PATH, WORLD_RADIUS, regenerate)
+        else:
+            self.map_data = HexMap(radius=WORLD_RADIUS)
+            self.map_data.generate_map()
         
-        # Reveal center
-        self.map_data.reveal_hex(0, 0, radius=2)
+        # Reveal what the player can see from the center
+        self.map_data.update_view(0, 0)
         
         self.renderer = HexMapRenderer(self.map_data, self.canvas)
         
@@ -1085,9 +1988,18 @@ class WorldMapApp:
         self.player_pos = (0, 0) # q, r
         self.camera_offset = (0, 0)
         
+        # Remaining steps of the clicked route (refined lazily as they are walked),
+        # and the pending after() id for the next one
+        self.travel_steps: Optional[Iterator[Tuple[int, int]]] = None
+        self.travel_job = None
+        
         # Minimap cache
         self.minimap_image = None
         self.minimap_tk_image = None
+        self.minimap_base = None  # Explored-terrain layer, updated from fog deltas
+        self.minimap_base_key = None
+        self.minimap_pending = set()
+        self.map_data.subscribe_fog(self._on_fog_delta)
         
         # Initialize player controls
         self.player_controls = PlayerControls()
@@ -1116,8 +2028,30 @@ class WorldMapApp:
         self.root.bind("<End>", lambda e: self.player_controls.handle_keyboard("KP_3"))
         self.root.bind("<Next>", lambda e: self.player_controls.handle_keyboard("KP_1"))
         
+        # Zoom: mouse wheel (X11 reports it as buttons 4/5) and +/- keys
+        self.canvas.bind("<MouseWheel>", lambda e: self.zoom(-1 if e.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda e: self.zoom(-1))
+        self.canvas.bind("<Button-5>", lambda e: self.zoom(1))
+        for key in ("<plus>", "<equal>", "<KP_Add>"):
+            self.root.bind(key, lambda e: self.zoom(-1))
+        for key in ("<minus>", "<KP_Subtract>"):
+            self.root.bind(key, lambda e: self.zoom(1))
+        
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # Initial Render
         self.root.after(100, self.center_camera_on_player)
+        # Build the route planner once the first frame is up, not in the first click handler
+        self.root.after(200, self.map_data.prepare_routes)
+
+    def on_close(self):
+        self.cancel_travel()
+        self.renderer.close()
+        self.root.destroy()
+
+    def _on_fog_delta(self, delta: FogDelta):
+        """Queue newly explored hexes for the minimap terrain layer"""
+        self.minimap_pending |= delta.explored
 
     def on_canvas_resize(self):
         """Handle canvas resize events"""
@@ -1125,6 +2059,11 @@ class WorldMapApp:
         self.update_player_token()
         self.render_minimap()
     
+    def zoom(self, step: int):
+        """Zoom out (step > 0) or in by whole levels, keeping the player centered"""
+        if self.renderer.set_zoom(self.renderer.zoom + step):
+            self.center_camera_on_player()
+
     def center_camera_on_player(self):
         """Update camera offset to center the player token"""
         hex_tile = self.map_data.get_hex_at(*self.player_pos)
@@ -1132,7 +2071,7 @@ class WorldMapApp:
             # We want player pixel coords (px, py) to be at canvas center (0,0 offset relative to center)
             # screen_x = center_x + px + offset_x
             # We want screen_x = center_x, so: px + offset_x = 0 => offset_x = -px
-            px, py = hex_tile.get_pixel_coords(self.map_data.hex_size)
+            px, py = hex_tile.get_pixel_coords(self.renderer.hex_size)
             self.camera_offset = (-px, -py)
             
             self.renderer.render_all(self.camera_offset[0], self.camera_offset[1])
@@ -1146,23 +2085,47 @@ class WorldMapApp:
         target_hex = self.map_data.get_hex_at(nq, nr)
         if target_hex and target_hex.terrain.passable:
             self.player_pos = (nq, nr)
-            self.map_data.reveal_hex(nq, nr, radius=2)
+            self.map_data.update_view(nq, nr)
             self.center_camera_on_player()
         else:
             print("Blocked or Void")
     
     def _handle_player_move(self, dq: int, dr: int):
         """Internal handler for player movement from controls"""
+        self.cancel_travel()
         self.move_player(dq, dr)
     
     def _handle_map_click(self, hex_coords: Tuple[int, int]):
-        """Internal handler for mouse click movement"""
-        target_q, target_r = hex_coords
-        target_hex = self.map_data.get_hex_at(target_q, target_r)
-        if target_hex and target_hex.terrain.passable:
-            self.player_pos = (target_q, target_r)
-            self.map_data.reveal_hex(target_q, target_r, radius=2)
-            self.center_camera_on_player()
+        """Internal handler for mouse click movement: walk the cheapest route there"""
+        self.cancel_travel()
+        route = self.map_data.plan_route(self.player_pos, hex_coords)
+        if route is None:
+            self.status_label.config(text="No route")
+            return
+        self.status_label.config(text=f"Route cost {route.cost}")
+        self.travel_steps = route.iter_steps()
+        self._travel_step()
+    
+    def _travel_step(self):
+        """Take the next step of the current route, then schedule the one after"""
+        self.travel_job = None
+        step = next(self.travel_steps, None) if self.travel_steps else None
+        if step is None:
+            self.travel_steps = None
+            return
+        nq, nr = step
+        self.move_player(nq - self.player_pos[0], nr - self.player_pos[1])
+        if self.player_pos != (nq, nr):
+            self.travel_steps = None  # Blocked; abandon the route
+        else:
+            self.travel_job = self.root.after(TRAVEL_STEP_MS, self._travel_step)
+    
+    def cancel_travel(self):
+        """Stop walking the current route"""
+        if self.travel_job is not None:
+            self.root.after_cancel(self.travel_job)
+            self.travel_job = None
+        self.travel_steps = None
     
     def _on_canvas_click(self, event):
         """Handle canvas mouse click"""
@@ -1174,7 +2137,7 @@ class WorldMapApp:
             (event.x, event.y),
             canvas_center,
             self.camera_offset,
-            HEX_SIZE
+            self.renderer.hex_size
         )
 
     def update_player_token(self):
@@ -1187,12 +2150,12 @@ class WorldMapApp:
         canvas_center_x = self.canvas.winfo_width() / 2
         canvas_center_y = self.canvas.winfo_height() / 2
         
-        px, py = hex_tile.get_pixel_coords(HEX_SIZE)
+        px, py = hex_tile.get_pixel_coords(self.renderer.hex_size)
         screen_x = canvas_center_x + px + self.camera_offset[0]
         screen_y = canvas_center_y + py + self.camera_offset[1]
         
-        # Draw Token
-        r = 15
+        # Draw Token (shrinking with the zoom, but always visible)
+        r = max(4, 15 * self.renderer.hex_size / self.map_data.hex_size)
         self.canvas.create_oval(screen_x - r, screen_y - r, screen_x + r, screen_y + r, 
                                 fill="red", outline="white", width=2, tags="player_token")
     
@@ -1213,54 +2176,72 @@ class WorldMapApp:
         minimap_x = canvas_width - minimap_size - padding
         minimap_y = padding
         
-        # Create PIL image for minimap
-        minimap_img = Image.new('RGBA', (minimap_size, minimap_size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(minimap_img)
-        
         # Calculate pixel size per hex on minimap
-        world_radius = self.map_data.radius
+        # Streamed worlds have no edge, so show a fixed window around the player.
+        # Their terrain layer is laid out around a snapped origin with a margin
+        # the window slides within, so moving does not rebuild it every step.
+        if self.map_data.streaming:
+            world_radius = MINIMAP_STREAM_RADIUS
+            snap = MINIMAP_STREAM_SNAP
+            origin_q, origin_r = (snap * round(c / snap) for c in self.player_pos)
+            view_q, view_r = self.player_pos
+        else:
+            world_radius = self.map_data.radius
+            origin_q = origin_r = view_q = view_r = 0
         pixels_per_hex = hex_radius / (world_radius * 1.8)  # Scale down more to fit all hexes
-        
-        # Terrain color mapping
-        terrain_colors = {
-            TerrainType.GRASS: (100, 200, 100),
-            TerrainType.FOREST: (34, 139, 34),
-            TerrainType.MOUNTAIN: (169, 169, 169),
-            TerrainType.WATER: (65, 105, 225),
-            TerrainType.SWAMP: (85, 107, 47),
-            TerrainType.HILLS: (218, 165, 32),
-            TerrainType.DESERT: (237, 201, 175),
-            TerrainType.TOWN: (205, 92, 92),
-            TerrainType.DUNGEON: (75, 0, 130),
-        }
+        margin = math.ceil(pixels_per_hex * SQRT3 * MINIMAP_STREAM_SNAP) if self.map_data.streaming else 0
+        layer_size = minimap_size + 2 * margin
         
         # Draw hexes
         center_x = minimap_size / 2
         center_y = minimap_size / 2
         
-        for (q, r), hex_tile in self.map_data.hexes.items():
-            if hex_tile.is_explored:
-                # Calculate minimap position
-                x = pixels_per_hex * (math.sqrt(3) * q + math.sqrt(3)/2 * r)
-                y = pixels_per_hex * (3./2 * r)
-                
-                screen_x = center_x + x
-                screen_y = center_y + y
-                
+        code_colors = [tuple(c) for c in TERRAIN_PALETTE.tolist()]
+        dot_size = max(1, int(pixels_per_hex * 0.8))
+        
+        def draw_dots(draw, qs, rs, codes):
+            xs, ys = hex_math.axial_to_pixel_batch(qs - origin_q, rs - origin_r, pixels_per_hex)
+            xs, ys = xs + layer_size / 2, ys + layer_size / 2
+            for x, y, code in zip(xs.tolist(), ys.tolist(), codes):
                 # Draw small filled circle for each hex
-                color = terrain_colors.get(hex_tile.terrain, (128, 128, 128))
-                dot_size = max(1, int(pixels_per_hex * 0.8))
                 draw.ellipse(
-                    (screen_x - dot_size, screen_y - dot_size,
-                     screen_x + dot_size, screen_y + dot_size),
-                    fill=color
+                    (x - dot_size, y - dot_size, x + dot_size, y + dot_size),
+                    fill=code_colors[code]
                 )
         
+        # The terrain layer persists between frames; only hexes reported by
+        # fog deltas get stamped on. Full rebuilds happen when the layout changes.
+        base_key = (layer_size, origin_q, origin_r)
+        if self.minimap_base is None or self.minimap_base_key != base_key:
+            self.minimap_base = Image.new('RGBA', (layer_size, layer_size), (0, 0, 0, 0))
+            self.minimap_base_key = base_key
+            draw = ImageDraw.Draw(self.minimap_base)
+            for grid in self.map_data._grids():
+                # Batch-convert every explored hex of the grid to minimap positions
+                explored = (grid.flags & FLAG_EXPLORED).astype(bool)
+                if explored.any():
+                    qs, rs = grid.axial_coords()
+                    draw_dots(draw, qs[explored], rs[explored], grid.terrain[explored].tolist())
+        elif self.minimap_pending:
+            draw = ImageDraw.Draw(self.minimap_base)
+            tiles = [self.map_data.get_hex_at(q, r) for q, r in self.minimap_pending]
+            tiles = [t for t in tiles if t]
+            draw_dots(draw, np.array([t.q for t in tiles]), np.array([t.r for t in tiles]),
+                      [TERRAIN_CODES[t.terrain] for t in tiles])
+        self.minimap_pending.clear()
+        
+        # The window onto the terrain layer, centered on the view hex
+        vx, vy = hex_math.axial_to_pixel(view_q - origin_q, view_r - origin_r, pixels_per_hex)
+        left, top = margin + round(vx), margin + round(vy)
+        minimap_img = self.minimap_base.crop((left, top, left + minimap_size, top + minimap_size))
+        draw = ImageDraw.Draw(minimap_img)
+        
         # Draw player position
         player_hex = self.map_data.get_hex_at(*self.player_pos)
         if player_hex:
-            px = pixels_per_hex * (math.sqrt(3) * self.player_pos[0] + math.sqrt(3)/2 * self.player_pos[1])
-            py = pixels_per_hex * (3./2 * self.player_pos[1])
+            player_q = self.player_pos[0] - view_q
+            player_r = self.player_pos[1] - view_r
+            px, py = hex_math.axial_to_pixel(player_q, player_r, pixels_per_hex)
             p_screen_x = center_x + px
             p_screen_y = center_y + py
             
@@ -1319,16 +2300,7 @@ class WorldMapApp:
         x = event.x - cx
         y = event.y - cy
         
-        # Pixel to Axial
-        # q = (sqrt(3)/3 * x  -  1/3 * y) / size ??? 
-        # Pointy Top matrix:
-        # q = (sqrt(3)/3 * x - 1/3 * y) / size
-        # r = (2/3 * y) / size
-        
-        q = (math.sqrt(3)/3 * x - 1/3 * y) / HEX_SIZE
-        r = (2./3 * y) / HEX_SIZE
-        
-        clicked_hex = self.axial_round(q, r)
+        clicked_hex = hex_math.pixel_to_hex(x, y, self.renderer.hex_size)
         
         tile = self.map_data.get_hex_at(clicked_hex[0], clicked_hex[1])
         if tile:
@@ -1338,30 +2310,7 @@ class WorldMapApp:
         else:
             print(f"Clicked void: {clicked_hex}")
 
-    def axial_round(self, x, y):
-        # Convert axial to cube
-        xgrid = x
-        zgrid = y
-        ygrid = -x - y
-        
-        rx = round(xgrid)
-        ry = round(ygrid)
-        rz = round(zgrid)
-        
-        x_diff = abs(rx - xgrid)
-        y_diff = abs(ry - ygrid)
-        z_diff = abs(rz - zgrid)
-        
-        if x_diff > y_diff and x_diff > z_diff:
-            rx = -ry - rz
-        elif y_diff > z_diff:
-            ry = -rx - rz
-        else:
-            rz = -rx - ry
-            
-        return int(rx), int(rz)
-
 if __name__ == "__main__":
     root = tk.Tk()
-    app = WorldMapApp(root)
+    app = WorldMapApp(root, regenerate="--regenerate" in sys.argv[1:])
     root.mainloop()
@@ -0,0 +1,91 @@
+"""
+Versioned binary snapshot format for generated worlds.
+
+Layout:
+    8 bytes   magic b"SDWORLD\\0"
+    4 bytes   format version (little-endian uint32)
+    4 bytes   header length N (little-endian uint32)
+    N bytes   UTF-8 JSON header (map metadata, labels, array table)
+    ...       page-aligned raw arrays, C order
+
+Arrays are opened with np.memmap in copy-on-write mode, so loading is
+near-instant and only the pages that are actually read get faulted in.
+Writes (e.g. fog updates) stay private to the process.
+"""
+
+import json
+import os
+import struct
+from typing import Dict, Tuple
+
+import numpy as np
+
+SNAPSHOT_MAGIC = b"SDWORLD\0"
+SNAPSHOT_VERSION = 2
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGN = 4096
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def write_snapshot(path: str, meta: dict, arrays: Dict[str, np.ndarray]):
+    """
+    Write metadata and arrays to a snapshot file.
+
+    Args:
+        path: Destination file (written to a temp file, then renamed into place)
+        meta: JSON-serializable map metadata
+        arrays: Named arrays; dtype and shape are recorded in the header
+    """
+    # Offsets depend on the header size, which depends on the offsets;
+    # reserve the array region after a generously aligned header.
+    table = {name: {"dtype": arr.dtype.str, "shape": list(arr.shape)} for name, arr in arrays.items()}
+    header = {"meta": meta, "arrays": table}
+    header_len = len(json.dumps(header).encode("utf-8")) + 64 * (len(arrays) + 1)
+    offset = _align(_PREAMBLE.size + header_len)
+    for name, arr in arrays.items():
+        table[name]["offset"] = offset
+        offset = _align(offset + arr.nbytes)
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    header_bytes += b" " * (header_len - len(header_bytes))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for name, arr in arrays.items():
+            f.seek(table[name]["offset"])
+            f.write(np.ascontiguousarray(arr).tobytes())
+        f.truncate(offset)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: str) -> Tuple[dict, Dict[str, np.ndarray]]:
+    """
+    Open a snapshot file.
+
+    Returns:
+        (meta, arrays) where every array is a copy-on-write memory map
+
+    Raises:
+        ValueError: If the file is not a snapshot or has an unsupported version
+    """
+    with open(path, "rb") as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise ValueError(f"{path} is not a world snapshot")
+        magic, version, header_len = _PREAMBLE.unpack(preamble)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a world snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"{path} has snapshot version {version}, expected {SNAPSHOT_VERSION}")
+        header = json.loads(f.read(header_len).decode("utf-8"))
+
+    arrays = {}
+    for name, info in header["arrays"].items():
+        arrays[name] = np.memmap(path, dtype=np.dtype(info["dtype"]), mode="c",
+                                 offset=info["offset"], shape=tuple(info["shape"]))
+    return header["meta"], arrays